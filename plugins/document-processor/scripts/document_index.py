@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Full-text index over extracted PDF and DOCX content.
+
+Usage:
+    python document_index.py index ~/vault/attachments
+    python document_index.py index report.pdf notes.docx --db ./docs.db
+    python document_index.py index ~/vault --timeout 300 --page-timeout 20 --max-memory 2048
+    python document_index.py search "quarterly revenue"
+    python document_index.py search 'revenue NEAR(forecast, 5)' --raw --json
+    python document_index.py status
+
+Features:
+- Stores PDF pages and DOCX sections (split at headings) in a local SQLite
+  FTS5 database with path, page, heading, text and a content hash per chunk
+- Incremental updates: unchanged files are skipped by size and mtime, then
+  by content hash; within a changed file only the chunks whose text changed
+  are rewritten, and files removed from an indexed directory are dropped
+- Ranked queries (BM25, headings weighted higher) with page citations and
+  highlighted snippets
+- Extraction runs in parallel worker processes, recycled after a number of
+  documents; per-document and per-page time limits and a memory ceiling
+  keep one pathological file from stalling the run
+- JSON output mode for programmatic use
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional
+
+import json_output
+from extract_docx import extract_docx
+from extract_pdf import ExtractionLimits, ExtractionTimeout, extract_with_pypdf, skipped_summary, time_limit
+
+DEFAULT_DB = "document_index.db"
+SCHEMA_VERSION = 1
+INDEXED_EXTENSIONS = {".pdf": "pdf", ".docx": "docx"}
+SECTION_MAX_CHARS = 4000      # DOCX sections longer than this are split at paragraphs
+HEADING_WEIGHT = 4.0          # BM25 weight of the heading column relative to text
+SNIPPET_TOKENS = 16
+DEFAULT_LIMIT = 10
+WORKER_MAX_DOCUMENTS = 50     # documents a worker process extracts before it is replaced
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*)$")
+QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    page INTEGER,
+    heading TEXT,
+    text TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    UNIQUE (document_id, ordinal)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    heading, text, content='chunks', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, heading, text) VALUES (new.id, new.heading, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, heading, text) VALUES ('delete', old.id, old.heading, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, heading, text) VALUES ('delete', old.id, old.heading, old.text);
+    INSERT INTO chunks_fts(rowid, heading, text) VALUES (new.id, new.heading, new.text);
+END;
+INSERT INTO chunks_fts(chunks_fts, rank) VALUES ('rank', 'bm25({HEADING_WEIGHT}, 1.0)');
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+@dataclass
+class Chunk:
+    """One indexed unit: a PDF page or a DOCX section."""
+    ordinal: int
+    page: Optional[int]
+    heading: Optional[str]
+    text: str
+
+    @property
+    def content_hash(self) -> str:
+        data = f"{self.page}\x1f{self.heading}\x1f{self.text}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class IndexStats:
+    """Counts from one index run."""
+    scanned: int = 0
+    unchanged: int = 0
+    indexed: int = 0
+    chunks_written: int = 0
+    chunks_kept: int = 0
+    removed: int = 0
+    failed: int = 0
+    timed_out: int = 0        # documents that hit a time limit, in full or on some pages
+    skipped_pages: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result with its citation."""
+    path: str
+    page: Optional[int]
+    heading: Optional[str]
+    snippet: str
+    score: float
+
+    @property
+    def citation(self) -> str:
+        parts = [self.path]
+        if self.page is not None:
+            parts.append(f"page {self.page}")
+        if self.heading:
+            parts.append(f"§ {self.heading}")
+        return ", ".join(parts)
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open the index, creating the schema on first use."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        conn.executescript(SCHEMA)
+    elif version != SCHEMA_VERSION:
+        raise RuntimeError(f"{db_path} was created by a different version of this script; "
+                           "delete it and index again")
+    return conn
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_documents(paths: list) -> tuple:
+    """Expand files and directories into (document paths, directory roots)."""
+    files = []
+    roots = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            roots.append(path)
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename)[1].lower() in INDEXED_EXTENSIONS:
+                        files.append(os.path.join(dirpath, filename))
+        elif os.path.splitext(path)[1].lower() in INDEXED_EXTENSIONS:
+            files.append(path)
+        else:
+            print(f"Warning: Skipping {path}: not a PDF, DOCX or directory", file=sys.stderr)
+    return files, roots
+
+
+def split_sections(markdown: str) -> list:
+    """Split DOCX markdown into (heading, text) sections at heading lines.
+
+    Sections longer than SECTION_MAX_CHARS are split further at paragraph
+    breaks, each part keeping the section's heading.
+    """
+    sections = []
+    heading = None
+    lines = []
+
+    def flush():
+        text = "\n".join(lines).strip()
+        lines.clear()
+        if not text:
+            return
+        part = []
+        size = 0
+        for paragraph in text.split("\n\n"):
+            if part and size + len(paragraph) > SECTION_MAX_CHARS:
+                sections.append((heading, "\n\n".join(part)))
+                part, size = [], 0
+            part.append(paragraph)
+            size += len(paragraph) + 2
+        sections.append((heading, "\n\n".join(part)))
+
+    for line in markdown.splitlines():
+        match = HEADING_PATTERN.match(line)
+        if match:
+            flush()
+            heading = match.group(1).strip().strip("*_") or None
+        else:
+            lines.append(line)
+    flush()
+    return sections
+
+
+def extract_chunks(job: tuple) -> dict:
+    """Hash and, if the hash changed, extract one document (worker process).
+
+    job is (path, kind, previous content hash or None, ExtractionLimits).
+    PDF pages that run over the limits are left out and listed in
+    "skipped"; such a document is stored without a content hash, so the
+    next run extracts it again. A DOCX that runs out of time fails.
+    """
+    path, kind, previous_hash, limits = job
+    try:
+        stat = os.stat(path)
+        digest = file_hash(path)
+        output = {"path": path, "kind": kind, "size": stat.st_size,
+                  "mtime_ns": stat.st_mtime_ns, "content_hash": digest,
+                  "chunks": None, "error": None}
+        if digest == previous_hash:
+            return output
+
+        chunks = []
+        if kind == "pdf":
+            result = extract_with_pypdf(path, limits=limits)
+            if not result.success:
+                raise RuntimeError(result.error)
+            for page in result.pages:
+                if page.text:
+                    chunks.append(Chunk(len(chunks), page.page_number, None, page.text))
+            if result.skipped_pages:
+                output["skipped"] = result.skipped_pages
+                output["content_hash"] = ""
+        else:
+            with time_limit(limits.document_seconds):
+                result = extract_docx(path, as_markdown=True)
+            if not result.success:
+                raise RuntimeError(result.error)
+            for heading, text in split_sections(result.content):
+                chunks.append(Chunk(len(chunks), None, heading, text))
+        output["chunks"] = chunks
+        return output
+    except ExtractionTimeout:
+        return {"path": path, "error": f"timed out after {limits.document_seconds:g}s", "timed_out": True}
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def write_document(conn: sqlite3.Connection, item: dict, stats: IndexStats):
+    """Store one extracted document, rewriting only the chunks that changed."""
+    now = datetime.now().isoformat(timespec="seconds")
+    row = conn.execute("SELECT id FROM documents WHERE path = ?", (item["path"],)).fetchone()
+
+    if item["chunks"] is None:
+        # Same bytes as last time (touched or copied); refresh the stat fields
+        conn.execute("UPDATE documents SET size = ?, mtime_ns = ? WHERE id = ?",
+                     (item["size"], item["mtime_ns"], row[0]))
+        stats.unchanged += 1
+        return
+
+    if row is None:
+        document_id = conn.execute(
+            "INSERT INTO documents (path, kind, size, mtime_ns, content_hash, chunk_count, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, 0, ?)",
+            (item["path"], item["kind"], item["size"], item["mtime_ns"], item["content_hash"], now)
+        ).lastrowid
+        existing = {}
+    else:
+        document_id = row[0]
+        existing = dict(conn.execute(
+            "SELECT ordinal, content_hash FROM chunks WHERE document_id = ?", (document_id,)))
+
+    chunks = item["chunks"]
+    for chunk in chunks:
+        digest = chunk.content_hash
+        previous = existing.get(chunk.ordinal)
+        if previous == digest:
+            stats.chunks_kept += 1
+            continue
+        if previous is None:
+            conn.execute(
+                "INSERT INTO chunks (document_id, ordinal, page, heading, text, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (document_id, chunk.ordinal, chunk.page, chunk.heading, chunk.text, digest))
+        else:
+            conn.execute(
+                "UPDATE chunks SET page = ?, heading = ?, text = ?, content_hash = ? "
+                "WHERE document_id = ? AND ordinal = ?",
+                (chunk.page, chunk.heading, chunk.text, digest, document_id, chunk.ordinal))
+        stats.chunks_written += 1
+    conn.execute("DELETE FROM chunks WHERE document_id = ? AND ordinal >= ?", (document_id, len(chunks)))
+
+    conn.execute(
+        "UPDATE documents SET kind = ?, size = ?, mtime_ns = ?, content_hash = ?, chunk_count = ?, "
+        "indexed_at = ? WHERE id = ?",
+        (item["kind"], item["size"], item["mtime_ns"], item["content_hash"], len(chunks), now, document_id))
+    stats.indexed += 1
+
+
+def remove_documents(conn: sqlite3.Connection, document_ids: list):
+    """Drop documents and their chunks from the index."""
+    for document_id in document_ids:
+        conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+        conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+
+def index_documents(db_path: str, paths: list, workers: Optional[int] = None,
+                    prune: bool = True, limits: Optional[ExtractionLimits] = None,
+                    recycle_after: int = WORKER_MAX_DOCUMENTS) -> IndexStats:
+    """Bring the index up to date with the given files and directories.
+
+    Files whose size and mtime match the index are skipped without being
+    read; the rest are hashed and, if their content changed, extracted in
+    a process pool. Each document is committed on its own, so an
+    interrupted run keeps everything indexed so far. With prune, indexed
+    files under the given directories that no longer exist are removed.
+
+    limits bounds each document's extraction time and memory. Workers are
+    replaced after recycle_after documents (0: never), returning memory
+    that a large document left fragmented to the system.
+    """
+    started = time.perf_counter()
+    stats = IndexStats()
+    conn = connect(db_path)
+    files, roots = find_documents(paths)
+    stats.scanned = len(files)
+
+    known = {path: (document_id, size, mtime_ns, digest) for document_id, path, size, mtime_ns, digest
+             in conn.execute("SELECT id, path, size, mtime_ns, content_hash FROM documents")}
+    jobs = []
+    for path in files:
+        kind = INDEXED_EXTENSIONS[os.path.splitext(path)[1].lower()]
+        previous = known.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Warning: {path}: {e}", file=sys.stderr)
+            stats.failed += 1
+            continue
+        # Documents stored with pages missing have no hash and are always retried
+        if previous and previous[3] and previous[1] == stat.st_size and previous[2] == stat.st_mtime_ns:
+            stats.unchanged += 1
+            continue
+        jobs.append((path, kind, previous[3] if previous else None, limits or ExtractionLimits()))
+
+    if jobs:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) == 1:
+            results = map(extract_chunks, jobs)
+            executor = None
+        elif recycle_after:
+            # Workers count tasks, not documents, so recycling needs one document per task
+            executor = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=recycle_after)
+            results = executor.map(extract_chunks, jobs)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(extract_chunks, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+        try:
+            for item in results:
+                if item.get("error"):
+                    print(f"Warning: Could not index {item['path']}: {item['error']}", file=sys.stderr)
+                    stats.failed += 1
+                    stats.timed_out += bool(item.get("timed_out"))
+                    continue
+                skipped = item.get("skipped")
+                if skipped:
+                    print(f"Warning: {item['path']}: {skipped_summary(skipped)} left out; "
+                          f"it will be extracted again on the next run", file=sys.stderr)
+                    stats.skipped_pages += len(skipped)
+                    stats.timed_out += any("timeout" in page.reason for page in skipped)
+                with conn:
+                    write_document(conn, item, stats)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    if prune and roots:
+        seen = set(files)
+        stale = [document_id for path, (document_id, *_rest) in known.items()
+                 if path not in seen and any(path.startswith(root + os.sep) for root in roots)]
+        with conn:
+            remove_documents(conn, stale)
+        stats.removed = len(stale)
+
+    conn.close()
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def build_match_query(query: str, any_term: bool = False) -> str:
+    """Turn free text into an FTS5 query of quoted terms (AND, or OR with any_term).
+
+    Quoting keeps characters like '-' or ':' in user input from being read
+    as FTS5 operators. A trailing '*' on a word keeps prefix matching.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        for token in QUERY_TOKEN_PATTERN.findall(word):
+            terms.append(f'"{token}"')
+        if prefix and terms:
+            terms[-1] += "*"
+    return (" OR " if any_term else " ").join(terms)
+
+
+def search(db_path: str, query: str, limit: int = DEFAULT_LIMIT, raw: bool = False,
+           any_term: bool = False, path_prefix: Optional[str] = None) -> list:
+    """Return SearchHits for query, best first."""
+    match = query if raw else build_match_query(query, any_term)
+    if not match:
+        return []
+    conn = connect(db_path)
+    sql = (
+        "SELECT d.path, c.page, c.heading, "
+        f"snippet(chunks_fts, 1, '[', ']', '...', {SNIPPET_TOKENS}), rank "
+        "FROM chunks_fts JOIN chunks c ON c.id = chunks_fts.rowid "
+        "JOIN documents d ON d.id = c.document_id "
+        "WHERE chunks_fts MATCH ?"
+    )
+    params = [match]
+    if path_prefix:
+        sql += " AND d.path LIKE ? ESCAPE '\\'"
+        prefix = os.path.abspath(path_prefix)
+        params.append(prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [SearchHit(path=path, page=page, heading=heading, snippet=" ".join(snippet.split()),
+                      score=round(-score, 4))
+            for path, page, heading, snippet, score in rows]
+
+
+def index_status(db_path: str) -> dict:
+    """Summary counts for the index."""
+    conn = connect(db_path)
+    documents, chunks = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM documents").fetchone()
+    by_kind = dict(conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind"))
+    last = conn.execute("SELECT MAX(indexed_at) FROM documents").fetchone()[0]
+    conn.close()
+    return {
+        "database": os.path.abspath(db_path),
+        "documents": documents,
+        "chunks": chunks,
+        "by_kind": by_kind,
+        "last_indexed": last,
+        "size_bytes": sum(os.path.getsize(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))
+    }
+
+
+def format_index_stats(stats: IndexStats) -> str:
+    """Format an index run for human reading."""
+    return "\n".join([
+        f"Scanned: {stats.scanned} documents in {stats.seconds:.1f}s",
+        f"Indexed: {stats.indexed} ({stats.chunks_written} chunks written, {stats.chunks_kept} unchanged)",
+        f"Unchanged: {stats.unchanged}",
+        f"Removed: {stats.removed}",
+        f"Failed: {stats.failed}",
+        f"Timed out: {stats.timed_out} ({stats.skipped_pages} pages skipped)"
+    ])
+
+
+def format_search_results(query: str, hits: list, elapsed_ms: float) -> str:
+    """Format search hits for human reading."""
+    lines = [f'{len(hits)} result(s) for "{query}" ({elapsed_ms:.1f} ms)', ""]
+    for number, hit in enumerate(hits, 1):
+        lines.extend([f"{number}. {hit.citation}", f"   {hit.snippet}", ""])
+    return "\n".join(lines).rstrip()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Full-text index over extracted PDF and DOCX content",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python document_index.py index ~/vault/attachments
+  python document_index.py index report.pdf notes.docx --db ./docs.db
+  python document_index.py index ~/vault --timeout 300 --page-timeout 20 --max-memory 2048
+  python document_index.py search "quarterly revenue"
+  python document_index.py search "forecast*" --any --limit 20 --json
+  python document_index.py search '"net revenue" NEAR(forecast, 5)' --raw
+  python document_index.py status
+
+Queries:
+  Words are matched with stemming ("forecasts" finds "forecast"); all words
+  must appear unless --any is given. --raw passes FTS5 query syntax through
+  (phrases, NEAR, OR/NOT, column filters like heading:summary).
+        """
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Index database (default: ./{DEFAULT_DB})")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Add or update documents in the index")
+    index_parser.add_argument("paths", nargs="+", help="PDF/DOCX files or directories to index")
+    index_parser.add_argument("--workers", "-w", type=int, help="Extraction processes (default: CPU count)")
+    index_parser.add_argument("--no-prune", action="store_true",
+                              help="Keep entries for files deleted from indexed directories")
+    index_parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                              help="Time budget per document; PDF pages not reached in time are skipped")
+    index_parser.add_argument("--page-timeout", type=float, metavar="SECONDS",
+                              help="Skip any PDF page that takes longer than this")
+    index_parser.add_argument("--max-memory", type=int, metavar="MB",
+                              help="Skip a PDF's remaining pages once its worker uses more than this")
+    index_parser.add_argument("--recycle-after", type=int, default=WORKER_MAX_DOCUMENTS, metavar="N",
+                              help=f"Replace each worker after N documents (default: {WORKER_MAX_DOCUMENTS}; 0: never)")
+
+    search_parser = subparsers.add_parser("search", help="Ranked full-text search with citations")
+    search_parser.add_argument("query", help="Search terms")
+    search_parser.add_argument("--limit", "-n", type=int, default=DEFAULT_LIMIT,
+                               help=f"Maximum results (default: {DEFAULT_LIMIT})")
+    search_parser.add_argument("--any", action="store_true", help="Match any word instead of all")
+    search_parser.add_argument("--raw", action="store_true", help="Treat the query as FTS5 syntax")
+    search_parser.add_argument("--in", dest="path_prefix", metavar="DIR",
+                               help="Only return documents under this path")
+
+    subparsers.add_parser("status", help="Show index size and counts")
+
+    # Accept --db/--json after the subcommand as well
+    for sub in subparsers.choices.values():
+        sub.add_argument("--db", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+        sub.add_argument("--json", "-j", action="store_true", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+        sub.add_argument("--compact", action="store_true", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.command != "index" and not os.path.exists(args.db):
+        print(f"Error: Index not found: {args.db} (run the index command first)", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "index":
+            limits = ExtractionLimits(document_seconds=args.timeout, page_seconds=args.page_timeout,
+                                      max_rss_mb=args.max_memory)
+            stats = index_documents(args.db, args.paths, args.workers, prune=not args.no_prune,
+                                    limits=limits, recycle_after=args.recycle_after)
+            output = asdict(stats)
+            text = format_index_stats(stats)
+            exit_code = 1 if stats.failed else 0
+        elif args.command == "search":
+            started = time.perf_counter()
+            hits = search(args.db, args.query, args.limit, args.raw, args.any, args.path_prefix)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            output = {"query": args.query, "elapsed_ms": round(elapsed_ms, 2),
+                      "results": [dict(asdict(hit), citation=hit.citation) for hit in hits]}
+            text = format_search_results(args.query, hits, elapsed_ms)
+            exit_code = 0 if hits else 1
+        else:
+            output = index_status(args.db)
+            text = "\n".join(f"{key.replace('_', ' ').capitalize()}: {value}" for key, value in output.items())
+            exit_code = 0
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        json_output.dump(output, compact=args.compact)
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,28 +8,59 @@ Usage:
     python extract_docx.py --file document.docx --extract-images --output-dir ./extracted/
     python extract_docx.py --file document.docx --metadata-only
     python extract_docx.py --file document.docx --json
+    python extract_docx.py --file spec.docx --outline
+    python extract_docx.py --file spec.docx --markdown --section 4.2
+    python extract_docx.py --file spec.docx --tables --json
 
 Features:
 - Full text extraction preserving structure
 - Markdown conversion (headings, lists, tables, bold/italic)
 - Image extraction to separate directory
-- Table extraction as markdown tables
+- Table extraction as markdown tables or JSON rows, read straight from the
+  table XML with merged cells (gridSpan/vMerge) resolved
 - Metadata extraction (author, created, modified)
+- Heading outline and extraction of selected sections only
 - JSON output mode for programmatic use
+- Importable: iter_docx_blocks() yields paragraphs and tables lazily from a
+  path, file object or bytes, without printing
 """
 
 import argparse
 import base64
-import json
+import io
 import os
 import re
 import sys
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from zipfile import ZipFile
 
+import json_output
+
+HEADING_STYLE_PATTERN = re.compile(r"^Heading\s*(\d+)$")
+
+# WordprocessingML element names, for reading document.xml directly
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P, W_TBL, W_TR, W_TC = W + "p", W + "tbl", W + "tr", W + "tc"
+W_T, W_TAB, W_BR, W_CR = W + "t", W + "tab", W + "br", W + "cr"
+W_PPR, W_PSTYLE, W_VAL = W + "pPr", W + "pStyle", W + "val"
+W_TCPR, W_TRPR = W + "tcPr", W + "trPr"
+W_GRID_SPAN, W_VMERGE, W_GRID_BEFORE = W + "gridSpan", W + "vMerge", W + "gridBefore"
+W_R, W_RPR, W_HYPERLINK, W_TYPE = W + "r", W + "rPr", W + "hyperlink", W + "type"
+W_PTAB, W_NO_BREAK_HYPHEN = W + "ptab", W + "noBreakHyphen"
+W_B, W_I, W_U, W_STRIKE = W + "b", W + "i", W + "u", W + "strike"
+
+# Run text: what python-docx's Run.text gives for each inner-content element
+RUN_TEXT_ELEMENTS = {W_T: None, W_TAB: "\t", W_PTAB: "\t", W_CR: "\n", W_NO_BREAK_HYPHEN: "-"}
+OFF_VALUES = ("0", "false", "off")
+
+# Markdown wrappers for (bold, italic, underline, strike), innermost first
+RUN_FORMAT_MARKERS = (("**", "**"), ("*", "*"), ("<u>", "</u>"), ("~~", "~~"))
+HORIZONTAL_WHITESPACE = re.compile(r"[ \t]+")
+LINE_BREAK_WHITESPACE = re.compile(r" ?\n ?")
+
 
 @dataclass
 class DocxMetadata:
@@ -61,6 +92,56 @@ class ExtractedImage:
     saved_path: Optional[str] = None
 
 
+@dataclass
+class OutlineEntry:
+    """A heading and the span of body elements its section covers."""
+    number: str           # position in the outline, e.g. "4.2"
+    level: int
+    title: str
+    start: int            # index of the heading among the body's child elements
+    end: int              # index after the section's last element (subsections included)
+
+
+@dataclass
+class TableGrid:
+    """A table's cells laid out on its column grid, merges resolved.
+
+    Each cell is the list of its paragraphs' text. A merged cell's text is
+    kept in its top-left grid position only; the positions it covers are
+    empty lists. spans records each merged cell as
+    (row, column, row_span, col_span).
+    """
+    rows: list
+    spans: list
+    column_count: int
+
+
+@dataclass
+class DocxTable:
+    """A table in JSON form: one string per grid cell, first row as header."""
+    index: int
+    rows: list
+    column_count: int
+    merged_cells: list = field(default_factory=list)
+
+
+@dataclass
+class DocxBlock:
+    """One body paragraph or table, as yielded by iter_docx_blocks.
+
+    index is the element's position in the document body (as in
+    OutlineEntry.start/end). text is plain text or markdown; a table's
+    text has one " | "-joined line per row, or is a markdown table, and
+    its structured rows are in table.
+    """
+    index: int
+    kind: str
+    text: str
+    style: Optional[str] = None
+    heading_level: Optional[int] = None
+    table: Optional[DocxTable] = None
+
+
 @dataclass
 class ExtractionResult:
     """Complete extraction result."""
@@ -69,6 +150,8 @@ class ExtractionResult:
     metadata: DocxMetadata
     content: str
     images: List[ExtractedImage] = field(default_factory=list)
+    outline: Optional[List[OutlineEntry]] = None
+    tables: Optional[List[DocxTable]] = None
     error: Optional[str] = None
 
 
@@ -90,19 +173,28 @@ def format_datetime(dt) -> Optional[str]:
     return str(dt)
 
 
-def extract_metadata(doc) -> DocxMetadata:
-    """Extract metadata from DOCX document."""
+def extract_metadata(doc, count_text: bool = True) -> DocxMetadata:
+    """Extract metadata from DOCX document.
+
+    Paragraphs and tables are counted in one pass over the body XML, along
+    with the words and characters of the paragraph text when count_text is
+    set. Callers that convert the body count the converted text instead.
+    """
     core_props = doc.core_properties
     file_stat = os.stat(doc._part.package.name if hasattr(doc._part.package, 'name') else "")
 
-    # Count elements
-    para_count = len(doc.paragraphs)
-    table_count = len(doc.tables)
-
-    # Count words and characters
-    all_text = "\n".join(p.text for p in doc.paragraphs)
-    word_count = len(all_text.split())
-    char_count = len(all_text)
+    # Count elements, words and characters
+    para_count = table_count = word_count = char_count = 0
+    for element in doc.element.body.iterchildren(W_P, W_TBL):
+        if element.tag == W_TBL:
+            table_count += 1
+            continue
+        para_count += 1
+        if count_text:
+            text = paragraph_xml_text(element)
+            word_count += len(text.split())
+            char_count += len(text)
+    char_count += max(para_count - 1, 0) if count_text else 0  # newlines between paragraphs
 
     # Count images
     image_count = 0
@@ -129,49 +221,112 @@ def extract_metadata(doc) -> DocxMetadata:
     )
 
 
-def get_paragraph_style(paragraph) -> str:
-    """Get the style name of a paragraph."""
+def paragraph_style_names(doc) -> dict:
+    """Map paragraph styleIds to style names, and None to the default's name.
+
+    python-docx's paragraph.style searches every style in the document for
+    the default each time an unstyled paragraph is asked; with this map each
+    lookup is a dict access.
+    """
+    from docx.enum.style import WD_STYLE_TYPE
+
+    names = {style.style_id: style.name for style in doc.styles
+             if style.type == WD_STYLE_TYPE.PARAGRAPH}
+    default = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+    names[None] = default.name if default is not None else None
+    return names
+
+
+def get_paragraph_style(paragraph, style_names: Optional[dict] = None) -> str:
+    """Get the style name of a paragraph, via style_names when given."""
+    if style_names is not None:
+        properties = paragraph._element.find(W_PPR)
+        style = properties.find(W_PSTYLE) if properties is not None else None
+        name = style_names.get(style.get(W_VAL) if style is not None else None, style_names[None])
+        return name or "Normal"
     if paragraph.style and paragraph.style.name:
         return paragraph.style.name
     return "Normal"
 
 
-def run_to_markdown(run) -> str:
-    """Convert a run to markdown with formatting."""
-    text = run.text
-    if not text:
-        return ""
-
-    # Apply formatting
-    if run.bold:
-        text = f"**{text}**"
-    if run.italic:
-        text = f"*{text}*"
-    if run.underline:
-        text = f"<u>{text}</u>"
-    if run.font.strike:
-        text = f"~~{text}~~"
+def run_text(run) -> str:
+    """Text of a w:r element, as python-docx's Run.text renders it."""
+    parts = []
+    for node in run.iterchildren():
+        if node.tag in RUN_TEXT_ELEMENTS:
+            parts.append(RUN_TEXT_ELEMENTS[node.tag] or node.text or "")
+        elif node.tag == W_BR:
+            # Line breaks become newlines; page and column breaks vanish
+            parts.append("\n" if node.get(W_TYPE, "textWrapping") == "textWrapping" else "")
+    return "".join(parts)
+
+
+def run_format(run) -> tuple:
+    """(bold, italic, underline, strike) set directly on a w:r element."""
+    properties = run.find(W_RPR)
+    if properties is None:
+        return (False, False, False, False)
+    flags = []
+    for tag in (W_B, W_I, W_U, W_STRIKE):
+        element = properties.find(tag)
+        value = element.get(W_VAL, "") if element is not None else None
+        flags.append(value is not None and value not in OFF_VALUES and value != "none")
+    return tuple(flags)
+
+
+def format_markdown(text: str, formatting: tuple) -> str:
+    """Wrap text in markdown for its formatting, whitespace kept outside.
+
+    "**bold **" is not emphasis in markdown, so leading and trailing
+    whitespace is moved outside the markers.
+    """
+    core = text.strip(" \t\n")
+    if not core or not any(formatting):
+        return text
+    for applies, (opening, closing) in zip(formatting, RUN_FORMAT_MARKERS):
+        if applies:
+            core = f"{opening}{core}{closing}"
+    start = len(text) - len(text.lstrip(" \t\n"))
+    end = len(text.rstrip(" \t\n"))
+    return text[:start] + core + text[end:]
+
+
+def runs_to_markdown(runs) -> str:
+    """Convert w:r elements to markdown, coalescing runs with equal formatting.
+
+    Word splits text into runs at every edit and spell-check boundary, so one
+    bold phrase is often many bold runs. Formatting each run on its own gives
+    "**a****b****c**"; adjacent runs with the same formatting are merged first,
+    and whitespace-only runs join whichever run they follow. Runs of spaces
+    and tabs then collapse to a single space.
+    """
+    segments = []       # [formatting, [texts]]
+    for run in runs:
+        text = run_text(run)
+        if not text:
+            continue
+        if segments and (not text.strip() or segments[-1][0] == run_format(run)):
+            segments[-1][1].append(text)
+        else:
+            segments.append([run_format(run), [text]])
 
-    return text
+    markdown = "".join(format_markdown("".join(texts), formatting) for formatting, texts in segments)
+    markdown = HORIZONTAL_WHITESPACE.sub(" ", markdown)
+    return LINE_BREAK_WHITESPACE.sub("\n", markdown).strip()
 
 
-def paragraph_to_markdown(paragraph) -> str:
+def paragraph_to_markdown(paragraph, style_names: Optional[dict] = None) -> str:
     """Convert a paragraph to markdown."""
-    style = get_paragraph_style(paragraph)
-    text_parts = [run_to_markdown(run) for run in paragraph.runs]
-    text = "".join(text_parts).strip()
+    style = get_paragraph_style(paragraph, style_names)
+    text = runs_to_markdown(paragraph._element.iterchildren(W_R))
 
     if not text:
         return ""
 
-    # Handle heading styles
-    if style.startswith("Heading"):
-        try:
-            level = int(style.replace("Heading", "").strip())
-            level = min(level, 6)  # Markdown supports h1-h6
-            return "#" * level + " " + text
-        except ValueError:
-            pass
+    # Handle heading styles (markdown supports h1-h6)
+    level = heading_level(style)
+    if level:
+        return "#" * level + " " + text
 
     # Handle list styles
     if style.startswith("List"):
@@ -187,30 +342,85 @@ def paragraph_to_markdown(paragraph) -> str:
     return text
 
 
+def paragraph_xml_text(paragraph) -> str:
+    """Text of a w:p element, as python-docx's Paragraph.text renders it."""
+    parts = []
+    for child in paragraph.iterchildren(W_R, W_HYPERLINK):
+        runs = [child] if child.tag == W_R else child.iterchildren(W_R)
+        parts.extend(run_text(run) for run in runs)
+    return "".join(parts)
+
+
+def read_table(tbl) -> TableGrid:
+    """Lay a w:tbl element's cells out on its grid in a single pass.
+
+    python-docx's row.cells rebuilds the whole grid on every access and
+    repeats a merged cell's text in each position it covers. Here each w:tc
+    is visited once: gridBefore skips leading grid columns, gridSpan widens
+    a cell, and a vMerge continuation extends the cell above it instead of
+    repeating its text. Only paragraphs directly in a cell are read, as with
+    python-docx's cell.paragraphs.
+    """
+    rows = []
+    spans = {}          # (row, column) of each merged cell -> [row_span, col_span]
+    vertical = {}       # column -> origin of the vertical merge still open there
+    column_count = 0
+
+    for row_index, tr in enumerate(tbl.iterchildren(W_TR)):
+        row = []
+        properties = tr.find(W_TRPR)
+        before = properties.find(W_GRID_BEFORE) if properties is not None else None
+        if before is not None:
+            row.extend([] for _ in range(int(before.get(W_VAL, 0))))
+
+        for tc in tr.iterchildren(W_TC):
+            column = len(row)
+            properties = tc.find(W_TCPR)
+            col_span, merge = 1, None
+            if properties is not None:
+                span = properties.find(W_GRID_SPAN)
+                if span is not None:
+                    col_span = max(1, int(span.get(W_VAL, 1)))
+                merge = properties.find(W_VMERGE)
+
+            if merge is not None and merge.get(W_VAL, "continue") == "continue" and column in vertical:
+                spans[vertical[column]][0] += 1
+                row.extend([] for _ in range(col_span))
+                continue
+
+            row.append([paragraph_xml_text(p) for p in tc.iterchildren(W_P)])
+            row.extend([] for _ in range(col_span - 1))
+            for covered in range(column, column + col_span):
+                vertical.pop(covered, None)
+            if merge is not None or col_span > 1:
+                spans[(row_index, column)] = [1, col_span]
+                if merge is not None:
+                    vertical[column] = (row_index, column)
+
+        rows.append(row)
+        column_count = max(column_count, len(row))
+
+    for row in rows:
+        row.extend([] for _ in range(column_count - len(row)))
+    merged = [(r, c, row_span, col_span) for (r, c), (row_span, col_span) in spans.items()
+              if row_span > 1 or col_span > 1]
+    return TableGrid(rows=rows, spans=merged, column_count=column_count)
+
+
+def cell_markdown_text(paragraphs: list) -> str:
+    """One-line cell text for markdown tables and JSON rows."""
+    return " ".join(p.strip() for p in paragraphs)
+
+
 def table_to_markdown(table) -> str:
     """Convert a table to markdown format."""
-    if not table.rows:
-        return ""
-
-    # Extract all cell contents
-    rows_data = []
-    max_cols = 0
-    for row in table.rows:
-        row_data = []
-        for cell in row.cells:
-            cell_text = " ".join(p.text.strip() for p in cell.paragraphs)
-            cell_text = cell_text.replace("|", "\\|")  # Escape pipes
-            row_data.append(cell_text)
-        rows_data.append(row_data)
-        max_cols = max(max_cols, len(row_data))
-
-    if not rows_data:
+    grid = read_table(table._element)
+    if not grid.rows:
         return ""
 
-    # Normalize column count
-    for row in rows_data:
-        while len(row) < max_cols:
-            row.append("")
+    rows_data = [[cell_markdown_text(cell).replace("|", "\\|") for cell in row]  # Escape pipes
+                 for row in grid.rows]
+    max_cols = grid.column_count
 
     # Build markdown table
     lines = []
@@ -231,6 +441,18 @@ def table_to_markdown(table) -> str:
     return "\n".join(lines)
 
 
+def table_to_json(table, index: int) -> DocxTable:
+    """Structured form of a table for JSON output."""
+    grid = read_table(table._element)
+    return DocxTable(
+        index=index,
+        rows=[[cell_markdown_text(cell) for cell in row] for row in grid.rows],
+        column_count=grid.column_count,
+        merged_cells=[{"row": r, "column": c, "row_span": rs, "col_span": cs}
+                      for r, c, rs, cs in grid.spans]
+    )
+
+
 def extract_images(doc, output_dir: str) -> List[ExtractedImage]:
     """Extract all images from the document."""
     images = []
@@ -278,74 +500,270 @@ def extract_images(doc, output_dir: str) -> List[ExtractedImage]:
     return images
 
 
-def extract_text_plain(doc) -> str:
-    """Extract plain text from document."""
-    lines = []
-
-    for element in doc.element.body:
+def heading_level(style_name: str) -> Optional[int]:
+    """Markdown heading level for a "Heading N" style name, else None."""
+    match = HEADING_STYLE_PATTERN.match(style_name)
+    return min(int(match.group(1)), 6) if match else None
+
+
+def extract_outline(doc) -> List[OutlineEntry]:
+    """List the document's headings with the body elements each section spans.
+
+    Reads paragraph styles and text straight from the body XML, without
+    building python-docx Paragraph objects, so it costs far less than a
+    conversion. Headings are the "Heading N" styles paragraph_to_markdown
+    turns into markdown headings; numbers follow their nesting (1, 1.1, 1.2,
+    2, ...), so the outline can be used to pick sections even when the
+    document's own numbering is not in the text.
+    """
+    levels_by_style = {}
+    for style in doc.styles:
+        level = heading_level(style.name or "")
+        if level:
+            levels_by_style[style.style_id] = level
+
+    entries = []
+    open_sections = []   # entries whose section has not ended yet
+    counters = []
+    index = -1
+    for index, element in enumerate(doc.element.body.iterchildren()):
+        if element.tag != W_P:
+            continue
+        properties = element.find(W_PPR)
+        style = properties.find(W_PSTYLE) if properties is not None else None
+        level = levels_by_style.get(style.get(W_VAL)) if style is not None else None
+        if not level:
+            continue
+        title = "".join(node.text or "" for node in element.iter(W_T)).strip()
+        if not title:
+            continue
+
+        while open_sections and open_sections[-1].level >= level:
+            open_sections.pop().end = index
+        del counters[level:]
+        counters.extend([0] * (level - len(counters)))
+        counters[level - 1] += 1
+        entry = OutlineEntry(".".join(str(c) for c in counters), level, title, index, index)
+        entries.append(entry)
+        open_sections.append(entry)
+
+    for entry in open_sections:
+        entry.end = index + 1
+    return entries
+
+
+def select_sections(outline: List[OutlineEntry], numbers: Optional[List[str]] = None,
+                    headings: Optional[List[str]] = None) -> list:
+    """Body index ranges for sections chosen by outline number or heading text.
+
+    Heading matches are case-insensitive substrings. Overlapping ranges
+    (a section and one of its subsections) are merged. Raises ValueError
+    when nothing matches.
+    """
+    ranges = []
+    for number in numbers or []:
+        matches = [e for e in outline if e.number == number.strip().rstrip(".")]
+        if not matches:
+            raise ValueError(f"No section numbered {number} (see --outline)")
+        ranges.extend((e.start, e.end) for e in matches)
+    for text in headings or []:
+        matches = [e for e in outline if text.lower() in e.title.lower()]
+        if not matches:
+            raise ValueError(f"No heading matching '{text}' (see --outline)")
+        ranges.extend((e.start, e.end) for e in matches)
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+
+def iter_body_items(doc, ranges: Optional[list] = None, indexed: bool = False):
+    """Yield the body's Paragraph and Table objects in document order.
+
+    Each element is wrapped directly rather than found by scanning
+    doc.paragraphs/doc.tables, and with ranges (body index spans from
+    select_sections) only the elements inside them are visited. indexed
+    yields (body index, item) pairs instead.
+    """
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    children = list(doc.element.body.iterchildren())
+    for start, end in ranges or [(0, len(children))]:
+        for index in range(start, min(end, len(children))):
+            element = children[index]
+            if element.tag == W_P:
+                item = Paragraph(element, doc._body)
+            elif element.tag == W_TBL:
+                item = Table(element, doc._body)
+            else:
+                continue
+            yield (index, item) if indexed else item
+
+
+class ContentBuilder:
+    """Collects output lines, counting words and characters as they arrive.
+
+    word_count and char_count equal len(content.split()) and len(content)
+    for the joined content, so the converted text is never re-scanned or
+    copied to measure it; the lines are joined once, by getvalue().
+    collapse_blank_lines keeps at most one blank line in a row and none at
+    the start or end, as the markdown output always has.
+    """
+
+    def __init__(self, collapse_blank_lines: bool = False):
+        self.lines = []
+        self.word_count = 0
+        self.char_count = 0
+        self.collapse_blank_lines = collapse_blank_lines
+        self._blank_pending = False
+
+    def add(self, line: str):
+        if self.collapse_blank_lines:
+            if not line:
+                self._blank_pending = bool(self.lines)
+                return
+            if self._blank_pending:
+                self._append("")
+                self._blank_pending = False
+            if "\n\n\n" in line:
+                line = re.sub(r"\n{3,}", "\n\n", line)
+        self._append(line)
+
+    def _append(self, line: str):
+        if self.lines:
+            self.char_count += 1  # the newline joining it to the previous line
+        self.lines.append(line)
+        self.char_count += len(line)
+        self.word_count += len(line.split())
+
+    def getvalue(self) -> str:
+        return "\n".join(self.lines)
+
+
+def extract_text_plain(doc, ranges: Optional[list] = None) -> ContentBuilder:
+    """Extract plain text from document (or from the given body ranges)."""
+    from docx.text.paragraph import Paragraph
+
+    content = ContentBuilder()
+
+    for item in iter_body_items(doc, ranges):
         # Handle paragraphs
-        if element.tag.endswith('p'):
-            for para in doc.paragraphs:
-                if para._element == element:
-                    text = para.text.strip()
-                    if text:
-                        lines.append(text)
-                    break
+        if isinstance(item, Paragraph):
+            text = item.text.strip()
+            if text:
+                content.add(text)
 
         # Handle tables
-        elif element.tag.endswith('tbl'):
-            for table in doc.tables:
-                if table._element == element:
-                    for row in table.rows:
-                        row_text = " | ".join(cell.text.strip() for cell in row.cells)
-                        if row_text.replace("|", "").strip():
-                            lines.append(row_text)
-                    lines.append("")  # Blank line after table
-                    break
+        else:
+            for row in read_table(item._element).rows:
+                row_text = " | ".join("\n".join(cell).strip() for cell in row)
+                if row_text.replace("|", "").strip():
+                    content.add(row_text)
+            content.add("")  # Blank line after table
 
-    return "\n".join(lines)
+    return content
 
 
-def extract_markdown(doc, image_dir: Optional[str] = None) -> str:
-    """Extract document content as markdown."""
-    lines = []
-    image_counter = 0
+def extract_markdown(doc, image_dir: Optional[str] = None,
+                     ranges: Optional[list] = None) -> ContentBuilder:
+    """Extract document content (or the given body ranges) as markdown."""
+    from docx.text.paragraph import Paragraph
+
+    # Multiple blank lines are collapsed as lines are added
+    content = ContentBuilder(collapse_blank_lines=True)
+    style_names = paragraph_style_names(doc)
 
     # Process document body in order
-    for element in doc.element.body:
+    for item in iter_body_items(doc, ranges):
         # Handle paragraphs
-        if element.tag.endswith('p'):
-            for para in doc.paragraphs:
-                if para._element == element:
-                    md = paragraph_to_markdown(para)
-                    if md:
-                        lines.append(md)
-                    else:
-                        lines.append("")  # Preserve empty paragraphs as spacing
-                    break
+        if isinstance(item, Paragraph):
+            # Empty paragraphs are kept as spacing
+            content.add(paragraph_to_markdown(item, style_names))
 
         # Handle tables
-        elif element.tag.endswith('tbl'):
-            for table in doc.tables:
-                if table._element == element:
-                    md_table = table_to_markdown(table)
-                    if md_table:
-                        lines.append("")
-                        lines.append(md_table)
-                        lines.append("")
-                    break
-
-    # Clean up multiple blank lines
-    content = "\n".join(lines)
-    content = re.sub(r'\n{3,}', '\n\n', content)
-
-    return content.strip()
+        else:
+            md_table = table_to_markdown(item)
+            if md_table:
+                content.add("")
+                content.add(md_table)
+                content.add("")
+
+    return content
+
+
+def iter_docx_blocks(source, markdown: bool = False,
+                     sections: Optional[List[str]] = None,
+                     headings: Optional[List[str]] = None) -> Iterator[DocxBlock]:
+    """Yield the document's non-empty paragraphs and its tables in order.
+
+    source is a path, a binary file object or the DOCX file's bytes. Each
+    block is converted only when the iterator reaches it, so a caller can
+    stop early or handle a long document block by block. markdown converts
+    text as --markdown does; sections and headings select outline sections
+    as in extract_docx (raising ValueError when nothing matches).
+
+    Nothing is printed; a missing python-docx raises ImportError and an
+    unreadable file raises the library's own error.
+    """
+    from docx import Document
+    from docx.text.paragraph import Paragraph
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    doc = Document(source)
+    style_names = paragraph_style_names(doc)
+
+    ranges = None
+    if sections or headings:
+        ranges = select_sections(extract_outline(doc), sections, headings)
+
+    table_number = 0
+    for index, item in iter_body_items(doc, ranges, indexed=True):
+        if isinstance(item, Paragraph):
+            if markdown:
+                text = paragraph_to_markdown(item, style_names)
+            else:
+                text = item.text.strip()
+            if not text:
+                continue
+            style = get_paragraph_style(item, style_names)
+            yield DocxBlock(
+                index=index,
+                kind="paragraph",
+                text=text,
+                style=style,
+                heading_level=heading_level(style)
+            )
+        else:
+            table_number += 1
+            table = table_to_json(item, table_number)
+            if markdown:
+                text = table_to_markdown(item)
+            else:
+                text = "\n".join(" | ".join(row) for row in table.rows
+                                 if "".join(row).strip())
+            yield DocxBlock(index=index, kind="table", text=text, table=table)
 
 
 def extract_docx(file_path: str, as_markdown: bool = False,
                  extract_images_to: Optional[str] = None,
-                 metadata_only: bool = False) -> ExtractionResult:
-    """Extract content from DOCX file."""
+                 metadata_only: bool = False,
+                 outline_only: bool = False,
+                 sections: Optional[List[str]] = None,
+                 headings: Optional[List[str]] = None,
+                 tables: bool = False) -> ExtractionResult:
+    """Extract content from DOCX file.
+
+    outline_only returns the heading outline without converting anything.
+    sections (outline numbers like "4.2") and headings (title substrings)
+    limit conversion to those sections, subsections included. tables adds
+    each table (in range) as structured rows.
+    """
     try:
         from docx import Document
     except ImportError:
@@ -363,8 +781,8 @@ def extract_docx(file_path: str, as_markdown: bool = False,
         # Store file path for metadata extraction
         doc._part.package.name = file_path
 
-        # Extract metadata
-        metadata = extract_metadata(doc)
+        # Extract metadata; text is counted during conversion unless metadata_only
+        metadata = extract_metadata(doc, count_text=metadata_only)
 
         if metadata_only:
             return ExtractionResult(
@@ -374,28 +792,52 @@ def extract_docx(file_path: str, as_markdown: bool = False,
                 content=""
             )
 
+        # Outline pass, used on its own or to find the requested sections
+        outline = None
+        ranges = None
+        if outline_only or sections or headings:
+            outline = extract_outline(doc)
+            if outline_only:
+                return ExtractionResult(
+                    success=True,
+                    file_path=file_path,
+                    metadata=metadata,
+                    content="",
+                    outline=outline
+                )
+            ranges = select_sections(outline, sections, headings)
+
         # Extract images if requested
         images = []
         if extract_images_to:
             images = extract_images(doc, extract_images_to)
             metadata.image_count = len(images)
 
-        # Extract content
+        # Extract content, counting words and characters as it is built
         if as_markdown:
-            content = extract_markdown(doc, extract_images_to)
+            builder = extract_markdown(doc, extract_images_to, ranges)
         else:
-            content = extract_text_plain(doc)
-
-        # Update metadata with actual counts
-        metadata.word_count = len(content.split())
-        metadata.char_count = len(content)
+            builder = extract_text_plain(doc, ranges)
+        metadata.word_count = builder.word_count
+        metadata.char_count = builder.char_count
+        content = builder.getvalue()
+        del builder
+
+        table_data = None
+        if tables:
+            from docx.table import Table
+            table_data = [table_to_json(item, index) for index, item in
+                          enumerate((i for i in iter_body_items(doc, ranges) if isinstance(i, Table)), 1)]
 
         return ExtractionResult(
             success=True,
             file_path=file_path,
             metadata=metadata,
             content=content,
-            images=images
+            images=images,
+            outline=[e for e in outline if any(start <= e.start < end for start, end in ranges)]
+            if ranges else None,
+            tables=table_data
         )
 
     except Exception as e:
@@ -463,6 +905,28 @@ def format_human_output(result: ExtractionResult) -> str:
         for img in result.images:
             lines.append(f"  {img.filename} ({format_file_size(img.size_bytes)}) -> {img.saved_path}")
 
+    # Outline section
+    if result.outline:
+        lines.extend([
+            "",
+            "OUTLINE",
+            "-" * 40
+        ])
+        for entry in result.outline:
+            indent = "  " * (entry.level - 1)
+            lines.append(f"{indent}{entry.number}  {entry.title}")
+
+    # Tables section
+    if result.tables:
+        lines.extend([
+            "",
+            "TABLES",
+            "-" * 40
+        ])
+        for table in result.tables:
+            merged = f", {len(table.merged_cells)} merged cells" if table.merged_cells else ""
+            lines.append(f"  Table {table.index}: {len(table.rows)} rows x {table.column_count} columns{merged}")
+
     # Content section
     if result.content:
         lines.extend([
@@ -477,8 +941,8 @@ def format_human_output(result: ExtractionResult) -> str:
     return "\n".join(lines)
 
 
-def format_json_output(result: ExtractionResult) -> str:
-    """Format extraction result as JSON."""
+def json_output_data(result: ExtractionResult) -> dict:
+    """Build the JSON-serialisable form of an extraction result."""
     output = {
         "success": result.success,
         "file_path": result.file_path,
@@ -489,10 +953,19 @@ def format_json_output(result: ExtractionResult) -> str:
         output["error"] = result.error
     else:
         output["content"] = result.content
+        if result.outline is not None:
+            output["outline"] = [asdict(entry) for entry in result.outline]
+        if result.tables is not None:
+            output["tables"] = [asdict(table) for table in result.tables]
         if result.images:
             output["images"] = [asdict(img) for img in result.images]
 
-    return json.dumps(output, indent=2, ensure_ascii=False)
+    return output
+
+
+def format_json_output(result: ExtractionResult, compact: bool = False) -> str:
+    """Format extraction result as JSON."""
+    return json_output.dumps(json_output_data(result), compact=compact)
 
 
 def main():
@@ -506,6 +979,10 @@ Examples:
   python extract_docx.py --file document.docx --extract-images --output-dir ./images/
   python extract_docx.py --file document.docx --metadata-only
   python extract_docx.py --file document.docx --json
+  python extract_docx.py --file spec.docx --outline
+  python extract_docx.py --file spec.docx --markdown --section 4.2
+  python extract_docx.py --file spec.docx --markdown --headings "Security" --headings "Glossary"
+  python extract_docx.py --file spec.docx --tables --json
         """
     )
 
@@ -514,7 +991,15 @@ Examples:
     parser.add_argument("--extract-images", "-i", action="store_true", help="Extract embedded images")
     parser.add_argument("--output-dir", "-o", default="./extracted_images", help="Directory for extracted images")
     parser.add_argument("--metadata-only", "-m", action="store_true", help="Extract only metadata")
+    parser.add_argument("--outline", action="store_true", help="List headings and section numbers only")
+    parser.add_argument("--section", "-s", action="append", metavar="NUMBER",
+                        help="Extract only this outline section, e.g. 4.2 (repeatable)")
+    parser.add_argument("--headings", action="append", metavar="TEXT",
+                        help="Extract only sections whose heading contains TEXT (repeatable)")
+    parser.add_argument("--tables", "-t", action="store_true",
+                        help="Include each table as structured rows (with merged cells) in --json output")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
 
     args = parser.parse_args()
 
@@ -532,12 +1017,16 @@ Examples:
         file_path=args.file,
         as_markdown=args.markdown,
         extract_images_to=args.output_dir if args.extract_images else None,
-        metadata_only=args.metadata_only
+        metadata_only=args.metadata_only,
+        outline_only=args.outline,
+        sections=args.section,
+        headings=args.headings,
+        tables=args.tables
     )
 
     # Format and output
     if args.json:
-        print(format_json_output(result))
+        json_output.dump(json_output_data(result), compact=args.compact)
     else:
         print(format_human_output(result))
 
@@ -5,29 +5,137 @@ Extract text and metadata from PDF files.
 Usage:
     python extract_pdf.py --file document.pdf
     python extract_pdf.py --file scanned.pdf --ocr
+    python extract_pdf.py --file scanned.pdf --ocr --dpi 300 --deskew --lang eng+deu
+    python extract_pdf.py --file scanned.pdf --ocr --profile --pages 1-3
+    python extract_pdf.py --file intake.pdf --ocr --ocr-cache ./ocr-cache.db
     python extract_pdf.py --file large.pdf --split 50
     python extract_pdf.py --file document.pdf --metadata-only
     python extract_pdf.py --file document.pdf --json
+    python extract_pdf.py --file report.pdf --tables
+    python extract_pdf.py --file paper.pdf --layout
+    python extract_pdf.py --file document.pdf --extract-images --output-dir ./images/
+    python extract_pdf.py --file report.pdf --strip-boilerplate
+    python extract_pdf.py --file huge.pdf --timeout 300 --page-timeout 20 --max-memory 2048
+    python extract_pdf.py --url https://example.com/archive.pdf --pages 1-3
 
 Features:
 - Text extraction using pypdf (pure Python) or pdftotext (if available)
-- OCR fallback for scanned/image PDFs (requires pytesseract)
+- OCR fallback for scanned/image PDFs (requires tesseract), reading a page's
+  embedded scan directly when there is one instead of rasterising the page,
+  with tunable DPI, colour mode, deskew/crop and one tesseract run per batch,
+  and a page cache shared across documents so repeated pages are OCRed once
 - Page-by-page extraction with page numbers
 - Metadata extraction (title, author, creation date, page count)
 - Split large PDFs into chunks by page range
+- Table detection from glyph positions (--tables), emitted as markdown or JSON
+- Column-aware reading order for multi-column pages (--layout), in-process
+- Embedded image and file attachment extraction, JPEGs written without re-encoding
+- Running header/footer and page-number stripping, kept per page so it can be undone
+- Per-document and per-page time limits and a memory ceiling; pages that
+  exceed them are skipped and listed in the result instead of stalling it
 - JSON output mode for programmatic use
+- Remote PDFs (--url) read with HTTP range requests, fetching only the
+  cross-reference data and the objects the requested pages use
+- Importable: iter_pdf_pages() yields PageContent lazily from a path, file
+  object or bytes, without printing
 """
 
 import argparse
-import json
+import hashlib
+import io
+import math
+import mimetypes
 import os
+import re
 import shutil
+import signal
+import sqlite3
+import struct
 import subprocess
 import sys
-from dataclasses import dataclass, asdict
+import tempfile
+import threading
+import time
+import urllib.request
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field, replace
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+import json_output
+
+# Table detection and layout analysis (pypdf only). Distances are in multiples
+# of the font size unless noted, so detection works the same at any zoom or
+# point size.
+AVG_GLYPH_WIDTH = 0.5         # estimated advance of one character without /Widths
+ROW_TOLERANCE = 0.5           # baselines closer than this share a row
+CELL_GAP = 1.0                # horizontal gap that starts a new cell
+MAX_ROW_GAP = 3.0             # vertical gap that ends a table
+MIN_GUTTER_WIDTH = 0.8        # minimum width of a gap between columns
+TABLE_MIN_ROWS = 2
+TABLE_MIN_COLUMNS = 2
+TABLE_KEY_COLUMN_WORDS = 3    # some column's median cell must be this short (not prose)
+TABLE_SPANNING_CELLS = 0.2    # fraction of rows allowed to cross a column gutter
+PROFILE_RESOLUTION = 1.0      # points per projection-profile bucket
+LAYOUT_MIN_GUTTER = 1.0       # minimum width of a gap between text columns
+LAYOUT_MIN_ROWS = 4           # lines a column needs before it counts as one
+LAYOUT_SPANNING_ROWS = 0.15   # fraction of lines allowed to cross a gutter (titles, captions)
+
+RUN_SPLIT_PATTERN = re.compile(r"\S+(?: \S+)*")  # split runs on 2+ spaces
+
+# Embedded images. Streams in these filters are complete image files already
+# and are written as-is; Flate-compressed Gray/RGB pixels are wrapped as PNG.
+PASSTHROUGH_IMAGE_FILTERS = {
+    "/DCTDecode": (".jpg", "image/jpeg"),
+    "/JPXDecode": (".jp2", "image/jp2"),
+}
+PNG_COLOR_TYPES = {"/DeviceGray": (1, 0), "/DeviceRGB": (3, 2)}  # components, PNG colour type
+OCR_MIN_SCAN_PIXELS = 1_000_000  # an embedded image this large on a font-less page is a scan
+
+# OCR tuning. Pages are rendered to files and passed to one tesseract process
+# per batch through a list file; tesseract separates pages with form feeds.
+OCR_DEFAULT_DPI = 200
+OCR_COLOR_MODES = ("color", "gray", "binary")
+OCR_BATCH_PAGES = 50          # pages rendered to disk before each tesseract run
+OCR_PROFILE_DPIS = (150, 200, 300)
+OCR_PROFILE_PAGES = 3         # pages sampled by --profile without --page/--pages
+DESKEW_MAX_ANGLE = 5.0        # degrees either way
+DESKEW_STEP = 0.5
+DESKEW_SAMPLE_WIDTH = 800     # pixels; angle search runs on a downscaled copy
+CROP_PADDING = 16             # pixels kept around the inked area
+
+# OCR page cache, shared by every document and run that uses the same file.
+# Keys hash the exact image passed to tesseract, so only byte-identical pages
+# (the same cover sheet or form stamped into many PDFs) share an entry.
+OCR_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                              "document-processor", "ocr-cache.db")
+OCR_CACHE_MAX_ENTRIES = 50_000   # least recently used pages are evicted beyond this
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.\-]+")
+PDF_METHODS = ("pypdf", "pdftotext", "ocr")
+
+# Running header/footer detection (--strip-boilerplate). Lines are compared
+# with digits masked, so "Page 3 of 120" and "Page 4 of 120" count as one.
+BOILERPLATE_EDGE_LINES = 3    # non-empty lines examined at the top and bottom of each page
+BOILERPLATE_MIN_SHARE = 0.4   # fraction of pages a line must recur on
+BOILERPLATE_MIN_PAGES = 3
+BOILERPLATE_DIGITS = re.compile(r"\d+")
+
+# Time limits for external commands when no --page-timeout is given, so a
+# stuck pdftotext, pdftoppm or tesseract can never hang a run.
+COMMAND_TIMEOUT = 120         # seconds per pdfinfo/pdftotext call
+OCR_PAGE_TIMEOUT = 120        # seconds per page of an OCR batch
+
+# Remote PDFs (--url). Reads are served from fixed-size blocks fetched with
+# HTTP range requests; consecutive missing blocks are fetched in one request.
+REMOTE_BLOCK_SIZE = 64 * 1024
+REMOTE_CACHE_BLOCKS = 1024    # blocks kept in memory (64 MB), least recently used dropped
+REMOTE_TIMEOUT = 60           # seconds per HTTP request
 
 
 @dataclass
@@ -45,12 +153,289 @@ class PDFMetadata:
     file_size_human: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class PageContent:
-    """Content from a single PDF page."""
+    """Content from a single PDF page. char_count is len(text)."""
     page_number: int
     text: str
     char_count: int
+    tables: Optional[list] = None  # PageTable list when table detection ran
+    header: Optional[str] = None   # lines removed from the top by strip_boilerplate
+    footer: Optional[str] = None   # lines removed from the bottom
+
+    @property
+    def full_text(self) -> str:
+        """The page text with any stripped header and footer put back.
+
+        An empty text is skipped too: it means the header and footer
+        together took the whole page, and no separator was removed for it.
+        """
+        parts = (self.header, self.text or None, self.footer)
+        return "\n".join(part for part in parts if part is not None)
+
+
+class PageStore:
+    """The pages of an extraction, with all their text in one bytes buffer.
+
+    A list of PageContent costs a dataclass, a str and an int object per
+    page; here a page is an entry in each of a few typed arrays: where its
+    text ends in the buffer, which encoding it is stored in, the byte
+    sizes of the header and footer that strip_boilerplate split off (-1
+    for none), its page number and its character count. Tables, which few
+    pages have, are kept by index.
+
+    Each page is stored in whichever of UTF-8 and a fixed-width encoding
+    (Latin-1 or UTF-16) is shorter, so pages of CJK text take no more room
+    than CPython's own strings would. The buffer is frozen to bytes once
+    the pages are in, dropping the slack a growing bytearray keeps.
+
+    Indexing, slicing and iteration build PageContent objects on demand,
+    so code written for a list of pages works unchanged. text(i) decodes
+    just the page body, and view(i) is the body as a zero-copy memoryview
+    of the buffer, in encoding(i).
+    """
+
+    ENCODINGS = ("utf-8", "latin-1", "utf-16-le")
+
+    __slots__ = ("_buffer", "_ends", "_encodings", "_header_sizes", "_footer_sizes",
+                 "_numbers", "_char_counts", "_tables")
+
+    def __init__(self, pages=()):
+        self._buffer = bytearray()
+        self._ends = array("q")
+        self._encodings = array("b")
+        self._header_sizes = array("i")
+        self._footer_sizes = array("i")
+        self._numbers = array("i")
+        self._char_counts = array("i")
+        self._tables = {}
+        for page in pages:
+            self.append(page)
+        self.freeze()
+
+    @classmethod
+    def _encoding_for(cls, text: str) -> int:
+        """Index in ENCODINGS of the shortest encoding of text."""
+        if text.isascii():
+            return 0
+        if max(text) <= "\xff":
+            return 1
+        # UTF-8 wins while most characters are ASCII, UTF-16 once most are not
+        return 0 if len(text.encode("utf-8")) <= len(text.encode("utf-16-le")) else 2
+
+    def append(self, page: PageContent):
+        """Add a page after the last one."""
+        parts = [part for part in (page.header, page.text, page.footer) if part is not None]
+        full_text = "\n".join(parts)
+        encoding = self._encoding_for(full_text)
+        codec = self.ENCODINGS[encoding]
+        self._add(full_text.encode(codec), encoding,
+                  len(page.header.encode(codec)) if page.header is not None else -1,
+                  len(page.footer.encode(codec)) if page.footer is not None else -1,
+                  page.page_number, page.char_count, page.tables)
+
+    def _add(self, data, encoding, header_size, footer_size, page_number, char_count, tables):
+        if tables is not None:
+            self._tables[len(self._numbers)] = tables
+        if isinstance(self._buffer, bytes):
+            self._buffer = bytearray(self._buffer)
+        self._buffer += data
+        self._ends.append(len(self._buffer))
+        self._encodings.append(encoding)
+        self._header_sizes.append(header_size)
+        self._footer_sizes.append(footer_size)
+        self._numbers.append(page_number)
+        self._char_counts.append(char_count)
+
+    def freeze(self):
+        """Trim the buffer and arrays to their contents once all pages are in.
+
+        Appending still works afterwards; it just copies the buffer back
+        into a bytearray first.
+        """
+        self._buffer = bytes(self._buffer)
+        for name in ("_ends", "_encodings", "_header_sizes", "_footer_sizes",
+                     "_numbers", "_char_counts"):
+            values = getattr(self, name)
+            setattr(self, name, array(values.typecode, values))
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]  # negative indexes, IndexError
+        header, footer = self.header(index), self.footer(index)
+        return PageContent(
+            page_number=self._numbers[index],
+            text=self.text(index),
+            char_count=self._char_counts[index],
+            tables=self._tables.get(index),
+            header=header,
+            footer=footer
+        )
+
+    def __iter__(self) -> Iterator[PageContent]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _range(self, index: int) -> tuple:
+        return self._ends[index - 1] if index else 0, self._ends[index]
+
+    def _body_range(self, index: int) -> tuple:
+        start, end = self._range(index)
+        separator = len("\n".encode(self.encoding(index)))
+        if self._header_sizes[index] >= 0:
+            start += self._header_sizes[index] + separator
+        if self._footer_sizes[index] >= 0:
+            end -= self._footer_sizes[index] + separator
+        return start, max(start, end)
+
+    def encoding(self, index: int) -> str:
+        """The codec a page's bytes are stored in."""
+        return self.ENCODINGS[self._encodings[index]]
+
+    def view(self, index: int) -> memoryview:
+        """The page body as bytes in encoding(index), without copying."""
+        start, end = self._body_range(index)
+        return memoryview(self._buffer)[start:end]
+
+    def text(self, index: int) -> str:
+        """The page body (without any stripped header and footer)."""
+        start, end = self._body_range(index)
+        return self._buffer[start:end].decode(self.encoding(index))
+
+    def full_text(self, index: int) -> str:
+        """The page text as extracted, header and footer included."""
+        start, end = self._range(index)
+        return self._buffer[start:end].decode(self.encoding(index))
+
+    def header(self, index: int) -> Optional[str]:
+        size = self._header_sizes[index]
+        if size < 0:
+            return None
+        start = self._range(index)[0]
+        return self._buffer[start:start + size].decode(self.encoding(index))
+
+    def footer(self, index: int) -> Optional[str]:
+        size = self._footer_sizes[index]
+        if size < 0:
+            return None
+        end = self._range(index)[1]
+        return self._buffer[end - size:end].decode(self.encoding(index))
+
+    def page_number(self, index: int) -> int:
+        return self._numbers[index]
+
+    def char_count(self, index: int) -> int:
+        return self._char_counts[index]
+
+    @property
+    def total_chars(self) -> int:
+        return sum(self._char_counts)
+
+    def trim(self, index: int, header: Optional[str], footer: Optional[str]):
+        """Mark leading and trailing lines of a page's text as header and footer.
+
+        Nothing is moved: the body just becomes the part of the page's
+        bytes between them, and its character count is updated.
+        """
+        codec = self.encoding(index)
+        self._header_sizes[index] = len(header.encode(codec)) if header is not None else -1
+        self._footer_sizes[index] = len(footer.encode(codec)) if footer is not None else -1
+        self._char_counts[index] = len(self.text(index))
+
+    def select(self, page_numbers) -> "PageStore":
+        """A new store holding only the pages whose numbers are in page_numbers."""
+        selected = PageStore()
+        for index, number in enumerate(self._numbers):
+            if number in page_numbers:
+                start, end = self._range(index)
+                selected._add(self._buffer[start:end], self._encodings[index],
+                              self._header_sizes[index], self._footer_sizes[index], number,
+                              self._char_counts[index], self._tables.get(index))
+        selected.freeze()
+        return selected
+
+
+@dataclass
+class TextRun:
+    """A run of text at a known position on the page (PDF user space)."""
+    x: float
+    y: float
+    width: float
+    size: float
+    text: str
+
+    @property
+    def end(self) -> float:
+        return self.x + self.width
+
+
+@dataclass
+class PageTable:
+    """A table detected on a page. The first row is treated as the header."""
+    page_number: int
+    rows: list
+    column_count: int
+
+    def to_markdown(self) -> str:
+        def cell(text: str) -> str:
+            return text.replace("|", "\\|")
+        lines = ["| " + " | ".join(cell(c) for c in self.rows[0]) + " |",
+                 "|" + "---|" * self.column_count]
+        for row in self.rows[1:]:
+            lines.append("| " + " | ".join(cell(c) for c in row) + " |")
+        return "\n".join(lines)
+
+
+@dataclass
+class OCROptions:
+    """Rendering, preprocessing and tesseract settings for OCR."""
+    dpi: int = OCR_DEFAULT_DPI
+    color: str = "gray"              # one of OCR_COLOR_MODES
+    psm: Optional[int] = None        # tesseract page segmentation mode
+    languages: str = "eng"           # tesseract -l value, e.g. "eng+deu"
+    deskew: bool = False
+    crop: bool = False
+
+    @property
+    def preprocess(self) -> bool:
+        """Whether pages need pixel-level work before tesseract sees them."""
+        return self.deskew or self.crop or self.color == "binary"
+
+
+@dataclass
+class ExtractedImage:
+    """Information about an extracted image or file attachment."""
+    filename: str
+    original_name: str
+    content_type: str
+    size_bytes: int
+    saved_path: Optional[str] = None
+    page_number: Optional[int] = None  # first page using the image; None for attachments
+
+
+@dataclass
+class ExtractionLimits:
+    """Time and memory budgets for extracting one document (None: no limit)."""
+    document_seconds: Optional[float] = None
+    page_seconds: Optional[float] = None
+    max_rss_mb: Optional[int] = None
+
+
+@dataclass
+class SkippedPage:
+    """A page left out because it ran over a time or memory limit.
+
+    reason is "timeout" (the page itself ran out of time), "document
+    timeout" (the document's time ran out before the page was reached) or
+    "memory" (the process was over max_rss_mb).
+    """
+    page_number: int
+    reason: str
+    seconds: Optional[float] = None  # time spent on the page before it was abandoned
 
 
 @dataclass
@@ -59,10 +444,15 @@ class ExtractionResult:
     success: bool
     file_path: str
     metadata: PDFMetadata
-    pages: list
+    pages: PageStore
     total_chars: int
     extraction_method: str
     error: Optional[str] = None
+    images: list = field(default_factory=list)
+    attachments: list = field(default_factory=list)
+    stripped_chars: Optional[int] = None  # set when boilerplate stripping ran
+    skipped_pages: list = field(default_factory=list)  # SkippedPage list
+    ocr_cache_hits: Optional[int] = None  # pages read from the OCR cache, when one was used
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -104,8 +494,1332 @@ def check_tesseract() -> bool:
     return shutil.which("tesseract") is not None
 
 
-def extract_with_pypdf(file_path: str) -> ExtractionResult:
-    """Extract PDF content using pypdf library."""
+class ExtractionTimeout(BaseException):
+    """Raised by time_limit when a page or document runs out of time.
+
+    A BaseException, like KeyboardInterrupt, so that the broad exception
+    handlers inside pypdf cannot swallow it.
+    """
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]):
+    """Raise ExtractionTimeout inside the block once seconds have passed.
+
+    Uses SIGALRM, so the limit is only enforced in the main thread on Unix
+    (which includes process pool workers); elsewhere the block runs to
+    completion and only the document deadline, checked between pages,
+    applies. Not reentrant.
+    """
+    if seconds is None or not hasattr(signal, "setitimer") \
+            or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ExtractionTimeout(seconds)
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, max(seconds, 0.001))
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes.
+
+    Read from /proc on Linux; elsewhere the peak RSS from getrusage, which
+    never goes down but still catches a process that has grown too large.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PageBudget:
+    """One document's ExtractionLimits, checked page by page.
+
+    Pages that do not fit are appended to skipped as SkippedPage entries;
+    the rest of the document is still extracted, so one pathological page
+    costs at most page_seconds and never fails the whole document.
+    """
+
+    def __init__(self, limits: Optional[ExtractionLimits] = None, skipped: Optional[list] = None):
+        self.limits = limits or ExtractionLimits()
+        self.skipped = skipped if skipped is not None else []
+        self.started = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        if self.limits.document_seconds is None:
+            return None
+        return self.limits.document_seconds - (time.monotonic() - self.started)
+
+    def seconds(self, pages: int = 1) -> Optional[float]:
+        """Time allowed for the next pages: the page limit, capped by what is left."""
+        allowed = [limit for limit in (self.limits.page_seconds and self.limits.page_seconds * pages,
+                                       self.remaining()) if limit is not None]
+        return min(allowed) if allowed else None
+
+    def check(self, numbers: list) -> bool:
+        """Whether extraction can go on; if not, numbers are recorded as skipped."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self.skip(numbers, "document timeout")
+            return False
+        if self.limits.max_rss_mb and (current_rss() or 0) > self.limits.max_rss_mb * 1024 * 1024:
+            self.skip(numbers, "memory")
+            return False
+        return True
+
+    def skip(self, numbers: list, reason: str, seconds: Optional[float] = None):
+        self.skipped.extend(SkippedPage(number, reason, None if seconds is None else round(seconds, 2))
+                            for number in numbers)
+
+    def run(self, numbers: list, extract) -> Iterator[PageContent]:
+        """Yield extract(number, seconds) for each page that fits the budget.
+
+        seconds is the page's time allowance (None when unlimited), for
+        passing on to external commands as their timeout.
+        """
+        for position, number in enumerate(numbers):
+            if not self.check(numbers[position:]):
+                return
+            seconds = self.seconds()
+            started = time.monotonic()
+            try:
+                with time_limit(seconds):
+                    page = extract(number, seconds)
+            except (ExtractionTimeout, subprocess.TimeoutExpired):
+                self.skip([number], "timeout", time.monotonic() - started)
+                continue
+            except MemoryError:
+                self.skip([number], "memory", time.monotonic() - started)
+                continue
+            yield page
+
+
+class TextRunCollector:
+    """pypdf visitor_text callback that records positioned text runs.
+
+    pypdf reports each run with the current transformation and text matrices;
+    the run's origin is the text matrix translation mapped through the CTM.
+    Widths come from the font's /Widths array when it has one, otherwise
+    from AVG_GLYPH_WIDTH. Runs containing two or more consecutive spaces are
+    split, since some producers lay out whole table rows as one string
+    padded with spaces.
+    """
+
+    def __init__(self):
+        self.runs = []
+        self.font_widths = {}
+
+    def glyph_widths(self, font_dict) -> Optional[tuple]:
+        """(first_char, widths) for a simple font, cached per font object."""
+        key = id(font_dict)
+        if key not in self.font_widths:
+            widths = None
+            try:
+                if font_dict is not None and "/Widths" in font_dict:
+                    widths = (int(font_dict.get("/FirstChar", 0)),
+                              [float(w) / 1000 for w in font_dict["/Widths"]])
+            except (TypeError, ValueError):
+                widths = None
+            self.font_widths[key] = widths
+        return self.font_widths[key]
+
+    def __call__(self, text, cm, tm, font_dict, font_size):
+        text = text.strip() if text else ""
+        if not text:
+            return
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        scale = math.hypot(tm[0] * cm[0] + tm[1] * cm[2], tm[0] * cm[1] + tm[1] * cm[3])
+        size = abs(font_size * scale) or 1.0
+        widths = self.glyph_widths(font_dict)
+
+        def advance(chars: str) -> float:
+            if widths is None:
+                return len(chars) * size * AVG_GLYPH_WIDTH
+            first, table = widths
+            total = 0.0
+            for char in chars:
+                index = ord(char) - first
+                total += table[index] if 0 <= index < len(table) else AVG_GLYPH_WIDTH
+            return total * size
+
+        text = text.replace("\n", " ")
+        for match in RUN_SPLIT_PATTERN.finditer(text):
+            self.runs.append(TextRun(
+                x=x + advance(text[:match.start()]),
+                y=y,
+                width=advance(match.group()),
+                size=size,
+                text=match.group()
+            ))
+
+
+def group_rows(runs: list) -> list:
+    """Group runs into rows of shared baseline, top of the page first.
+
+    Baselines are hashed into bands of ROW_TOLERANCE font sizes; adjacent
+    occupied bands are merged so a row split across a band edge stays whole.
+    Only the occupied bands are sorted, and each row's runs are sorted by x.
+    """
+    if not runs:
+        return []
+    sizes = sorted(run.size for run in runs)
+    band = max(sizes[len(sizes) // 2] * ROW_TOLERANCE, 0.5)
+    buckets = defaultdict(list)
+    for run in runs:
+        buckets[math.floor(run.y / band)].append(run)
+
+    rows = []
+    previous_key = None
+    for key in sorted(buckets, reverse=True):
+        if previous_key is not None and previous_key - key == 1:
+            rows[-1].extend(buckets[key])
+        else:
+            rows.append(buckets[key])
+        previous_key = key
+
+    for row in rows:
+        row.sort(key=lambda run: run.x)
+    return rows
+
+
+def row_cells(row: list) -> list:
+    """Merge a row's runs into cells, splitting where the gap exceeds CELL_GAP."""
+    cells = []
+    for run in row:
+        if cells and run.x - cells[-1].end <= CELL_GAP * run.size:
+            cell = cells[-1]
+            cell.text += " " + run.text
+            cell.width = max(cell.end, run.end) - cell.x
+        else:
+            cells.append(TextRun(run.x, run.y, run.width, run.size, run.text))
+    return cells
+
+
+def projection_gutters(spans: list, min_width: float, max_crossings: int = 0) -> list:
+    """Find vertical gutters in an x-projection profile of (start, end) spans.
+
+    Coverage is accumulated in a difference array of PROFILE_RESOLUTION-point
+    buckets, so the cost is linear in the number of spans plus the width of
+    the region. A gutter is a stretch at least min_width wide, between the
+    leftmost and rightmost covered buckets, crossed by at most max_crossings
+    spans. Returns (start, end) pairs in points.
+    """
+    if not spans:
+        return []
+    left = min(start for start, _ in spans)
+    right = max(end for _, end in spans)
+    resolution = max(PROFILE_RESOLUTION, (right - left) / 10000)
+    buckets = int((right - left) / resolution) + 2
+    delta = [0] * (buckets + 1)
+    for start, end in spans:
+        delta[int((start - left) / resolution)] += 1
+        delta[int((end - left) / resolution) + 1] -= 1
+
+    gutters = []
+    coverage = 0
+    gap_start = None
+    for index in range(buckets):
+        coverage += delta[index]
+        if coverage <= max_crossings:
+            if gap_start is None:
+                gap_start = index
+        elif gap_start is not None:
+            if gap_start > 0 and (index - gap_start) * resolution >= min_width:
+                gutters.append((left + gap_start * resolution, left + index * resolution))
+            gap_start = None
+    return gutters
+
+
+def build_table(page_number: int, block: list) -> Optional[PageTable]:
+    """Turn a block of multi-cell rows into a PageTable, or None if it isn't one."""
+    cells = [cell for row in block for cell in row]
+    size = sorted(cell.size for cell in cells)[len(cells) // 2]
+    gutters = projection_gutters(
+        [(cell.x, cell.end) for cell in cells],
+        min_width=MIN_GUTTER_WIDTH * size,
+        max_crossings=int(len(block) * TABLE_SPANNING_CELLS)
+    )
+    column_count = len(gutters) + 1
+    if column_count < TABLE_MIN_COLUMNS:
+        return None
+
+    # Column boundaries are the gutter midpoints; cells are placed by their
+    # start so a header spanning a gutter lands in its first column
+    boundaries = [(start + end) / 2 for start, end in gutters]
+    rows = []
+    for row in block:
+        values = [""] * column_count
+        for cell in row:
+            column = bisect_right(boundaries, cell.x)
+            values[column] = f"{values[column]} {cell.text}".strip()
+        rows.append(values)
+
+    if sum(1 for values in rows if sum(1 for v in values if v) >= 2) < TABLE_MIN_ROWS:
+        return None
+
+    # Side-by-side prose columns also have gutters; a table has at least one
+    # column of short values (labels, codes, numbers)
+    def median_words(column: int) -> int:
+        counts = sorted(len(values[column].split()) for values in rows if values[column])
+        return counts[len(counts) // 2] if counts else 0
+    if min(median_words(column) for column in range(column_count)) > TABLE_KEY_COLUMN_WORDS:
+        return None
+    return PageTable(page_number=page_number, rows=rows, column_count=column_count)
+
+
+def detect_tables(page_number: int, runs: list) -> list:
+    """Detect tables among a page's positioned text runs.
+
+    Rows with two or more cells that follow each other without a large
+    vertical gap form candidate blocks; a block becomes a table when a
+    projection profile of its cells shows at least one column gutter.
+    """
+    tables = []
+    block = []
+    previous = None
+
+    def flush():
+        if len(block) >= TABLE_MIN_ROWS:
+            table = build_table(page_number, block)
+            if table:
+                tables.append(table)
+        block.clear()
+
+    for row in group_rows(runs):
+        cells = row_cells(row)
+        y = row[0].y
+        if previous is not None and previous - y > MAX_ROW_GAP * row[0].size:
+            flush()
+        if len(cells) >= 2:
+            block.append(cells)
+        else:
+            flush()
+        previous = y
+    flush()
+    return tables
+
+
+def layout_text(runs: list) -> Optional[str]:
+    """Rebuild a page's text in reading order when it is set in columns.
+
+    Column gutters are found with a projection profile of every run on the
+    page, allowing a few lines (titles, full-width figures and captions) to
+    cross them. Lines are then read column by column; a line that crosses a
+    gutter closes the current band of columns and is emitted on its own, so
+    a full-width heading between two column sections stays in place.
+    Returns None for single-column pages, or when the "columns" hold short
+    values like a table, so the caller keeps pypdf's own text.
+    """
+    rows = group_rows(runs)
+    if len(rows) < LAYOUT_MIN_ROWS:
+        return None
+    size = sorted(run.size for run in runs)[len(runs) // 2]
+    gutters = projection_gutters(
+        [(run.x, run.end) for run in runs],
+        min_width=LAYOUT_MIN_GUTTER * size,
+        max_crossings=int(len(rows) * LAYOUT_SPANNING_ROWS)
+    )
+    if not gutters:
+        return None
+
+    boundaries = [(start + end) / 2 for start, end in gutters]
+    bands = []  # (lines per column, full-width line that follows them or None)
+    columns = [[] for _ in range(len(gutters) + 1)]
+    for row in rows:
+        if any(run.x < boundary < run.end for run in row for boundary in boundaries):
+            bands.append((columns, " ".join(run.text for run in row)))
+            columns = [[] for _ in range(len(gutters) + 1)]
+            continue
+        parts = defaultdict(list)
+        for run in row:
+            parts[bisect_right(boundaries, run.x)].append(run.text)
+        for index, texts in parts.items():
+            columns[index].append(" ".join(texts))
+    bands.append((columns, None))
+
+    # Text columns hold lines of prose; short values side by side are a table
+    for index in range(len(gutters) + 1):
+        lines = [line for band, _ in bands for line in band[index]]
+        words = sorted(len(line.split()) for line in lines)
+        if len(lines) < LAYOUT_MIN_ROWS or words[len(words) // 2] <= TABLE_KEY_COLUMN_WORDS:
+            return None
+
+    output = []
+    for band, spanning in bands:
+        for lines in band:
+            output.extend(lines)
+        if spanning is not None:
+            output.append(spanning)
+    return "\n".join(output)
+
+
+def png_bytes(width: int, height: int, bits: int, color_type: int, components: int,
+              pixels: bytes) -> bytes:
+    """Wrap raw, unpredicted pixel rows in a minimal PNG container."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    stride = (width * components * bits + 7) // 8
+    rows = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bits, color_type, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b""))
+
+
+def image_file_bytes(xobject) -> Optional[tuple]:
+    """Return (data, extension, content_type) for an image XObject, or None.
+
+    JPEG and JPEG 2000 streams are returned as stored in the PDF. Other
+    8-bit (or 1-bit gray) DeviceGray/DeviceRGB images are wrapped as PNG;
+    anything else (indexed, CMYK, masks via /Decode) is decoded through
+    pypdf and Pillow when Pillow is installed.
+    """
+    filters = xobject.get("/Filter")
+    filters = [str(f) for f in filters] if isinstance(filters, list) else [str(filters)] if filters else []
+    if filters and filters[-1] in PASSTHROUGH_IMAGE_FILTERS:
+        extension, content_type = PASSTHROUGH_IMAGE_FILTERS[filters[-1]]
+        return xobject.get_data(), extension, content_type
+
+    color_space = xobject.get("/ColorSpace")
+    bits = int(xobject.get("/BitsPerComponent", 8))
+    if (str(color_space) in PNG_COLOR_TYPES and "/Decode" not in xobject
+            and (bits == 8 or (bits == 1 and str(color_space) == "/DeviceGray"))):
+        components, color_type = PNG_COLOR_TYPES[str(color_space)]
+        data = png_bytes(int(xobject["/Width"]), int(xobject["/Height"]), bits,
+                         color_type, components, xobject.get_data())
+        return data, ".png", "image/png"
+
+    try:
+        image = xobject.decode_as_image()
+    except ImportError:
+        return None  # needs Pillow
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue(), ".png", "image/png"
+
+
+def iter_page_images(page, seen: set):
+    """Yield (name, image XObject) for images a page uses, including inside
+    Form XObjects, skipping any object reference already in seen."""
+    pending = [page.get("/Resources")]
+    while pending:
+        resources = pending.pop()
+        resources = resources.get_object() if resources is not None else None
+        if not resources or "/XObject" not in resources:
+            continue
+        for name, reference in resources["/XObject"].get_object().items():
+            key = (reference.idnum, reference.generation) if hasattr(reference, "idnum") else id(reference)
+            if key in seen:
+                continue
+            seen.add(key)
+            xobject = reference.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                yield str(name).lstrip("/"), xobject
+            elif subtype == "/Form":
+                pending.append(xobject.get("/Resources"))
+
+
+def image_placement(page, name: str) -> Optional[list]:
+    """The [a, b, c, d, e, f] matrix that draws XObject name, if the page's
+    content stream does nothing but place it (q, Q, cm and one Do).
+
+    Returns None for anything else (clipping, colour or graphics-state
+    changes, text, paths, several draws), which the image file alone would
+    not reproduce.
+    """
+    contents = page.get_contents()
+    if contents is None:
+        return None
+    matrix, stack, placed = [1, 0, 0, 1, 0, 0], [], None
+    for operands, operator in contents.operations:
+        if operator == b"q":
+            stack.append(matrix)
+        elif operator == b"Q":
+            if not stack:
+                return None
+            matrix = stack.pop()
+        elif operator == b"cm":
+            a, b, c, d, e, f = (float(value) for value in operands)
+            m = matrix
+            matrix = [a * m[0] + b * m[2], a * m[1] + b * m[3],
+                      c * m[0] + d * m[2], c * m[1] + d * m[3],
+                      e * m[0] + f * m[2] + m[4], e * m[1] + f * m[3] + m[5]]
+        elif operator == b"Do" and operands and operands[0] == name and placed is None:
+            placed = matrix
+        else:
+            return None
+    return placed
+
+
+def scanned_page_file(page) -> Optional[tuple]:
+    """(data, extension) of the page's scan when the page is a single embedded image.
+
+    Pages with fonts, several images or Form XObjects return None and have
+    to be rasterised instead. So do scans whose stored pixels are not what
+    the page shows: pages with /Rotate, images placed rotated, mirrored,
+    clipped or extending past the crop box, and inverted (/Decode) or
+    stencil-mask images.
+    """
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    if "/Font" in resources or "/XObject" not in resources:
+        return None
+    named = list(resources["/XObject"].get_object().items())
+    if len(named) != 1 or named[0][1].get_object().get("/Subtype") != "/Image":
+        return None
+    name, xobject = named[0][0], named[0][1].get_object()
+    if int(xobject.get("/Width", 0)) * int(xobject.get("/Height", 0)) < OCR_MIN_SCAN_PIXELS:
+        return None
+    if page.rotation % 360 or "/Decode" in xobject or xobject.get("/ImageMask"):
+        return None
+
+    matrix = image_placement(page, name)
+    if matrix is None:
+        return None
+    a, b, c, d, e, f = matrix
+    box = page.cropbox
+    tolerance = 1.0  # points
+    if (b or c or a <= 0 or d <= 0
+            or e < float(box.left) - tolerance or f < float(box.bottom) - tolerance
+            or e + a > float(box.right) + tolerance or f + d > float(box.top) + tolerance):
+        return None
+
+    image_file = image_file_bytes(xobject)
+    if image_file is None or image_file[1] == ".jp2":
+        return None  # tesseract's image reader has no JPEG 2000 support
+    return image_file[0], image_file[1]
+
+
+def otsu_threshold(histogram: list) -> int:
+    """Grey level that best separates ink from paper in a 256-bin histogram."""
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_level, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def deskew_angle(gray) -> float:
+    """Rotation in degrees that makes text lines horizontal.
+
+    Tries each angle in DESKEW_STEP increments on a downscaled, binarised
+    copy and keeps the one whose row profile (mean ink per pixel row) has
+    the highest variance: aligned lines give sharp peaks and empty gaps.
+    """
+    from PIL import Image
+
+    scale = min(1.0, DESKEW_SAMPLE_WIDTH / gray.width)
+    sample = gray.resize((max(1, int(gray.width * scale)), max(1, int(gray.height * scale))))
+    threshold = otsu_threshold(sample.histogram())
+    ink = sample.point(lambda v: 255 if v <= threshold else 0)
+
+    best_angle, best_score = 0.0, -1.0
+    steps = int(DESKEW_MAX_ANGLE / DESKEW_STEP)
+    for step in range(-steps, steps + 1):
+        angle = step * DESKEW_STEP
+        rotated = ink.rotate(angle, resample=Image.NEAREST, fillcolor=0)
+        rows = rotated.resize((1, rotated.height), Image.BOX).tobytes()
+        mean = sum(rows) / len(rows)
+        score = sum((value - mean) ** 2 for value in rows)
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def preprocess_image(image, options: OCROptions):
+    """Apply the colour mode, deskew and margin crop in options to a PIL image."""
+    from PIL import Image
+
+    if options.color == "color":
+        image = image.convert("RGB")
+        gray = image.convert("L") if options.deskew or options.crop else None
+    else:
+        image = gray = image.convert("L")
+
+    if options.deskew:
+        angle = deskew_angle(gray)
+        if angle:
+            fill = (255, 255, 255) if image.mode == "RGB" else 255
+            image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=fill)
+            gray = image.convert("L") if image.mode == "RGB" else image
+
+    if options.crop:
+        threshold = otsu_threshold(gray.histogram())
+        box = gray.point(lambda v: 255 if v <= threshold else 0).getbbox()
+        if box:
+            left, top, right, bottom = box
+            image = image.crop((max(0, left - CROP_PADDING), max(0, top - CROP_PADDING),
+                                min(image.width, right + CROP_PADDING),
+                                min(image.height, bottom + CROP_PADDING)))
+
+    if options.color == "binary":
+        threshold = otsu_threshold(image.histogram())
+        image = image.point(lambda v: 255 if v > threshold else 0).convert("1")
+    return image
+
+
+def render_ocr_inputs(file_path: str, pages: list, page_numbers: list,
+                      options: OCROptions, work_dir: str,
+                      timeout: Optional[float] = None) -> list:
+    """Write one image file per page for tesseract and return their paths.
+
+    Embedded scans are written as stored, at their native resolution; other
+    pages are rendered by pdf2image straight to files at options.dpi, one
+    pdftoppm call per run of consecutive pages, each limited to timeout
+    seconds (OCR_PAGE_TIMEOUT per page by default). Files are only loaded
+    into memory when options require preprocessing.
+    """
+    from pdf2image import convert_from_path
+
+    paths = {}
+    raster = []
+    for number in page_numbers:
+        scan = scanned_page_file(pages[number - 1])
+        if scan is None:
+            raster.append(number)
+            continue
+        path = os.path.join(work_dir, f"scan-{number:06d}{scan[1]}")
+        with open(path, "wb") as f:
+            f.write(scan[0])
+        paths[number] = path
+
+    runs = []
+    for number in raster:
+        if runs and runs[-1][1] == number - 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    for first, last in runs:
+        rendered = convert_from_path(
+            file_path, dpi=options.dpi, first_page=first, last_page=last,
+            grayscale=options.color != "color", fmt="png",
+            output_folder=work_dir, output_file=f"page-{first:06d}", paths_only=True,
+            timeout=timeout or OCR_PAGE_TIMEOUT * (last - first + 1)
+        )
+        for number, path in zip(range(first, last + 1), sorted(rendered)):
+            paths[number] = path
+
+    if options.preprocess:
+        from PIL import Image
+        for number, path in paths.items():
+            with Image.open(path) as image:
+                dpi = image.info.get("dpi", (options.dpi, options.dpi))
+                processed = preprocess_image(image, options)
+            paths[number] = os.path.join(work_dir, f"ocr-{number:06d}.png")
+            processed.save(paths[number], dpi=dpi)
+
+    return [paths[number] for number in page_numbers]
+
+
+def run_tesseract(input_path: str, output_base: str, options: OCROptions,
+                  formats: tuple, timeout: float) -> None:
+    """Run tesseract once, writing output_base.<format> for each format."""
+    command = ["tesseract", input_path, output_base, "-l", options.languages]
+    if options.psm is not None:
+        command.extend(["--psm", str(options.psm)])
+    command.extend(formats)
+    result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"tesseract failed: {result.stderr.strip()}")
+
+
+def run_tesseract_batch(image_paths: list, options: OCROptions, work_dir: str,
+                        confidence: bool = False, timeout: Optional[float] = None) -> tuple:
+    """OCR many images with a single tesseract process.
+
+    Returns (texts, mean_confidence): one text per image, and with
+    confidence=True the mean word confidence (0-100) from tesseract's TSV
+    output, otherwise None. The process is killed, raising
+    subprocess.TimeoutExpired, after timeout seconds (by default
+    OCR_PAGE_TIMEOUT per image).
+
+    tesseract ends each page's text with a form feed. If the output does
+    not hold exactly one per image (a form feed inside the text, or a page
+    that wrote nothing), texts cannot be matched to images, and each image
+    is OCRed again on its own.
+    """
+    list_path = os.path.join(work_dir, "pages.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(image_paths) + "\n")
+    output_base = os.path.join(work_dir, "ocr")
+    run_tesseract(list_path, output_base, options, ("txt", "tsv") if confidence else ("txt",),
+                  timeout or OCR_PAGE_TIMEOUT * len(image_paths))
+
+    with open(output_base + ".txt", encoding="utf-8") as f:
+        texts = f.read().split("\f")
+    if len(texts) == len(image_paths) + 1 and not texts[-1].strip():
+        texts = texts[:-1]
+    else:
+        texts = []
+        page_timeout = timeout / len(image_paths) if timeout else OCR_PAGE_TIMEOUT
+        for index, path in enumerate(image_paths):
+            page_base = os.path.join(work_dir, f"ocr-page-{index}")
+            run_tesseract(path, page_base, options, ("txt",), page_timeout)
+            with open(page_base + ".txt", encoding="utf-8") as f:
+                texts.append(f.read().replace("\f", ""))
+
+    mean_confidence = None
+    if confidence:
+        scores = []
+        with open(output_base + ".tsv", encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) == 12 and fields[11].strip():
+                    try:
+                        conf = float(fields[10])
+                    except ValueError:
+                        continue  # header row
+                    if conf >= 0:
+                        scores.append(conf)
+        mean_confidence = sum(scores) / len(scores) if scores else 0.0
+    return texts, mean_confidence
+
+
+@lru_cache(maxsize=None)
+def tesseract_version() -> str:
+    """First line of tesseract --version, e.g. "tesseract 5.3.0"."""
+    try:
+        result = subprocess.run(["tesseract", "--version"], capture_output=True, text=True,
+                                timeout=COMMAND_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0] if output else ""
+
+
+class OCRCache:
+    """OCR text of single page images, kept in SQLite across documents and runs.
+
+    Each entry is keyed by a hash of the image file tesseract reads (so DPI,
+    colour mode, deskew and crop are covered by the pixels themselves) plus
+    the languages, psm and tesseract version. Lookups refresh an entry's
+    last use; once there are more than max_entries, the least recently used
+    are evicted. hits and misses count pages for the current process.
+    """
+
+    def __init__(self, path: str = OCR_CACHE_FILE, max_entries: int = OCR_CACHE_MAX_ENTRIES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS ocr_pages ("
+                              "key TEXT PRIMARY KEY, text TEXT NOT NULL, used_at REAL NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ocr_pages_used_at ON ocr_pages (used_at)")
+
+    @staticmethod
+    def key(image_path: str, options: OCROptions) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return f"{digest.hexdigest()}:{options.languages}:{options.psm}:{tesseract_version()}"
+
+    def get_many(self, keys: list) -> dict:
+        """Cached text for whichever of keys are present, marking them used."""
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            part = keys[start:start + 500]
+            marks = ",".join("?" * len(part))
+            found.update(self.conn.execute(f"SELECT key, text FROM ocr_pages WHERE key IN ({marks})", part))
+        if found:
+            with self.conn:
+                self.conn.executemany("UPDATE ocr_pages SET used_at = ? WHERE key = ?",
+                                      [(time.time(), key) for key in found])
+        return found
+
+    def put_many(self, texts: dict):
+        """Store text by key, then evict down to max_entries."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO ocr_pages (key, text, used_at) VALUES (?, ?, ?)",
+                                  [(key, text, now) for key, text in texts.items()])
+            excess = self.conn.execute("SELECT COUNT(*) FROM ocr_pages").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute("DELETE FROM ocr_pages WHERE key IN "
+                                  "(SELECT key FROM ocr_pages ORDER BY used_at LIMIT ?)", (excess,))
+
+    def close(self):
+        self.conn.close()
+
+
+def run_tesseract_cached(image_paths: list, options: OCROptions, work_dir: str,
+                         cache: OCRCache, timeout: Optional[float] = None) -> list:
+    """run_tesseract_batch texts, OCRing only images the cache does not have.
+
+    Identical images within the batch are OCRed once as well. Texts are
+    stored only once they are known to belong to their images (one per
+    image, as run_tesseract_batch guarantees), and empty texts are not
+    stored, so a bad run is never replayed for later documents.
+    """
+    keys = [OCRCache.key(path, options) for path in image_paths]
+    texts = cache.get_many(keys)
+    missing = {}
+    for key, path in zip(keys, image_paths):
+        if key not in texts:
+            missing.setdefault(key, path)
+    if missing:
+        new_texts, _ = run_tesseract_batch(list(missing.values()), options, work_dir, timeout=timeout)
+        if len(new_texts) != len(missing):
+            raise RuntimeError(f"tesseract returned {len(new_texts)} texts for {len(missing)} images")
+        fresh = dict(zip(missing, new_texts))
+        cache.put_many({key: text for key, text in fresh.items() if text.strip()})
+        texts.update(fresh)
+    cache.hits += len(keys) - len(missing)
+    cache.misses += len(missing)
+    return [texts[key] for key in keys]
+
+
+def ocr_pages(file_path: str, reader, page_numbers: list, options: OCROptions,
+              confidence: bool = False, timeout: Optional[float] = None,
+              cache: Optional[OCRCache] = None) -> tuple:
+    """OCR the given pages in batches of OCR_BATCH_PAGES.
+
+    Returns (texts, mean_confidence) as run_tesseract_batch does; rendered
+    files for each batch are removed before the next one is written.
+    timeout limits rendering and tesseract for each batch separately.
+    Pages found in cache skip tesseract (not with confidence, which needs
+    tesseract's own output).
+    """
+    texts = []
+    weighted_confidence = 0.0
+    for start in range(0, len(page_numbers), OCR_BATCH_PAGES):
+        batch = page_numbers[start:start + OCR_BATCH_PAGES]
+        with tempfile.TemporaryDirectory(prefix="extract_pdf_ocr_") as work_dir:
+            paths = render_ocr_inputs(file_path, reader.pages, batch, options, work_dir, timeout)
+            if cache is not None and not confidence:
+                batch_texts, batch_confidence = run_tesseract_cached(paths, options, work_dir, cache, timeout), None
+            else:
+                batch_texts, batch_confidence = run_tesseract_batch(paths, options, work_dir, confidence, timeout)
+        texts.extend(batch_texts)
+        if confidence:
+            weighted_confidence += batch_confidence * len(batch)
+    mean_confidence = weighted_confidence / len(page_numbers) if confidence and page_numbers else None
+    return texts, mean_confidence
+
+
+def profile_ocr(file_path: str, options: OCROptions, page_numbers: Optional[set] = None) -> list:
+    """Time OCR of sample pages at each DPI and colour mode.
+
+    Deskew, crop, psm and languages are taken from options. Confidence is
+    tesseract's mean word confidence, a proxy for accuracy when there is no
+    ground truth to compare against.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    sample = sorted(page_numbers) if page_numbers else list(range(1, min(OCR_PROFILE_PAGES, len(reader.pages)) + 1))
+    sample = [n for n in sample if 1 <= n <= len(reader.pages)]
+    rows = []
+    for dpi in OCR_PROFILE_DPIS:
+        for color in OCR_COLOR_MODES:
+            setting = replace(options, dpi=dpi, color=color)
+            started = time.perf_counter()
+            texts, confidence = ocr_pages(file_path, reader, sample, setting, confidence=True)
+            elapsed = time.perf_counter() - started
+            rows.append({
+                "dpi": dpi,
+                "color": color,
+                "pages": len(sample),
+                "seconds_per_page": elapsed / len(sample) if sample else 0.0,
+                "words": sum(len(text.split()) for text in texts),
+                "mean_confidence": round(confidence or 0.0, 1),
+                "current": dpi == options.dpi and color == options.color
+            })
+    return rows
+
+
+def format_ocr_profile(rows: list) -> str:
+    """Format profile_ocr rows as a table."""
+    lines = [
+        f"{'DPI':>5}  {'Mode':<7} {'s/page':>7} {'Words':>7} {'Conf':>6}",
+        "-" * 37
+    ]
+    for row in rows:
+        marker = "  <- current" if row["current"] else ""
+        lines.append(f"{row['dpi']:>5}  {row['color']:<7} {row['seconds_per_page']:>7.2f} "
+                     f"{row['words']:>7} {row['mean_confidence']:>6.1f}{marker}")
+    return "\n".join(lines)
+
+
+def unique_path(output_dir: str, filename: str, used: set) -> str:
+    """Join filename to output_dir, adding a counter if it was already used."""
+    stem, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while candidate in used:
+        counter += 1
+        candidate = f"{stem}_{counter}{ext}"
+    used.add(candidate)
+    return os.path.join(output_dir, candidate)
+
+
+def extract_images(file_path: str, output_dir: str, page_numbers: Optional[set] = None,
+                   stream=None) -> tuple:
+    """Write a PDF's embedded images and file attachments to output_dir.
+
+    Each image object is written once, however many pages reference it,
+    and straight to disk as it is found rather than collected in memory.
+    The PDF is read from stream when one is given. Returns (images,
+    attachments) as ExtractedImage lists.
+    """
+    reader, pdf_pages = open_pdf(file_path, stream)
+    os.makedirs(output_dir, exist_ok=True)
+    images = []
+    attachments = []
+    used = set()
+    seen = set()
+
+    numbers = range(1, len(pdf_pages) + 1)
+    for page_number in sorted(page_numbers) if page_numbers else numbers:
+        if page_number not in numbers:
+            continue
+        page = pdf_pages[page_number - 1]
+        for name, xobject in iter_page_images(page, seen):
+            try:
+                image_file = image_file_bytes(xobject)
+                if image_file is None:
+                    print(f"Warning: Skipped image {name} on page {page_number}: "
+                          "its format needs Pillow (pip install Pillow)", file=sys.stderr)
+                    continue
+                data, extension, content_type = image_file
+                save_path = unique_path(output_dir, f"image_{len(images) + 1}{extension}", used)
+                with open(save_path, "wb") as f:
+                    f.write(data)
+                images.append(ExtractedImage(
+                    filename=os.path.basename(save_path),
+                    original_name=name,
+                    content_type=content_type,
+                    size_bytes=len(data),
+                    saved_path=save_path,
+                    page_number=page_number
+                ))
+            except Exception as e:
+                print(f"Warning: Could not extract image {name} on page {page_number}: {e}",
+                      file=sys.stderr)
+
+    if not page_numbers:
+        for name, contents in reader.attachments.items():
+            for data in contents:
+                filename = UNSAFE_FILENAME_CHARS.sub("_", os.path.basename(name)) or "attachment"
+                save_path = unique_path(output_dir, filename, used)
+                with open(save_path, "wb") as f:
+                    f.write(data)
+                attachments.append(ExtractedImage(
+                    filename=os.path.basename(save_path),
+                    original_name=name,
+                    content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    size_bytes=len(data),
+                    saved_path=save_path
+                ))
+
+    return images, attachments
+
+
+def pypdf_page(page_number: int, page, tables: bool = False, layout: bool = False) -> PageContent:
+    """Extract one pypdf page.
+
+    With tables or layout, positioned text runs are collected in the same
+    pass: tables=True attaches the tables detected on the page, and
+    layout=True rebuilds the text of a multi-column page in reading order.
+    """
+    collector = TextRunCollector() if tables or layout else None
+    text = page.extract_text(visitor_text=collector) or ""
+    page_tables = detect_tables(page_number, collector.runs) if tables else None
+    if layout:
+        text = layout_text(collector.runs) or text
+    text = text.strip()
+    return PageContent(
+        page_number=page_number,
+        text=text,
+        char_count=len(text),
+        tables=page_tables
+    )
+
+
+def pdftotext_page_count(file_path: str) -> int:
+    """Page count as reported by pdfinfo."""
+    result = subprocess.run(
+        ["pdfinfo", file_path],
+        capture_output=True,
+        text=True,
+        timeout=COMMAND_TIMEOUT
+    )
+    for line in result.stdout.split("\n"):
+        if line.startswith("Pages:"):
+            return int(line.split(":")[1].strip())
+    return 0
+
+
+def pdftotext_page(file_path: str, page_number: int, timeout: Optional[float] = None) -> PageContent:
+    """Extract one page with the pdftotext command (killed after timeout seconds)."""
+    result = subprocess.run(
+        ["pdftotext", "-f", str(page_number), "-l", str(page_number), file_path, "-"],
+        capture_output=True,
+        text=True,
+        timeout=timeout or COMMAND_TIMEOUT
+    )
+    text = result.stdout.strip()
+    return PageContent(
+        page_number=page_number,
+        text=text,
+        char_count=len(text)
+    )
+
+
+def iter_ocr_pages(file_path: str, reader, page_numbers: list, options: OCROptions,
+                   budget: Optional[PageBudget] = None,
+                   cache: Optional[OCRCache] = None) -> Iterator[PageContent]:
+    """OCR the given pages, yielding each batch's pages as it finishes.
+
+    With a budget, a batch gets page_seconds for each of its pages, and a
+    batch that runs out of time is skipped as a whole. With a cache, pages
+    already OCRed (in any document) are read from it.
+    """
+    from pdf2image.exceptions import PDFPopplerTimeoutError
+
+    budget = budget or PageBudget()
+    for start in range(0, len(page_numbers), OCR_BATCH_PAGES):
+        batch = page_numbers[start:start + OCR_BATCH_PAGES]
+        if not budget.check(page_numbers[start:]):
+            return
+        seconds = budget.seconds(len(batch))
+        started = time.monotonic()
+        try:
+            with time_limit(seconds):
+                texts, _ = ocr_pages(file_path, reader, batch, options, timeout=seconds, cache=cache)
+        except (ExtractionTimeout, subprocess.TimeoutExpired, PDFPopplerTimeoutError):
+            budget.skip(batch, "timeout", time.monotonic() - started)
+            continue
+        for number, text in zip(batch, texts):
+            text = text.strip()
+            yield PageContent(
+                page_number=number,
+                text=text,
+                char_count=len(text)
+            )
+
+
+class RemoteFile(io.RawIOBase):
+    """A read-only, seekable view of a file on an HTTP(S) server.
+
+    Every read is served from REMOTE_BLOCK_SIZE blocks; blocks that are not
+    cached are fetched with Range requests (a run of consecutive ones in a
+    single request) and at most max_blocks are kept. pypdf seeks straight
+    to the trailer, the cross-reference data and the objects it resolves,
+    so metadata or a few pages of a huge PDF cost a small fraction of its
+    bytes. bytes_fetched and requests count the transfer. Servers that
+    ignore Range are refused rather than downloaded in full.
+    """
+
+    def __init__(self, url: str, block_size: int = REMOTE_BLOCK_SIZE,
+                 max_blocks: int = REMOTE_CACHE_BLOCKS, timeout: float = REMOTE_TIMEOUT):
+        super().__init__()
+        self.url = url
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.timeout = timeout
+        self.blocks = OrderedDict()
+        self.position = 0
+        self.bytes_fetched = 0
+        self.requests = 0
+        self.size = None
+        self.blocks[0] = self._get(0, block_size - 1)
+
+    def _get(self, start: int, end: int) -> bytes:
+        """Bytes start..end (inclusive) of the file, in one range request."""
+        request = urllib.request.Request(self.url, headers={
+            "Range": f"bytes={start}-{end}",
+            "Accept-Encoding": "identity",
+            "User-Agent": "extract_pdf.py"
+        })
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status != 206:
+                raise OSError(f"{self.url} does not support HTTP range requests "
+                              f"(status {response.status}); download it and use --file")
+            if self.size is None:
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if not total.isdigit():
+                    raise OSError(f"{self.url}: server did not report the file size")
+                self.size = int(total)
+            data = response.read()
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        return data
+
+    def _read_blocks(self, first: int, last: int) -> list:
+        runs = []
+        for index in range(first, last + 1):
+            if index in self.blocks:
+                continue
+            if runs and runs[-1][1] == index - 1:
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+        size = self.block_size
+        for run_first, run_last in runs:
+            data = self._get(run_first * size, min((run_last + 1) * size, self.size) - 1)
+            for index in range(run_first, run_last + 1):
+                offset = (index - run_first) * size
+                self.blocks[index] = data[offset:offset + size]
+
+        parts = []
+        for index in range(first, last + 1):
+            self.blocks.move_to_end(index)
+            parts.append(self.blocks[index])
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        return parts
+
+    def readinto(self, buffer) -> int:
+        end = min(self.position + len(buffer), self.size)
+        if self.position >= end:
+            return 0
+        first, last = self.position // self.block_size, (end - 1) // self.block_size
+        skip = self.position - first * self.block_size
+        data = b"".join(self._read_blocks(first, last))[skip:skip + end - self.position]
+        buffer[:len(data)] = data
+        self.position = end
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+
+def open_url(url: str) -> io.BufferedReader:
+    """Open a remote PDF for pypdf; the RemoteFile is the result's .raw."""
+    return io.BufferedReader(RemoteFile(url), buffer_size=REMOTE_BLOCK_SIZE)
+
+
+class PageTree:
+    """Pages of a PdfReader, looked up one at a time.
+
+    reader.pages flattens the whole page tree on first use, reading every
+    page dictionary; in most files these sit between the content streams,
+    so over HTTP that costs nearly the whole file. This sequence takes its
+    length from the root /Count and finds page i by descending through
+    /Kids, using each node's /Count to skip whole subtrees, with inherited
+    attributes (/Resources, /MediaBox, /CropBox, /Rotate) applied as pypdf
+    does.
+    """
+
+    INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.root = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+
+    def __len__(self) -> int:
+        return int(self.root.get("/Count", 0))
+
+    def __getitem__(self, index: int):
+        from pypdf import PageObject
+        from pypdf.generic import NameObject
+
+        if not 0 <= index < len(self):
+            raise IndexError(f"page index {index} out of range")
+        node, reference, inherited = self.root, None, {}
+        for _ in range(64):  # deeper trees are malformed or cyclic
+            kids = node.get("/Kids")
+            if kids is None:
+                page = PageObject(self.reader, reference)
+                page.update(node)
+                for key, value in inherited.items():
+                    if key not in page:
+                        page[key] = value
+                return page
+            inherited.update({NameObject(key): node[key] for key in self.INHERITABLE if key in node})
+            kids = kids.get_object()
+            if len(kids) == int(node.get("/Count", 0)) and len(kids) > index:
+                # As many kids as pages: kid i holds page i (or, rarely, is a
+                # /Pages node holding only that page)
+                reference, index = kids[index], 0
+            else:
+                for kid in kids:
+                    kid_node = kid.get_object()
+                    count = int(kid_node.get("/Count", 0)) if "/Kids" in kid_node else 1
+                    if index < count:
+                        reference = kid
+                        break
+                    index -= count
+                else:
+                    raise IndexError("page tree /Count does not match its /Kids")
+            node = reference.get_object()
+        raise ValueError("page tree is too deep")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def open_pdf(file_path: str, stream=None) -> tuple:
+    """Open a PDF with pypdf, from stream when given; returns (reader, pages).
+
+    For a stream from open_url() the reader is opened strictly, because
+    pypdf's lenient mode checks every cross-reference entry by seeking to
+    it, and pages is a PageTree; parsing afterwards is lenient as usual.
+    Files whose cross-reference table needs repair fall back to the
+    lenient open, which reads them through.
+    """
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    if not isinstance(getattr(stream, "raw", None), RemoteFile):
+        reader = PdfReader(stream if stream is not None else file_path)
+        return reader, reader.pages
+    try:
+        reader = PdfReader(stream, strict=True)
+    except PdfReadError:
+        stream.seek(0)
+        reader = PdfReader(stream)
+    reader.strict = False
+    return reader, PageTree(reader)
+
+
+def pdf_size(file_path: str, stream=None) -> int:
+    """Size in bytes of the PDF: of stream when given, else of the file."""
+    if stream is None:
+        return os.stat(file_path).st_size
+    position = stream.tell()
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+def pdf_stream(source):
+    """A path or binary file object pypdf can read; bytes are wrapped."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+@contextmanager
+def pdf_file(source):
+    """A filesystem path for source, via a temporary copy if it is not a path.
+
+    pdftotext and pdf2image run external commands, which need a real file.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    data = bytes(source) if isinstance(source, (bytes, bytearray, memoryview)) else source.read()
+    with tempfile.NamedTemporaryFile(prefix="extract_pdf_", suffix=".pdf", delete=False) as f:
+        f.write(data)
+    try:
+        yield f.name
+    finally:
+        os.unlink(f.name)
+
+
+def iter_pdf_pages(source, pages: Optional[set] = None, method: str = "pypdf",
+                   tables: bool = False, layout: bool = False,
+                   ocr_options: Optional[OCROptions] = None,
+                   limits: Optional[ExtractionLimits] = None,
+                   skipped: Optional[list] = None,
+                   ocr_cache: Optional[OCRCache] = None) -> Iterator[PageContent]:
+    """Yield a PageContent for each page of a PDF, lazily and in page order.
+
+    source is a path, a binary file object (open_url() for a remote PDF)
+    or the PDF's bytes. pages limits extraction to those page numbers
+    (1-based); other pages are not read at all. method is one of
+    PDF_METHODS: pypdf extracts one page per step, pdftotext runs once per
+    page and OCR once per OCR_BATCH_PAGES pages, the last two on a
+    temporary copy when source is not a path. tables and
+    layout apply to pypdf only. Pages that do not fit limits are left out
+    and, when a skipped list is given, recorded in it as SkippedPage.
+    ocr_cache, an OCRCache, lets OCR reuse text for pages seen before.
+
+    Nothing is printed. Problems raise: ImportError for a missing Python
+    package, RuntimeError for a missing command-line tool, and the
+    underlying library's errors for unreadable files.
+    """
+    if method not in PDF_METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {', '.join(PDF_METHODS)}")
+
+    budget = PageBudget(limits, skipped)
+    if method == "pypdf":
+        reader, pdf_pages = open_pdf(source, pdf_stream(source))
+        numbers = [n for n in range(1, len(pdf_pages) + 1) if not pages or n in pages]
+        yield from budget.run(numbers, lambda n, _: pypdf_page(n, pdf_pages[n - 1], tables, layout))
+        return
+
+    if method == "pdftotext" and not check_pdftotext():
+        raise RuntimeError("pdftotext not installed. Run: brew install poppler")
+    if method == "ocr":
+        if not check_tesseract():
+            raise RuntimeError("tesseract not installed. Run: brew install tesseract")
+        import pdf2image  # noqa: F401  (fail before any work is done)
+
+    with pdf_file(source) as file_path:
+        if method == "pdftotext":
+            numbers = [n for n in range(1, pdftotext_page_count(file_path) + 1) if not pages or n in pages]
+            yield from budget.run(numbers, lambda n, seconds: pdftotext_page(file_path, n, seconds))
+        else:
+            from pypdf import PdfReader
+            reader = PdfReader(file_path)
+            numbers = [n for n in range(1, len(reader.pages) + 1) if not pages or n in pages]
+            yield from iter_ocr_pages(file_path, reader, numbers, ocr_options or OCROptions(), budget,
+                                      ocr_cache)
+
+
+def extract_with_pypdf(file_path: str, tables: bool = False, layout: bool = False,
+                       limits: Optional[ExtractionLimits] = None,
+                       page_numbers: Optional[set] = None, stream=None) -> ExtractionResult:
+    """Extract PDF content using pypdf library.
+
+    tables and layout are as for pypdf_page. Pages that run over limits
+    are left out and listed in skipped_pages. Only the pages in
+    page_numbers are read when it is given. stream, a binary file object
+    such as open_url() returns, is read instead of file_path, which then
+    only labels the result.
+    """
     try:
         from pypdf import PdfReader
     except ImportError:
@@ -113,15 +1827,15 @@ def extract_with_pypdf(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="pypdf",
             error="pypdf not installed. Run: pip install pypdf"
         )
 
     try:
-        reader = PdfReader(file_path)
-        file_stat = os.stat(file_path)
+        reader, pdf_pages = open_pdf(file_path, stream)
+        file_size = pdf_size(file_path, stream)
 
         # Extract metadata
         info = reader.metadata or {}
@@ -133,23 +1847,16 @@ def extract_with_pypdf(file_path: str) -> ExtractionResult:
             producer=info.get("/Producer") or info.get("Producer"),
             creation_date=format_pdf_date(str(info.get("/CreationDate", ""))),
             modification_date=format_pdf_date(str(info.get("/ModDate", ""))),
-            page_count=len(reader.pages),
-            file_size_bytes=file_stat.st_size,
-            file_size_human=format_file_size(file_stat.st_size)
+            page_count=len(pdf_pages),
+            file_size_bytes=file_size,
+            file_size_human=format_file_size(file_size)
         )
 
-        # Extract text page by page
-        pages = []
-        total_chars = 0
-        for i, page in enumerate(reader.pages, 1):
-            text = page.extract_text() or ""
-            char_count = len(text)
-            total_chars += char_count
-            pages.append(PageContent(
-                page_number=i,
-                text=text.strip(),
-                char_count=char_count
-            ))
+        # Extract text page by page, within the time and memory limits
+        budget = PageBudget(limits)
+        numbers = [n for n in range(1, len(pdf_pages) + 1) if not page_numbers or n in page_numbers]
+        pages = PageStore(budget.run(numbers, lambda n, _: pypdf_page(n, pdf_pages[n - 1], tables, layout)))
+        total_chars = pages.total_chars
 
         return ExtractionResult(
             success=True,
@@ -157,7 +1864,8 @@ def extract_with_pypdf(file_path: str) -> ExtractionResult:
             metadata=metadata,
             pages=pages,
             total_chars=total_chars,
-            extraction_method="pypdf"
+            extraction_method="pypdf",
+            skipped_pages=budget.skipped
         )
 
     except Exception as e:
@@ -165,21 +1873,25 @@ def extract_with_pypdf(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="pypdf",
             error=str(e)
         )
 
 
-def extract_with_pdftotext(file_path: str) -> ExtractionResult:
-    """Extract PDF content using pdftotext command."""
+def extract_with_pdftotext(file_path: str, limits: Optional[ExtractionLimits] = None) -> ExtractionResult:
+    """Extract PDF content using pdftotext command.
+
+    Each pdftotext run is killed after page_seconds (COMMAND_TIMEOUT by
+    default); pages that run over limits are listed in skipped_pages.
+    """
     if not check_pdftotext():
         return ExtractionResult(
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="pdftotext",
             error="pdftotext not installed. Run: brew install poppler"
@@ -187,16 +1899,7 @@ def extract_with_pdftotext(file_path: str) -> ExtractionResult:
 
     try:
         # Get page count first
-        result = subprocess.run(
-            ["pdfinfo", file_path],
-            capture_output=True,
-            text=True
-        )
-        page_count = 0
-        for line in result.stdout.split("\n"):
-            if line.startswith("Pages:"):
-                page_count = int(line.split(":")[1].strip())
-                break
+        page_count = pdftotext_page_count(file_path)
 
         file_stat = os.stat(file_path)
         metadata = PDFMetadata(
@@ -206,22 +1909,10 @@ def extract_with_pdftotext(file_path: str) -> ExtractionResult:
         )
 
         # Extract text page by page
-        pages = []
-        total_chars = 0
-        for page_num in range(1, page_count + 1):
-            result = subprocess.run(
-                ["pdftotext", "-f", str(page_num), "-l", str(page_num), file_path, "-"],
-                capture_output=True,
-                text=True
-            )
-            text = result.stdout.strip()
-            char_count = len(text)
-            total_chars += char_count
-            pages.append(PageContent(
-                page_number=page_num,
-                text=text,
-                char_count=char_count
-            ))
+        budget = PageBudget(limits)
+        pages = PageStore(budget.run(list(range(1, page_count + 1)),
+                                     lambda n, seconds: pdftotext_page(file_path, n, seconds)))
+        total_chars = pages.total_chars
 
         return ExtractionResult(
             success=True,
@@ -229,7 +1920,8 @@ def extract_with_pdftotext(file_path: str) -> ExtractionResult:
             metadata=metadata,
             pages=pages,
             total_chars=total_chars,
-            extraction_method="pdftotext"
+            extraction_method="pdftotext",
+            skipped_pages=budget.skipped
         )
 
     except Exception as e:
@@ -237,64 +1929,69 @@ def extract_with_pdftotext(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="pdftotext",
             error=str(e)
         )
 
 
-def extract_with_ocr(file_path: str) -> ExtractionResult:
-    """Extract PDF content using OCR (for scanned documents)."""
+def extract_with_ocr(file_path: str, options: Optional[OCROptions] = None,
+                     page_numbers: Optional[set] = None,
+                     limits: Optional[ExtractionLimits] = None,
+                     cache: Optional[OCRCache] = None) -> ExtractionResult:
+    """Extract PDF content using OCR (for scanned documents).
+
+    Only the pages in page_numbers are OCRed when it is given. Batches
+    that run over limits are listed page by page in skipped_pages. Pages
+    found in cache are not OCRed again; ocr_cache_hits counts them.
+    """
+    options = options or OCROptions()
     if not check_tesseract():
         return ExtractionResult(
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="ocr",
             error="tesseract not installed. Run: brew install tesseract"
         )
 
     try:
-        from pdf2image import convert_from_path
-        import pytesseract
+        import pdf2image  # noqa: F401
+        if options.preprocess:
+            import PIL  # noqa: F401
     except ImportError as e:
-        missing = str(e).split("'")[1] if "'" in str(e) else "pdf2image/pytesseract"
+        missing = str(e).split("'")[1] if "'" in str(e) else "pdf2image/Pillow"
         return ExtractionResult(
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="ocr",
-            error=f"{missing} not installed. Run: pip install pdf2image pytesseract Pillow"
+            error=f"{missing} not installed. Run: pip install pdf2image Pillow"
         )
 
     try:
-        # Convert PDF to images
-        images = convert_from_path(file_path)
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
         file_stat = os.stat(file_path)
 
         metadata = PDFMetadata(
-            page_count=len(images),
+            page_count=len(reader.pages),
             file_size_bytes=file_stat.st_size,
             file_size_human=format_file_size(file_stat.st_size)
         )
 
-        # OCR each page
-        pages = []
-        total_chars = 0
-        for i, image in enumerate(images, 1):
-            text = pytesseract.image_to_string(image)
-            char_count = len(text)
-            total_chars += char_count
-            pages.append(PageContent(
-                page_number=i,
-                text=text.strip(),
-                char_count=char_count
-            ))
+        numbers = [n for n in range(1, len(reader.pages) + 1)
+                   if not page_numbers or n in page_numbers]
+        budget = PageBudget(limits)
+        hits_before = cache.hits if cache else 0
+        pages = PageStore(iter_ocr_pages(file_path, reader, numbers, options, budget, cache))
+        total_chars = pages.total_chars
 
         return ExtractionResult(
             success=True,
@@ -302,7 +1999,9 @@ def extract_with_ocr(file_path: str) -> ExtractionResult:
             metadata=metadata,
             pages=pages,
             total_chars=total_chars,
-            extraction_method="ocr"
+            extraction_method="ocr",
+            skipped_pages=budget.skipped,
+            ocr_cache_hits=cache.hits - hits_before if cache else None
         )
 
     except Exception as e:
@@ -310,19 +2009,18 @@ def extract_with_ocr(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="ocr",
             error=str(e)
         )
 
 
-def extract_metadata_only(file_path: str) -> ExtractionResult:
-    """Extract only metadata without page content."""
+def extract_metadata_only(file_path: str, stream=None) -> ExtractionResult:
+    """Extract only metadata without page content (from stream when given)."""
     try:
-        from pypdf import PdfReader
-        reader = PdfReader(file_path)
-        file_stat = os.stat(file_path)
+        reader, pdf_pages = open_pdf(file_path, stream)
+        file_size = pdf_size(file_path, stream)
 
         info = reader.metadata or {}
         metadata = PDFMetadata(
@@ -333,16 +2031,16 @@ def extract_metadata_only(file_path: str) -> ExtractionResult:
             producer=info.get("/Producer") or info.get("Producer"),
             creation_date=format_pdf_date(str(info.get("/CreationDate", ""))),
             modification_date=format_pdf_date(str(info.get("/ModDate", ""))),
-            page_count=len(reader.pages),
-            file_size_bytes=file_stat.st_size,
-            file_size_human=format_file_size(file_stat.st_size)
+            page_count=len(pdf_pages),
+            file_size_bytes=file_size,
+            file_size_human=format_file_size(file_size)
         )
 
         return ExtractionResult(
             success=True,
             file_path=file_path,
             metadata=metadata,
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="metadata-only"
         )
@@ -352,7 +2050,7 @@ def extract_metadata_only(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="metadata-only",
             error="pypdf not installed. Run: pip install pypdf"
@@ -362,35 +2060,122 @@ def extract_metadata_only(file_path: str) -> ExtractionResult:
             success=False,
             file_path=file_path,
             metadata=PDFMetadata(),
-            pages=[],
+            pages=PageStore(),
             total_chars=0,
             extraction_method="metadata-only",
             error=str(e)
         )
 
 
+def boilerplate_key(line: str) -> str:
+    """Comparison form of a line: whitespace collapsed, digits masked, casefolded."""
+    return BOILERPLATE_DIGITS.sub("#", " ".join(line.split())).casefold()
+
+
+def strip_boilerplate(pages: PageStore) -> int:
+    """Remove running headers, footers and page numbers from page text.
+
+    The first and last BOILERPLATE_EDGE_LINES non-empty lines of every page
+    are counted by (edge, boilerplate_key), once per page, in one linear
+    pass; on pages too short for both, the lines are split between the
+    edges so that none counts at both. Lines recurring at the same edge on at least BOILERPLATE_MIN_SHARE
+    of the pages are then peeled off each page from the edge inwards,
+    stopping at the first line that is not boilerplate, so body text that
+    happens to repeat is kept. The removed lines become the page's header
+    and footer (its full_text is unchanged) and char_count is reduced to
+    match. Returns the number of characters removed.
+    """
+    if len(pages) < BOILERPLATE_MIN_PAGES:
+        return 0
+
+    page_lines = []
+    counts = Counter()
+    for index in range(len(pages)):
+        lines = pages.text(index).split("\n")
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        top = filled[:min(BOILERPLATE_EDGE_LINES, (len(filled) + 1) // 2)]
+        bottom = filled[len(top):][-BOILERPLATE_EDGE_LINES:][::-1]
+        page_lines.append((lines, top, bottom))
+        counts.update({("top", boilerplate_key(lines[i])) for i in top}
+                      | {("bottom", boilerplate_key(lines[i])) for i in bottom})
+
+    threshold = max(BOILERPLATE_MIN_PAGES, math.ceil(BOILERPLATE_MIN_SHARE * len(pages)))
+    removed = 0
+    for index, (lines, top, bottom) in enumerate(page_lines):
+        start = 0
+        for i in top:
+            if counts[("top", boilerplate_key(lines[i]))] < threshold:
+                break
+            start = i + 1
+        end = len(lines)
+        for i in bottom:
+            if i < start or counts[("bottom", boilerplate_key(lines[i]))] < threshold:
+                break
+            end = i
+        if start == 0 and end == len(lines):
+            continue
+
+        # Blank lines next to the removed ones go with them
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        original_length = pages.char_count(index)
+        pages.trim(index,
+                   "\n".join(lines[:start]) if start else None,
+                   "\n".join(lines[end:]) if end < len(lines) else None)
+        removed += original_length - pages.char_count(index)
+
+    return removed
+
+
+def page_dict(page: PageContent) -> dict:
+    """JSON form of a page; "tables", "header" and "footer" only when set."""
+    data = asdict(page)
+    for key in ("tables", "header", "footer"):
+        if data[key] is None:
+            del data[key]
+    return data
+
+
+def format_tables(tables: list) -> list:
+    """Render a page's tables as markdown, for human-readable output."""
+    lines = []
+    for index, table in enumerate(tables, 1):
+        lines.extend([f"[Table {index}: {len(table.rows)} rows x {table.column_count} columns]",
+                      table.to_markdown(), ""])
+    return lines
+
+
 def split_pages(result: ExtractionResult, chunk_size: int) -> list:
     """Split extraction result into chunks of pages."""
+    pages = result.pages
     chunks = []
-    for i in range(0, len(result.pages), chunk_size):
-        chunk_pages = result.pages[i:i + chunk_size]
-        start_page = chunk_pages[0].page_number
-        end_page = chunk_pages[-1].page_number
-        chunk_chars = sum(p.char_count for p in chunk_pages)
+    for i in range(0, len(pages), chunk_size):
+        indexes = range(i, min(i + chunk_size, len(pages)))
+        start_page = pages.page_number(indexes[0])
+        end_page = pages.page_number(indexes[-1])
 
         chunks.append({
             "chunk_number": len(chunks) + 1,
             "page_range": f"{start_page}-{end_page}",
             "start_page": start_page,
             "end_page": end_page,
-            "page_count": len(chunk_pages),
-            "char_count": chunk_chars,
-            "pages": [asdict(p) for p in chunk_pages]
+            "page_count": len(indexes),
+            "char_count": sum(pages.char_count(j) for j in indexes),
+            "pages": [page_dict(pages[j]) for j in indexes]
         })
 
     return chunks
 
 
+def skipped_summary(skipped_pages: list) -> str:
+    """One-line count of skipped pages by reason, e.g. "3 pages: timeout 2, memory 1"."""
+    reasons = Counter(skipped.reason for skipped in skipped_pages)
+    noun = "page" if len(skipped_pages) == 1 else "pages"
+    return f"{len(skipped_pages)} {noun}: " + ", ".join(f"{reason} {count}" for reason, count in reasons.items())
+
+
 def format_human_output(result: ExtractionResult, split_size: Optional[int] = None) -> str:
     """Format extraction result for human reading."""
     lines = [
@@ -428,6 +2213,35 @@ def format_human_output(result: ExtractionResult, split_size: Optional[int] = No
         f"Size: {meta.file_size_human}",
         f"Total Characters: {result.total_chars:,}"
     ])
+    if result.stripped_chars is not None:
+        lines.append(f"Boilerplate Removed: {result.stripped_chars:,} chars")
+    if result.ocr_cache_hits is not None:
+        lines.append(f"OCR Cache Hits: {result.ocr_cache_hits} of {len(result.pages)} pages")
+
+    # Pages left out by time or memory limits
+    if result.skipped_pages:
+        lines.extend([
+            "",
+            f"SKIPPED PAGES ({skipped_summary(result.skipped_pages)})",
+            "-" * 40
+        ])
+        for skipped in result.skipped_pages:
+            spent = f" after {skipped.seconds:.1f}s" if skipped.seconds is not None else ""
+            lines.append(f"  Page {skipped.page_number}: {skipped.reason}{spent}")
+
+    # Images and attachments section
+    if result.images or result.attachments:
+        lines.extend([
+            "",
+            "EXTRACTED IMAGES",
+            "-" * 40
+        ])
+        for img in result.images:
+            lines.append(f"  {img.filename} (page {img.page_number}, "
+                         f"{format_file_size(img.size_bytes)}) -> {img.saved_path}")
+        for attachment in result.attachments:
+            lines.append(f"  {attachment.filename} (attachment, "
+                         f"{format_file_size(attachment.size_bytes)}) -> {attachment.saved_path}")
 
     # Content section
     if result.pages:
@@ -451,6 +2265,8 @@ def format_human_output(result: ExtractionResult, split_size: Optional[int] = No
                         page["text"],
                         ""
                     ])
+                    if page.get("tables"):
+                        lines.extend(format_tables([PageTable(**t) for t in page["tables"]]))
         else:
             for page in result.pages:
                 lines.extend([
@@ -458,13 +2274,15 @@ def format_human_output(result: ExtractionResult, split_size: Optional[int] = No
                     page.text,
                     ""
                 ])
+                if page.tables:
+                    lines.extend(format_tables(page.tables))
 
     lines.append("=" * 60)
     return "\n".join(lines)
 
 
-def format_json_output(result: ExtractionResult, split_size: Optional[int] = None) -> str:
-    """Format extraction result as JSON."""
+def json_output_data(result: ExtractionResult, split_size: Optional[int] = None) -> dict:
+    """Build the JSON-serialisable form of an extraction result."""
     output = {
         "success": result.success,
         "file_path": result.file_path,
@@ -472,6 +2290,12 @@ def format_json_output(result: ExtractionResult, split_size: Optional[int] = Non
         "metadata": asdict(result.metadata),
         "total_chars": result.total_chars
     }
+    if result.stripped_chars is not None:
+        output["stripped_chars"] = result.stripped_chars
+    if result.skipped_pages:
+        output["skipped_pages"] = [asdict(skipped) for skipped in result.skipped_pages]
+    if result.ocr_cache_hits is not None:
+        output["ocr_cache_hits"] = result.ocr_cache_hits
 
     if result.error:
         output["error"] = result.error
@@ -479,9 +2303,19 @@ def format_json_output(result: ExtractionResult, split_size: Optional[int] = Non
         if split_size:
             output["chunks"] = split_pages(result, split_size)
         else:
-            output["pages"] = [asdict(p) for p in result.pages]
+            output["pages"] = [page_dict(p) for p in result.pages]
+    if result.images:
+        output["images"] = [asdict(img) for img in result.images]
+    if result.attachments:
+        output["attachments"] = [asdict(a) for a in result.attachments]
+
+    return output
 
-    return json.dumps(output, indent=2, ensure_ascii=False)
+
+def format_json_output(result: ExtractionResult, split_size: Optional[int] = None,
+                       compact: bool = False) -> str:
+    """Format extraction result as JSON."""
+    return json_output.dumps(json_output_data(result, split_size), compact=compact)
 
 
 def main():
@@ -495,67 +2329,194 @@ Examples:
   python extract_pdf.py --file large.pdf --split 50
   python extract_pdf.py --file document.pdf --metadata-only
   python extract_pdf.py --file document.pdf --json
+  python extract_pdf.py --file report.pdf --tables --json
+  python extract_pdf.py --file paper.pdf --layout
+  python extract_pdf.py --file document.pdf --extract-images --output-dir ./images/
+  python extract_pdf.py --file report.pdf --strip-boilerplate --json
+  python extract_pdf.py --file huge.pdf --timeout 300 --page-timeout 20 --max-memory 2048
+  python extract_pdf.py --url https://example.com/archive.pdf --pages 1-3
 
 Extraction Methods:
   Default: Uses pypdf (pure Python, always available)
+  --layout: pypdf, reading multi-column pages column by column
   --use-pdftotext: Uses pdftotext (better quality, requires poppler)
-  --ocr: Uses tesseract OCR (for scanned documents)
+  --ocr: Uses tesseract OCR (for scanned documents); pages that are a single
+         embedded scan are read directly instead of being rasterised
+
+OCR Tuning (with --ocr):
+  --dpi 300 --ocr-color binary --deskew --crop --psm 6 --lang eng+deu
+  --profile: time each DPI and colour mode on sample pages and exit
+  Pages OCRed before (in any document) are read from the OCR cache,
+  ~/.cache/document-processor/ocr-cache.db unless --ocr-cache is given
+
+Limits:
+  Pages that run past --page-timeout, or are not reached within --timeout
+  or while memory is above --max-memory, are skipped and listed under
+  SKIPPED PAGES (skipped_pages in JSON). With --ocr they apply to whole
+  batches of pages.
+
+Remote PDFs (--url):
+  Read with HTTP range requests, so only the cross-reference data and the
+  objects behind the requested pages are downloaded. The server must honour
+  Range headers. pypdf only: --ocr, --use-pdftotext and --profile need --file.
         """
     )
 
-    parser.add_argument("--file", "-f", required=True, help="PDF file to extract")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", "-f", help="PDF file to extract")
+    source.add_argument("--url", "-u", help="HTTP(S) URL of a PDF to read with range requests")
     parser.add_argument("--ocr", action="store_true", help="Use OCR for scanned documents")
     parser.add_argument("--use-pdftotext", action="store_true", help="Use pdftotext instead of pypdf")
     parser.add_argument("--split", "-s", type=int, metavar="N", help="Split output into chunks of N pages")
     parser.add_argument("--metadata-only", "-m", action="store_true", help="Extract only metadata")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
+    parser.add_argument("--tables", "-t", action="store_true",
+                        help="Detect tables and emit them as markdown (or rows with --json); pypdf only")
+    parser.add_argument("--layout", "-l", action="store_true",
+                        help="Read multi-column pages column by column (pypdf only)")
+    parser.add_argument("--strip-boilerplate", "-b", action="store_true",
+                        help="Remove running headers, footers and page numbers (kept per page in --json)")
+    parser.add_argument("--extract-images", "-i", action="store_true",
+                        help="Extract embedded images and file attachments")
+    parser.add_argument("--output-dir", "-o", default="./extracted_images",
+                        help="Directory for extracted images and attachments")
+    parser.add_argument("--dpi", type=int, default=OCR_DEFAULT_DPI,
+                        help=f"OCR rendering resolution (default: {OCR_DEFAULT_DPI}); embedded scans keep their own")
+    parser.add_argument("--ocr-color", choices=OCR_COLOR_MODES, default="gray",
+                        help="Render pages for OCR in colour, grayscale (default) or binarised")
+    parser.add_argument("--psm", type=int, metavar="N", help="Tesseract page segmentation mode (e.g. 6 for one text block)")
+    parser.add_argument("--lang", default="eng", help="Tesseract languages (default: eng; e.g. eng+deu)")
+    parser.add_argument("--deskew", action="store_true", help="Straighten skewed pages before OCR (needs Pillow)")
+    parser.add_argument("--crop", action="store_true", help="Crop blank margins before OCR (needs Pillow)")
+    parser.add_argument("--ocr-cache", metavar="FILE", default=OCR_CACHE_FILE,
+                        help="OCR page cache shared across documents and runs (default: %(default)s)")
+    parser.add_argument("--no-ocr-cache", action="store_true", help="OCR every page, without the cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Compare OCR speed and confidence across DPI and colour modes, then exit")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="Time budget for the whole document; pages not reached in time are skipped")
+    parser.add_argument("--page-timeout", type=float, metavar="SECONDS",
+                        help="Skip any page that takes longer than this")
+    parser.add_argument("--max-memory", type=int, metavar="MB",
+                        help="Skip remaining pages once the process uses more than this much memory")
     parser.add_argument("--page", "-p", type=int, help="Extract only specific page number")
     parser.add_argument("--pages", type=str, help="Extract page range (e.g., 1-10 or 1,3,5)")
 
     args = parser.parse_args()
 
     # Validate file exists
-    if not os.path.exists(args.file):
+    if args.file and not os.path.exists(args.file):
         print(f"Error: File not found: {args.file}", file=sys.stderr)
         sys.exit(1)
+    if args.url and (args.ocr or args.use_pdftotext or args.profile):
+        print("Error: --ocr, --use-pdftotext and --profile need a local file (--file)", file=sys.stderr)
+        sys.exit(1)
+    stream = None
+    if args.url:
+        try:
+            stream = open_url(args.url)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not open {args.url}: {e}", file=sys.stderr)
+            sys.exit(1)
+    source = args.file or args.url
+
+    for flag in ("tables", "layout"):
+        if getattr(args, flag) and (args.ocr or args.use_pdftotext or args.metadata_only):
+            print(f"Warning: --{flag} needs text positions and only works with the default pypdf method",
+                  file=sys.stderr)
+
+    # Parse page selection (e.g., "1-10" or "1,3,5")
+    page_nums = None
+    if args.page:
+        page_nums = {args.page}
+    elif args.pages:
+        page_nums = set()
+        for part in args.pages.split(","):
+            if "-" in part:
+                start, end = map(int, part.split("-"))
+                page_nums.update(range(start, end + 1))
+            else:
+                page_nums.add(int(part))
+
+    ocr_options = OCROptions(dpi=args.dpi, color=args.ocr_color, psm=args.psm,
+                             languages=args.lang, deskew=args.deskew, crop=args.crop)
+    if args.profile:
+        if not check_tesseract():
+            print("Error: tesseract not installed. Run: brew install tesseract", file=sys.stderr)
+            sys.exit(1)
+        rows = profile_ocr(args.file, ocr_options, page_nums)
+        if args.json:
+            json_output.dump(rows, compact=args.compact)
+        else:
+            print(format_ocr_profile(rows))
+        sys.exit(0)
+
+    limits = ExtractionLimits(document_seconds=args.timeout, page_seconds=args.page_timeout,
+                              max_rss_mb=args.max_memory)
 
     # Choose extraction method
     if args.metadata_only:
-        result = extract_metadata_only(args.file)
+        result = extract_metadata_only(source, stream)
     elif args.ocr:
-        result = extract_with_ocr(args.file)
+        cache = None
+        if not args.no_ocr_cache:
+            try:
+                cache = OCRCache(args.ocr_cache)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: OCR cache unavailable ({e}); OCRing every page", file=sys.stderr)
+        result = extract_with_ocr(args.file, ocr_options, page_nums, limits, cache)
+        if cache:
+            cache.close()
     elif args.use_pdftotext:
-        result = extract_with_pdftotext(args.file)
+        result = extract_with_pdftotext(args.file, limits)
     else:
-        # Default: try pypdf first
-        result = extract_with_pypdf(args.file)
+        # Default: try pypdf first. Boilerplate is judged across every page,
+        # otherwise only the selected pages are read.
+        result = extract_with_pypdf(source, tables=args.tables, layout=args.layout, limits=limits,
+                                    page_numbers=None if args.strip_boilerplate else page_nums,
+                                    stream=stream)
         # If pypdf extracted very little text, suggest OCR
-        if result.success and result.total_chars < 100 and result.metadata.page_count > 0:
-            avg_chars = result.total_chars / result.metadata.page_count
+        if result.success and result.total_chars < 100 and len(result.pages) > 0:
+            avg_chars = result.total_chars / len(result.pages)
             if avg_chars < 50:
                 print("Note: Very little text extracted. This may be a scanned PDF.", file=sys.stderr)
-                print("Try: python extract_pdf.py --file {} --ocr".format(args.file), file=sys.stderr)
+                if args.file:
+                    print("Try: python extract_pdf.py --file {} --ocr".format(args.file), file=sys.stderr)
+
+    # Strip running headers and footers, judged across every extracted page
+    if result.success and args.strip_boilerplate:
+        strip_boilerplate(result.pages)
+        result.total_chars = result.pages.total_chars
 
     # Filter to specific pages if requested
-    if result.success and result.pages:
-        if args.page:
-            result.pages = [p for p in result.pages if p.page_number == args.page]
-            result.total_chars = sum(p.char_count for p in result.pages)
-        elif args.pages:
-            # Parse page range (e.g., "1-10" or "1,3,5")
-            page_nums = set()
-            for part in args.pages.split(","):
-                if "-" in part:
-                    start, end = map(int, part.split("-"))
-                    page_nums.update(range(start, end + 1))
-                else:
-                    page_nums.add(int(part))
-            result.pages = [p for p in result.pages if p.page_number in page_nums]
-            result.total_chars = sum(p.char_count for p in result.pages)
+    if result.success and result.pages and page_nums:
+        result.pages = result.pages.select(page_nums)
+        result.total_chars = result.pages.total_chars
+    if page_nums:
+        result.skipped_pages = [p for p in result.skipped_pages if p.page_number in page_nums]
+    if result.skipped_pages:
+        print(f"Warning: skipped {skipped_summary(result.skipped_pages)} (see skipped_pages)", file=sys.stderr)
+
+    if result.success and args.strip_boilerplate:
+        result.stripped_chars = sum(len(result.pages.full_text(i)) - result.pages.char_count(i)
+                                    for i in range(len(result.pages)))
+
+    # Embedded images and attachments (attachments only for the whole document)
+    if result.success and args.extract_images:
+        try:
+            result.images, result.attachments = extract_images(source, args.output_dir, page_nums, stream)
+        except Exception as e:
+            print(f"Warning: Could not extract images: {e}", file=sys.stderr)
+
+    if stream is not None:
+        remote = stream.raw
+        print(f"Fetched {format_file_size(remote.bytes_fetched)} of {format_file_size(remote.size)} "
+              f"in {remote.requests} range requests", file=sys.stderr)
 
     # Format and output
     if args.json:
-        print(format_json_output(result, args.split))
+        json_output.dump(json_output_data(result, args.split), compact=args.compact)
     else:
         print(format_human_output(result, args.split))
 
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Extract slide text and speaker notes from PPTX presentations.
+
+Usage:
+    python extract_pptx.py --file deck.pptx
+    python extract_pptx.py --file deck.pptx --markdown
+    python extract_pptx.py --file deck.pptx --metadata-only
+    python extract_pptx.py --file deck.pptx --json
+    python extract_pptx.py --file q1.pptx q2.pptx --jsonl > slides.jsonl
+
+Features:
+- Reads the presentation straight from the zip archive with the standard
+  library (no python-pptx needed)
+- Slides in presentation order, one at a time, so memory does not grow with
+  the number of slides
+- Slide titles, body text with bullet levels, grouped shapes and tables
+- Speaker notes for each slide
+- Hidden slides flagged (or skipped with --skip-hidden)
+- Metadata extraction (author, created, modified, slide count)
+- JSON, or JSON Lines written slide by slide, and several files per run
+"""
+
+import argparse
+import os
+import posixpath
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Optional, List
+from zipfile import ZipFile, BadZipFile
+
+import json_output
+
+PRESENTATION_PATH = "ppt/presentation.xml"
+CORE_PROPERTIES_PATH = "docProps/core.xml"
+NOTES_SLIDE_RELATIONSHIP = "/notesSlide"
+
+# Placeholder types holding a slide's title, and the notes page's text
+TITLE_PLACEHOLDERS = ("title", "ctrTitle")
+NOTES_PLACEHOLDER = "body"
+
+
+@dataclass
+class PptxMetadata:
+    """PPTX presentation metadata."""
+    title: Optional[str] = None
+    author: Optional[str] = None
+    subject: Optional[str] = None
+    keywords: Optional[str] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    last_modified_by: Optional[str] = None
+    slide_count: int = 0
+    word_count: int = 0
+    file_size_bytes: int = 0
+    file_size_human: str = ""
+
+
+@dataclass
+class Slide:
+    """Text of one slide. Body lines are indented two spaces per bullet level."""
+    number: int
+    title: Optional[str] = None
+    text: str = ""
+    notes: str = ""
+    hidden: bool = False
+
+
+@dataclass
+class ExtractionResult:
+    """Complete extraction result."""
+    success: bool
+    file_path: str
+    metadata: PptxMetadata
+    slides: List[Slide] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def format_file_size(size_bytes: int) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} TB"
+
+
+def local_name(tag: str) -> str:
+    """Element name without its namespace (transitional and strict OOXML differ)."""
+    return tag.rpartition("}")[2]
+
+
+def read_core_properties(archive: ZipFile) -> dict:
+    """Title, author and dates from docProps/core.xml, by element name."""
+    try:
+        root = ET.fromstring(archive.read(CORE_PROPERTIES_PATH))
+    except KeyError:
+        return {}
+    names = {"title": "title", "creator": "author", "subject": "subject", "keywords": "keywords",
+             "created": "created", "modified": "modified", "lastModifiedBy": "last_modified_by"}
+    properties = {}
+    for element in root:
+        name = names.get(local_name(element.tag))
+        if name and element.text:
+            properties[name] = element.text.strip()
+    return properties
+
+
+def read_relationships(archive: ZipFile, part_path: str) -> dict:
+    """Map relationship ids of a part to (type, archive path)."""
+    directory, filename = posixpath.split(part_path)
+    rels_path = posixpath.join(directory, "_rels", filename + ".rels")
+    try:
+        rels = ET.fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in rels:
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External":
+            continue
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = posixpath.normpath(posixpath.join(directory, target))
+        targets[rel.get("Id")] = (rel.get("Type", ""), path)
+    return targets
+
+
+def slide_paths(archive: ZipFile) -> list:
+    """Archive paths of the slides, in presentation order (not file-name order)."""
+    root = ET.fromstring(archive.read(PRESENTATION_PATH))
+    targets = read_relationships(archive, PRESENTATION_PATH)
+    paths = []
+    for element in root.iter():
+        if local_name(element.tag) == "sldId":
+            rel_id = next((value for key, value in element.attrib.items()
+                           if local_name(key) == "id" and key.startswith("{")), None)
+            if rel_id in targets:
+                paths.append(targets[rel_id][1])
+    return paths
+
+
+def paragraph_text(paragraph) -> str:
+    """Text of an a:p element; line breaks become newlines."""
+    parts = []
+    for element in paragraph.iter():
+        name = local_name(element.tag)
+        if name == "t":
+            parts.append(element.text or "")
+        elif name == "br":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def text_body_lines(text_body) -> list:
+    """Non-empty paragraphs of a txBody, indented by bullet level."""
+    lines = []
+    for paragraph in text_body:
+        if local_name(paragraph.tag) != "p":
+            continue
+        text = paragraph_text(paragraph).strip()
+        if not text:
+            continue
+        level = 0
+        properties = next((child for child in paragraph if local_name(child.tag) == "pPr"), None)
+        if properties is not None:
+            level = int(properties.get("lvl", 0))
+        lines.append("  " * level + text)
+    return lines
+
+
+def placeholder_type(shape) -> Optional[str]:
+    """The placeholder type of a shape ("body" when unspecified), or None."""
+    for element in shape.iter():
+        if local_name(element.tag) == "ph":
+            return element.get("type", "body")
+        if local_name(element.tag) == "txBody":
+            break
+    return None
+
+
+def table_lines(table) -> list:
+    """Rows of an a:tbl as "cell | cell" lines."""
+    lines = []
+    for row in table:
+        if local_name(row.tag) != "tr":
+            continue
+        cells = [" ".join(paragraph_text(p).strip() for p in cell.iter() if local_name(p.tag) == "p").strip()
+                 for cell in row if local_name(cell.tag) == "tc"]
+        if any(cells):
+            lines.append(" | ".join(cells))
+    return lines
+
+
+def shape_tree_text(tree, title_parts: list, lines: list, placeholders=None):
+    """Collect text from a shape tree in reading (z) order, groups included.
+
+    Title placeholder text goes to title_parts, everything else to lines.
+    placeholders limits text shapes to those placeholder types, as used for
+    the notes page.
+    """
+    for shape in tree:
+        name = local_name(shape.tag)
+        if name == "grpSp":
+            shape_tree_text(shape, title_parts, lines, placeholders)
+        elif name == "sp":
+            kind = placeholder_type(shape)
+            if placeholders is not None and kind not in placeholders:
+                continue
+            text_body = next((child for child in shape if local_name(child.tag) == "txBody"), None)
+            if text_body is None:
+                continue
+            if kind in TITLE_PLACEHOLDERS:
+                title_parts.extend(text_body_lines(text_body))
+            else:
+                lines.extend(text_body_lines(text_body))
+        elif name == "graphicFrame" and placeholders is None:
+            for table in shape.iter():
+                if local_name(table.tag) == "tbl":
+                    lines.extend(table_lines(table))
+
+
+def part_text(archive: ZipFile, path: str, placeholders=None) -> tuple:
+    """Return (title, text, root) for a slide or notes part."""
+    root = ET.fromstring(archive.read(path))
+    title_parts, lines = [], []
+    for tree in root.iter():
+        if local_name(tree.tag) == "spTree":
+            shape_tree_text(tree, title_parts, lines, placeholders)
+            break
+    title = " ".join(" ".join(title_parts).split()) or None
+    return title, "\n".join(lines), root
+
+
+def read_slide(archive: ZipFile, path: str, number: int, notes: bool = True) -> Slide:
+    """Read one slide's title, text and (optionally) speaker notes."""
+    title, text, root = part_text(archive, path)
+    slide = Slide(number=number, title=title, text=text, hidden=root.get("show", "1") in ("0", "false"))
+    if notes:
+        for rel_type, target in read_relationships(archive, path).values():
+            if rel_type.endswith(NOTES_SLIDE_RELATIONSHIP):
+                _, slide.notes, _ = part_text(archive, target, placeholders=(NOTES_PLACEHOLDER,))
+                break
+    return slide
+
+
+def extract_pptx(file_path: str, metadata_only: bool = False, notes: bool = True,
+                 skip_hidden: bool = False,
+                 on_slide: Optional[Callable[[Slide], None]] = None) -> ExtractionResult:
+    """Extract slide text and notes from a PPTX presentation.
+
+    Slides are parsed one at a time in presentation order. They are
+    collected in the result unless on_slide is given, in which case
+    on_slide(slide) receives each as it is read and none are kept.
+    """
+    metadata = PptxMetadata()
+    try:
+        file_size = os.path.getsize(file_path)
+        metadata.file_size_bytes = file_size
+        metadata.file_size_human = format_file_size(file_size)
+
+        with ZipFile(file_path) as archive:
+            for name, value in read_core_properties(archive).items():
+                setattr(metadata, name, value)
+            paths = slide_paths(archive)
+            metadata.slide_count = len(paths)
+
+            if metadata_only:
+                return ExtractionResult(success=True, file_path=file_path, metadata=metadata)
+
+            slides = []
+            for number, path in enumerate(paths, 1):
+                slide = read_slide(archive, path, number, notes)
+                if skip_hidden and slide.hidden:
+                    continue
+                metadata.word_count += len(" ".join(filter(None, (slide.title, slide.text, slide.notes))).split())
+                if on_slide is not None:
+                    on_slide(slide)
+                else:
+                    slides.append(slide)
+
+        return ExtractionResult(success=True, file_path=file_path, metadata=metadata, slides=slides)
+
+    except (BadZipFile, KeyError) as e:
+        return ExtractionResult(success=False, file_path=file_path, metadata=metadata,
+                                error=f"Not a readable PPTX presentation: {e}")
+    except Exception as e:
+        return ExtractionResult(success=False, file_path=file_path, metadata=metadata, error=str(e))
+
+
+def slide_to_markdown(slide: Slide) -> str:
+    """One slide as a markdown section: title heading, bullets, notes quote."""
+    heading = f"## Slide {slide.number}" + (f": {slide.title}" if slide.title else "")
+    if slide.hidden:
+        heading += " (hidden)"
+    lines = [heading]
+    if slide.text:
+        lines.append("")
+        for line in slide.text.split("\n"):
+            stripped = line.lstrip(" ")
+            lines.append(" " * (len(line) - len(stripped)) + f"- {stripped}")
+    if slide.notes:
+        lines.append("")
+        lines.extend(f"> {line}" if line else ">" for line in slide.notes.split("\n"))
+    return "\n".join(lines)
+
+
+def format_slide(slide: Slide) -> str:
+    """One slide as plain text."""
+    heading = f"--- Slide {slide.number}" + (f": {slide.title}" if slide.title else "")
+    if slide.hidden:
+        heading += " (hidden)"
+    lines = [heading + " ---"]
+    if slide.text:
+        lines.append(slide.text)
+    if slide.notes:
+        lines.extend(["Notes:", slide.notes])
+    return "\n".join(lines)
+
+
+def format_human_output(result: ExtractionResult, as_markdown: bool = False) -> str:
+    """Format extraction result for human reading."""
+    lines = [
+        "=" * 60,
+        "PPTX EXTRACTION REPORT",
+        "=" * 60,
+        "",
+        f"File: {result.file_path}",
+        f"Status: {'SUCCESS' if result.success else 'FAILED'}"
+    ]
+
+    if result.error:
+        lines.append(f"Error: {result.error}")
+        return "\n".join(lines)
+
+    lines.extend([
+        "",
+        "METADATA",
+        "-" * 40
+    ])
+
+    meta = result.metadata
+    if meta.title:
+        lines.append(f"Title: {meta.title}")
+    if meta.author:
+        lines.append(f"Author: {meta.author}")
+    if meta.subject:
+        lines.append(f"Subject: {meta.subject}")
+    if meta.created:
+        lines.append(f"Created: {meta.created}")
+    if meta.modified:
+        lines.append(f"Modified: {meta.modified}")
+    if meta.last_modified_by:
+        lines.append(f"Last Modified By: {meta.last_modified_by}")
+
+    lines.append(f"Slides: {meta.slide_count}")
+    if meta.word_count:
+        lines.append(f"Words: {meta.word_count:,}")
+    lines.append(f"Size: {meta.file_size_human}")
+
+    # Content section
+    if result.slides:
+        lines.extend([
+            "",
+            "CONTENT",
+            "-" * 40
+        ])
+        formatter = slide_to_markdown if as_markdown else format_slide
+        lines.append("\n\n".join(formatter(slide) for slide in result.slides))
+
+    lines.append("")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+def json_output_data(result: ExtractionResult) -> dict:
+    """Build the JSON-serialisable form of an extraction result."""
+    output = {
+        "success": result.success,
+        "file_path": result.file_path,
+        "metadata": asdict(result.metadata)
+    }
+
+    if result.error:
+        output["error"] = result.error
+    else:
+        output["slides"] = [asdict(slide) for slide in result.slides]
+
+    return output
+
+
+def write_jsonl(file_path: str, args) -> ExtractionResult:
+    """Stream one file as JSON Lines: slides as they are read, then a summary.
+
+    Each slide is written as {"type": "slide", "file", ...slide fields} and
+    not kept; the presentation record that follows carries the metadata.
+    """
+    def write_slide(slide: Slide):
+        json_output.dump_line({"type": "slide", "file": file_path, **asdict(slide)})
+
+    result = extract_pptx(file_path, metadata_only=args.metadata_only, notes=not args.no_notes,
+                          skip_hidden=args.skip_hidden, on_slide=write_slide)
+    record = {"type": "presentation", "file": file_path, "success": result.success,
+              "metadata": asdict(result.metadata)}
+    if result.error:
+        record["error"] = result.error
+    json_output.dump_line(record)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract slide text and speaker notes from PPTX presentations",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python extract_pptx.py --file deck.pptx
+  python extract_pptx.py --file deck.pptx --markdown
+  python extract_pptx.py --file deck.pptx --no-notes --skip-hidden
+  python extract_pptx.py --file deck.pptx --metadata-only
+  python extract_pptx.py --file q1.pptx q2.pptx --jsonl > slides.jsonl
+        """
+    )
+
+    parser.add_argument("--file", "-f", required=True, nargs="+", action="extend",
+                        help="PPTX file(s) to extract")
+    parser.add_argument("--markdown", "-md", action="store_true", help="Format slides as markdown")
+    parser.add_argument("--no-notes", action="store_true", help="Leave out speaker notes")
+    parser.add_argument("--skip-hidden", action="store_true", help="Leave out hidden slides")
+    parser.add_argument("--metadata-only", "-m", action="store_true", help="Extract only metadata")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    output_format.add_argument("--jsonl", action="store_true",
+                        help="Output JSON Lines: one record per slide as it is read, then one per file")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
+
+    args = parser.parse_args()
+
+    # Validate files exist
+    missing = [path for path in args.file if not os.path.exists(path)]
+    if missing:
+        print(f"Error: File not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    # Validate file extensions
+    for path in args.file:
+        if not path.lower().endswith(('.pptx', '.pptm')):
+            print(f"Warning: File does not have .pptx extension: {path}", file=sys.stderr)
+
+    # Extract and output, one file at a time
+    success = True
+    results = []
+    for path in args.file:
+        if args.jsonl:
+            result = write_jsonl(path, args)
+        else:
+            result = extract_pptx(path, metadata_only=args.metadata_only, notes=not args.no_notes,
+                                  skip_hidden=args.skip_hidden)
+            if args.json:
+                results.append(json_output_data(result))
+            else:
+                print(format_human_output(result, args.markdown))
+        success = success and result.success
+
+    if args.json:
+        json_output.dump(results[0] if len(results) == 1 else results, compact=args.compact)
+    elif args.jsonl:
+        sys.stdout.buffer.flush()
+
+    # Exit code
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Extract cell text from XLSX workbooks, streaming one row at a time.
+
+Usage:
+    python extract_xlsx.py --file workbook.xlsx
+    python extract_xlsx.py --file workbook.xlsx --sheet Budget --max-rows 500
+    python extract_xlsx.py --file workbook.xlsx --metadata-only
+    python extract_xlsx.py --file workbook.xlsx --json
+    python extract_xlsx.py --file q1.xlsx q2.xlsx q3.xlsx --jsonl > rows.jsonl
+
+Features:
+- Reads the workbook straight from the zip archive with the standard library
+  (no openpyxl or pandas needed)
+- Streams each sheet's rows, so memory does not grow with the sheet size;
+  only the shared-strings table is held in memory
+- Shared strings, inline strings, booleans, errors and formula results
+- Date-formatted cells as ISO dates rather than serial numbers
+- Row and byte caps so a huge workbook cannot flood the output
+- Metadata extraction (author, created, modified, sheets and dimensions)
+- JSON, or JSON Lines written as rows are read, and several files per run
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Optional, List
+from zipfile import ZipFile, BadZipFile
+
+import json_output
+
+WORKBOOK_PATH = "xl/workbook.xml"
+SHARED_STRINGS_PATH = "xl/sharedStrings.xml"
+STYLES_PATH = "xl/styles.xml"
+CORE_PROPERTIES_PATH = "docProps/core.xml"
+
+# Default caps: rows per sheet and bytes of cell text per workbook (0 = no cap)
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_MAX_BYTES = 20_000_000
+
+# Built-in number formats that display dates or times
+DATE_FORMAT_IDS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47} | set(range(50, 59))
+FORMAT_LITERALS = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+ELAPSED_TIME_FORMAT = re.compile(r"\[[hms]+\]", re.IGNORECASE)
+DATE_FORMAT_CODES = re.compile(r"[dmyhs]", re.IGNORECASE)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+EXCEL_1904_EPOCH = datetime(1904, 1, 1)
+
+ROW_DIGITS = "0123456789"
+BOOLEAN_TEXT = {"0": "FALSE", "1": "TRUE"}
+
+
+@dataclass
+class XlsxMetadata:
+    """XLSX workbook metadata."""
+    title: Optional[str] = None
+    author: Optional[str] = None
+    subject: Optional[str] = None
+    keywords: Optional[str] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    last_modified_by: Optional[str] = None
+    sheet_count: int = 0
+    file_size_bytes: int = 0
+    file_size_human: str = ""
+
+
+@dataclass
+class Sheet:
+    """One worksheet and the rows read from it.
+
+    rows holds {"row": number, "cells": [...]} for each row with any text,
+    cells running from column A with trailing empty cells dropped. Rows are
+    not kept when they are handed to an on_row callback instead.
+    """
+    name: str
+    state: str = "visible"          # or "hidden" / "veryHidden"
+    dimension: Optional[str] = None  # used range as saved, e.g. "A1:K5000"
+    row_count: int = 0
+    truncated: bool = False
+    rows: list = field(default_factory=list)
+    path: str = field(default="", repr=False)
+
+
+@dataclass
+class ExtractionResult:
+    """Complete extraction result."""
+    success: bool
+    file_path: str
+    metadata: XlsxMetadata
+    sheets: List[Sheet] = field(default_factory=list)
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+def format_file_size(size_bytes: int) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} TB"
+
+
+def local_name(tag: str) -> str:
+    """Element name without its namespace (transitional and strict OOXML differ)."""
+    return tag.rpartition("}")[2]
+
+
+def namespace(tag: str) -> str:
+    """The "{uri}" prefix of an element tag, or "" if it has none."""
+    return tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+
+
+def read_core_properties(archive: ZipFile) -> dict:
+    """Title, author and dates from docProps/core.xml, by element name."""
+    try:
+        root = ET.fromstring(archive.read(CORE_PROPERTIES_PATH))
+    except KeyError:
+        return {}
+    names = {"title": "title", "creator": "author", "subject": "subject", "keywords": "keywords",
+             "created": "created", "modified": "modified", "lastModifiedBy": "last_modified_by"}
+    properties = {}
+    for element in root:
+        name = names.get(local_name(element.tag))
+        if name and element.text:
+            properties[name] = element.text.strip()
+    return properties
+
+
+def read_relationships(archive: ZipFile, part_path: str) -> dict:
+    """Map relationship ids of a part to the archive paths they point to."""
+    directory, filename = posixpath.split(part_path)
+    rels_path = posixpath.join(directory, "_rels", filename + ".rels")
+    try:
+        rels = ET.fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in rels:
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External":
+            continue
+        if target.startswith("/"):
+            targets[rel.get("Id")] = target.lstrip("/")
+        else:
+            targets[rel.get("Id")] = posixpath.normpath(posixpath.join(directory, target))
+    return targets
+
+
+def read_workbook(archive: ZipFile) -> tuple:
+    """Return (sheets in workbook order, date1904) from xl/workbook.xml."""
+    root = ET.fromstring(archive.read(WORKBOOK_PATH))
+    targets = read_relationships(archive, WORKBOOK_PATH)
+    sheets, date1904 = [], False
+    for element in root.iter():
+        name = local_name(element.tag)
+        if name == "workbookPr":
+            date1904 = element.get("date1904", "0").lower() in ("1", "true")
+        elif name == "sheet":
+            rel_id = next((value for key, value in element.attrib.items() if local_name(key) == "id"), None)
+            sheets.append(Sheet(name=element.get("name", ""), state=element.get("state", "visible"),
+                                path=targets.get(rel_id, "")))
+    return sheets, date1904
+
+
+def rich_text(element) -> str:
+    """Text of a shared string or inline string, without phonetic runs."""
+    parts = []
+    for child in element:
+        name = local_name(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if local_name(t.tag) == "t")
+    return "".join(parts)
+
+
+def read_shared_strings(archive: ZipFile) -> list:
+    """Load the shared-strings table, parsing one <si> at a time."""
+    if SHARED_STRINGS_PATH not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(SHARED_STRINGS_PATH) as stream:
+        context = ET.iterparse(stream, events=("start", "end"))
+        _, root = next(context)
+        item_tag = namespace(root.tag) + "si"
+        for event, element in context:
+            if event == "end" and element.tag == item_tag:
+                strings.append(rich_text(element))
+                root.remove(element)
+    return strings
+
+
+def is_date_format(format_code: str) -> bool:
+    """Whether a custom number format displays a date or time of day."""
+    if ELAPSED_TIME_FORMAT.search(format_code):
+        return False  # [h]:mm durations are not points in time
+    return bool(DATE_FORMAT_CODES.search(FORMAT_LITERALS.sub("", format_code)))
+
+
+def read_date_styles(archive: ZipFile) -> list:
+    """For each cell style index, whether its number format is a date."""
+    if STYLES_PATH not in archive.namelist():
+        return []
+    root = ET.fromstring(archive.read(STYLES_PATH))
+    custom_dates = set()
+    date_styles = []
+    for element in root:
+        name = local_name(element.tag)
+        if name == "numFmts":
+            for number_format in element:
+                if is_date_format(number_format.get("formatCode", "")):
+                    custom_dates.add(int(number_format.get("numFmtId", -1)))
+        elif name == "cellXfs":
+            for xf in element:
+                format_id = int(xf.get("numFmtId", 0))
+                date_styles.append(format_id in DATE_FORMAT_IDS or format_id in custom_dates)
+    return date_styles
+
+
+def serial_to_iso(value: str, date1904: bool = False) -> str:
+    """Convert an Excel date serial to an ISO date, time or datetime."""
+    try:
+        serial = float(value)
+    except ValueError:
+        return value
+    moment = (EXCEL_1904_EPOCH if date1904 else EXCEL_EPOCH) + timedelta(seconds=round(serial * 86400))
+    if serial == int(serial):
+        return moment.date().isoformat()
+    if 0 <= serial < 1:
+        return moment.time().isoformat()
+    return moment.isoformat()
+
+
+@lru_cache(maxsize=None)
+def column_index(letters: str) -> int:
+    """Zero-based column of a cell reference's letters, e.g. "AB" -> 27."""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def iter_sheet_rows(archive: ZipFile, sheet_path: str, shared_strings: list,
+                    date_styles: list, date1904: bool = False):
+    """Yield (row_number, cells) for each row of a worksheet that has text.
+
+    The sheet XML is decompressed and parsed incrementally, and each <row>
+    is dropped from the tree once read, so memory stays flat however many
+    rows the sheet has. Stopping the iteration stops the parsing.
+    """
+    with archive.open(sheet_path) as stream:
+        context = ET.iterparse(stream, events=("start", "end"))
+        _, root = next(context)
+        ns = namespace(root.tag)
+        row_tag, cell_tag, sheet_data_tag = ns + "row", ns + "c", ns + "sheetData"
+        value_tag, inline_tag = ns + "v", ns + "is"
+        sheet_data = root
+        next_row = 1
+
+        for event, element in context:
+            if event == "start":
+                if element.tag == sheet_data_tag:
+                    sheet_data = element
+                continue
+            if element.tag != row_tag:
+                continue
+
+            row_number = int(element.get("r", next_row))
+            next_row = row_number + 1
+            cells = []
+            for cell in element.iterfind(cell_tag):
+                reference = cell.get("r")
+                if reference:
+                    cells.extend([""] * (column_index(reference.rstrip(ROW_DIGITS)) - len(cells)))
+                cell_type = cell.get("t", "n")
+                value = cell.findtext(value_tag)
+                if cell_type == "s":
+                    text = shared_strings[int(value)] if value is not None else ""
+                elif cell_type == "inlineStr":
+                    inline = cell.find(inline_tag)
+                    text = rich_text(inline) if inline is not None else ""
+                elif value is None:
+                    text = ""
+                elif cell_type == "b":
+                    text = BOOLEAN_TEXT.get(value, value)
+                elif cell_type == "n" and date_styles and int(cell.get("s", 0)) < len(date_styles) \
+                        and date_styles[int(cell.get("s", 0))]:
+                    text = serial_to_iso(value, date1904)
+                else:
+                    text = value  # numbers, formula strings ("str"), errors ("e"), ISO dates ("d")
+                cells.append(text)
+            sheet_data.remove(element)
+
+            while cells and not cells[-1]:
+                cells.pop()
+            if cells:
+                yield row_number, cells
+
+
+def read_dimension(archive: ZipFile, sheet_path: str) -> Optional[str]:
+    """The saved used range of a sheet, read from the top of its XML."""
+    with archive.open(sheet_path) as stream:
+        for _, element in ET.iterparse(stream, events=("start",)):
+            name = local_name(element.tag)
+            if name == "dimension":
+                return element.get("ref")
+            if name == "sheetData":
+                return None
+    return None
+
+
+def extract_xlsx(file_path: str, metadata_only: bool = False,
+                 sheet_names: Optional[List[str]] = None,
+                 max_rows: int = DEFAULT_MAX_ROWS,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 on_row: Optional[Callable[[Sheet, int, list], None]] = None) -> ExtractionResult:
+    """Extract cell text from an XLSX workbook.
+
+    sheet_names limits extraction to those sheets. max_rows caps the rows
+    read per sheet and max_bytes the UTF-8 bytes of cell text read from the
+    whole workbook (0 for no cap); a sheet cut short is marked truncated.
+    Rows are collected in each Sheet's rows unless on_row is given, in which
+    case on_row(sheet, row_number, cells) receives them as they are read.
+    """
+    metadata = XlsxMetadata()
+    try:
+        file_size = os.path.getsize(file_path)
+        metadata.file_size_bytes = file_size
+        metadata.file_size_human = format_file_size(file_size)
+
+        with ZipFile(file_path) as archive:
+            members = set(archive.namelist())
+            for name, value in read_core_properties(archive).items():
+                setattr(metadata, name, value)
+            sheets, date1904 = read_workbook(archive)
+            metadata.sheet_count = len(sheets)
+
+            if sheet_names:
+                missing = [name for name in sheet_names if name not in {s.name for s in sheets}]
+                if missing:
+                    raise ValueError(f"No sheet named {', '.join(missing)} "
+                                     f"(sheets: {', '.join(s.name for s in sheets)})")
+                sheets = [sheet for sheet in sheets if sheet.name in sheet_names]
+
+            for sheet in sheets:
+                if sheet.path in members:
+                    sheet.dimension = read_dimension(archive, sheet.path)
+
+            if metadata_only:
+                return ExtractionResult(success=True, file_path=file_path, metadata=metadata, sheets=sheets)
+
+            shared_strings = read_shared_strings(archive)
+            date_styles = read_date_styles(archive)
+            bytes_read = 0
+            truncated = False
+            for sheet in sheets:
+                if truncated:
+                    sheet.truncated = True
+                    continue
+                if sheet.path not in members:
+                    continue  # e.g. a chartsheet, which has no cells
+                for row_number, cells in iter_sheet_rows(archive, sheet.path, shared_strings,
+                                                         date_styles, date1904):
+                    if max_rows and sheet.row_count >= max_rows:
+                        sheet.truncated = True
+                        break
+                    bytes_read += len("".join(cells).encode("utf-8"))
+                    if max_bytes and bytes_read > max_bytes:
+                        sheet.truncated = truncated = True
+                        break
+                    sheet.row_count += 1
+                    if on_row is not None:
+                        on_row(sheet, row_number, cells)
+                    else:
+                        sheet.rows.append({"row": row_number, "cells": cells})
+
+        return ExtractionResult(
+            success=True,
+            file_path=file_path,
+            metadata=metadata,
+            sheets=sheets,
+            truncated=any(sheet.truncated for sheet in sheets)
+        )
+
+    except (BadZipFile, KeyError) as e:
+        return ExtractionResult(success=False, file_path=file_path, metadata=metadata,
+                                error=f"Not a readable XLSX workbook: {e}")
+    except Exception as e:
+        return ExtractionResult(success=False, file_path=file_path, metadata=metadata, error=str(e))
+
+
+def sheet_data(sheet: Sheet, include_rows: bool = True) -> dict:
+    """JSON-serialisable form of a sheet."""
+    data = {"name": sheet.name, "state": sheet.state, "dimension": sheet.dimension,
+            "row_count": sheet.row_count, "truncated": sheet.truncated}
+    if include_rows:
+        data["rows"] = sheet.rows
+    return data
+
+
+def format_human_output(result: ExtractionResult) -> str:
+    """Format extraction result for human reading."""
+    lines = [
+        "=" * 60,
+        "XLSX EXTRACTION REPORT",
+        "=" * 60,
+        "",
+        f"File: {result.file_path}",
+        f"Status: {'SUCCESS' if result.success else 'FAILED'}"
+    ]
+
+    if result.error:
+        lines.append(f"Error: {result.error}")
+        return "\n".join(lines)
+
+    lines.extend([
+        "",
+        "METADATA",
+        "-" * 40
+    ])
+
+    meta = result.metadata
+    if meta.title:
+        lines.append(f"Title: {meta.title}")
+    if meta.author:
+        lines.append(f"Author: {meta.author}")
+    if meta.subject:
+        lines.append(f"Subject: {meta.subject}")
+    if meta.created:
+        lines.append(f"Created: {meta.created}")
+    if meta.modified:
+        lines.append(f"Modified: {meta.modified}")
+    if meta.last_modified_by:
+        lines.append(f"Last Modified By: {meta.last_modified_by}")
+
+    lines.extend([
+        f"Sheets: {meta.sheet_count}",
+        f"Size: {meta.file_size_human}"
+    ])
+
+    # Sheets section
+    lines.extend([
+        "",
+        "SHEETS",
+        "-" * 40
+    ])
+    for sheet in result.sheets:
+        details = [sheet.dimension or "empty"]
+        if sheet.state != "visible":
+            details.append(sheet.state)
+        if sheet.row_count:
+            details.append(f"{sheet.row_count:,} rows read")
+        if sheet.truncated:
+            details.append("truncated")
+        lines.append(f"  {sheet.name} ({', '.join(details)})")
+
+    # Content section, one block per sheet
+    for sheet in result.sheets:
+        if not sheet.rows:
+            continue
+        lines.extend([
+            "",
+            f"SHEET: {sheet.name}",
+            "-" * 40
+        ])
+        lines.extend(" | ".join(row["cells"]) for row in sheet.rows)
+        if sheet.truncated:
+            lines.append("[truncated: row or byte cap reached]")
+
+    lines.append("")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+def json_output_data(result: ExtractionResult) -> dict:
+    """Build the JSON-serialisable form of an extraction result."""
+    output = {
+        "success": result.success,
+        "file_path": result.file_path,
+        "metadata": asdict(result.metadata)
+    }
+
+    if result.error:
+        output["error"] = result.error
+    else:
+        output["truncated"] = result.truncated
+        output["sheets"] = [sheet_data(sheet) for sheet in result.sheets]
+
+    return output
+
+
+def write_jsonl(file_path: str, args) -> ExtractionResult:
+    """Stream one file as JSON Lines: rows as they are read, then a summary.
+
+    Each row is written as {"type": "row", "file", "sheet", "row", "cells"}
+    and not kept, so memory does not grow with the workbook. The workbook
+    record that follows carries the metadata and per-sheet row counts.
+    """
+    def write_row(sheet: Sheet, row_number: int, cells: list):
+        json_output.dump_line({"type": "row", "file": file_path, "sheet": sheet.name,
+                               "row": row_number, "cells": cells})
+
+    result = extract_xlsx(file_path, metadata_only=args.metadata_only, sheet_names=args.sheet,
+                          max_rows=args.max_rows, max_bytes=args.max_bytes, on_row=write_row)
+    record = {"type": "workbook", "file": file_path, "success": result.success,
+              "metadata": asdict(result.metadata)}
+    if result.error:
+        record["error"] = result.error
+    else:
+        record["truncated"] = result.truncated
+        record["sheets"] = [sheet_data(sheet, include_rows=False) for sheet in result.sheets]
+    json_output.dump_line(record)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract cell text from XLSX workbooks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python extract_xlsx.py --file workbook.xlsx
+  python extract_xlsx.py --file workbook.xlsx --sheet Budget --sheet Actuals
+  python extract_xlsx.py --file workbook.xlsx --max-rows 1000 --json
+  python extract_xlsx.py --file workbook.xlsx --metadata-only
+  python extract_xlsx.py --file q1.xlsx q2.xlsx q3.xlsx --jsonl > rows.jsonl
+        """
+    )
+
+    parser.add_argument("--file", "-f", required=True, nargs="+", action="extend",
+                        help="XLSX file(s) to extract")
+    parser.add_argument("--sheet", action="append", metavar="NAME",
+                        help="Extract only this sheet (repeatable)")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS, metavar="N",
+                        help=f"Rows to read per sheet (default: {DEFAULT_MAX_ROWS:,}; 0 for no cap)")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, metavar="N",
+                        help=f"Bytes of cell text to read per workbook (default: {DEFAULT_MAX_BYTES:,}; 0 for no cap)")
+    parser.add_argument("--metadata-only", "-m", action="store_true", help="Extract only metadata")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    output_format.add_argument("--jsonl", action="store_true",
+                        help="Output JSON Lines: one record per row as it is read, then one per workbook")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
+
+    args = parser.parse_args()
+
+    # Validate files exist
+    missing = [path for path in args.file if not os.path.exists(path)]
+    if missing:
+        print(f"Error: File not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    # Validate file extensions
+    for path in args.file:
+        if not path.lower().endswith(('.xlsx', '.xlsm')):
+            print(f"Warning: File does not have .xlsx extension: {path}", file=sys.stderr)
+
+    # Extract and output, one file at a time
+    success = True
+    results = []
+    for path in args.file:
+        if args.jsonl:
+            result = write_jsonl(path, args)
+        else:
+            result = extract_xlsx(path, metadata_only=args.metadata_only, sheet_names=args.sheet,
+                                  max_rows=args.max_rows, max_bytes=args.max_bytes)
+            if args.json:
+                results.append(json_output_data(result))
+            else:
+                print(format_human_output(result))
+        success = success and result.success
+
+    if args.json:
+        json_output.dump(results[0] if len(results) == 1 else results, compact=args.compact)
+    elif args.jsonl:
+        sys.stdout.buffer.flush()
+
+    # Exit code
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+JSON serialisation shared by the extraction scripts.
+
+Uses orjson when it is installed (pip install orjson) and falls back to the
+standard library otherwise. Output is always UTF-8 with non-ASCII characters
+kept as-is, pretty-printed with two-space indentation unless compact=True.
+
+dump() writes straight to a binary file object (stdout by default) instead of
+going through print() and a str copy of the whole document, which matters for
+multi-hundred-MB extraction results.
+"""
+
+import json
+import sys
+from typing import Any, BinaryIO, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+STREAM_BATCH_CHUNKS = 8192
+
+
+def dumpb(obj: Any, compact: bool = False) -> bytes:
+    """Serialise obj to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the stdlib handle it
+    return dumps_stdlib(obj, compact).encode("utf-8")
+
+
+def dumps(obj: Any, compact: bool = False) -> str:
+    """Serialise obj to a JSON string."""
+    if orjson is not None:
+        return dumpb(obj, compact).decode("utf-8")
+    return dumps_stdlib(obj, compact)
+
+
+def dumps_stdlib(obj: Any, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def dump(obj: Any, fp: Optional[BinaryIO] = None, compact: bool = False):
+    """Write obj as JSON plus a trailing newline to a binary file object.
+
+    Defaults to stdout. With the stdlib backend, indented output is encoded
+    and written chunk by chunk rather than held in memory as one string.
+    """
+    if fp is None:
+        sys.stdout.flush()  # keep ordering with anything already printed
+        fp = sys.stdout.buffer
+
+    if orjson is not None:
+        try:
+            fp.write(orjson.dumps(obj, option=(0 if compact else orjson.OPT_INDENT_2) | orjson.OPT_APPEND_NEWLINE))
+            fp.flush()
+            return
+        except TypeError:
+            pass
+
+    if compact:
+        # The stdlib's C encoder only runs in one shot, and is much faster
+        fp.write(dumps_stdlib(obj, compact=True).encode("utf-8"))
+    else:
+        # Indented output uses the pure-Python encoder either way, so stream
+        # it, batching the (mostly tiny) chunks to keep write calls cheap
+        buffer = []
+        for chunk in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(obj):
+            buffer.append(chunk)
+            if len(buffer) >= STREAM_BATCH_CHUNKS:
+                fp.write("".join(buffer).encode("utf-8"))
+                buffer.clear()
+        fp.write("".join(buffer).encode("utf-8"))
+    fp.write(b"\n")
+    fp.flush()
+
+
+def dump_line(obj: Any, fp: Optional[BinaryIO] = None):
+    """Write obj as one compact JSON line, for JSON Lines output.
+
+    Unlike dump() this does not flush, so writing a line per record stays
+    cheap; the caller flushes once it has written the last one.
+    """
+    if fp is None:
+        fp = sys.stdout.buffer
+    fp.write(dumpb(obj, compact=True))
+    fp.write(b"\n")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Check that extract_pdf.py --url reads only what it needs over HTTP.
+
+Serves a generated 1,000-page PDF from a local http.server with Range
+support and checks that metadata, or a couple of pages, cost a small
+fraction of the file and match a local extraction; then checks that a
+server which ignores Range is refused instead of downloaded.
+
+Usage:
+    python tests/test_remote_pdf.py
+    python -m pytest tests/test_remote_pdf.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS)
+
+import extract_pdf  # noqa: E402
+
+PAGE_COUNT = 1000
+LINES_PER_PAGE = 50
+MAX_FETCHED_SHARE = 0.1  # of the file, for metadata or two pages
+
+
+@lru_cache(maxsize=None)
+def sample_pdf() -> bytes:
+    """A PDF of PAGE_COUNT text pages, each page object followed by its content.
+
+    The page tree is one /Pages node near the start, and the
+    cross-reference table is at the end, as in most generated reports.
+    """
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        4: b"<< /Title (Range test) /Author (extract_pdf) >>",
+    }
+    kids = []
+    for page in range(1, PAGE_COUNT + 1):
+        page_id, content_id = 3 + 2 * page, 4 + 2 * page
+        kids.append(f"{page_id} 0 R")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        lines = [f"Page {page} line {line} of the range request test document, padded to length."
+                 for line in range(1, LINES_PER_PAGE + 1)]
+        stream = ("BT /F1 10 Tf 12 TL 72 760 Td " + " ".join(f"({text}) '" for text in lines) + " ET").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[2] = f"<< /Type /Pages /Count {PAGE_COUNT} /Kids [{' '.join(kids)}] >>".encode()
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(data)
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(data)
+    size = max(objects) + 1
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for number in range(1, size):
+        data += b"%010d 00000 n \n" % offsets[number]
+    data += b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    return bytes(data)
+
+
+@contextmanager
+def serve(data: bytes, ranges: bool = True):
+    """Serve data at a local URL, answering Range requests only when ranges."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if ranges and match:
+                start = int(match.group(1))
+                end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+                body = data[start:end + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                body = data
+                self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client hung up on a full download, as it should
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/sample.pdf"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def local_copy(data: bytes):
+    """The data written to a temporary .pdf file, for comparison runs."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sample.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        yield path
+
+
+def assert_small_fetch(remote, what: str):
+    share = remote.bytes_fetched / remote.size
+    assert share < MAX_FETCHED_SHARE, (
+        f"{what} fetched {remote.bytes_fetched} of {remote.size} bytes ({share:.0%})")
+
+
+def test_metadata_fetches_a_small_fraction():
+    data = sample_pdf()
+    with serve(data) as url, local_copy(data) as path:
+        stream = extract_pdf.open_url(url)
+        result = extract_pdf.extract_metadata_only(url, stream)
+        assert result.success, result.error
+        assert_small_fetch(stream.raw, "metadata")
+        assert result.metadata == extract_pdf.extract_metadata_only(path).metadata
+        assert result.metadata.page_count == PAGE_COUNT
+
+
+def test_pages_fetch_a_small_fraction():
+    data = sample_pdf()
+    pages = {1, 2, PAGE_COUNT}
+    with serve(data) as url, local_copy(data) as path:
+        stream = extract_pdf.open_url(url)
+        result = extract_pdf.extract_with_pypdf(url, page_numbers=pages, stream=stream)
+        assert result.success, result.error
+        assert_small_fetch(stream.raw, "three pages")
+        local = extract_pdf.extract_with_pypdf(path, page_numbers=pages)
+        assert list(result.pages) == list(local.pages)
+        assert [page.page_number for page in result.pages] == sorted(pages)
+        assert "Page 1000 line 50" in result.pages[-1].text
+
+
+def test_server_without_range_support_is_refused():
+    data = sample_pdf()
+    with serve(data, ranges=False) as url:
+        try:
+            extract_pdf.open_url(url)
+        except OSError as e:
+            assert "range requests" in str(e), e
+        else:
+            raise AssertionError("open_url accepted a server that ignores Range")
+
+        run = subprocess.run([sys.executable, os.path.join(SCRIPTS, "extract_pdf.py"),
+                              "--url", url, "--metadata-only"],
+                             capture_output=True, text=True, timeout=60)
+        assert run.returncode == 1, run
+        assert "does not support HTTP range requests" in run.stderr, run.stderr
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {test.__name__}: {e}")
+        else:
+            print(f"ok   {test.__name__}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,136 +6,235 @@ Usage:
     python generate_schema.py --type faqpage --input data.json
     python generate_schema.py --type article --interactive
     python generate_schema.py --type organization --output schema.json
+    python generate_schema.py --type product --bulk catalogue.csv --output products.jsonl
+    python generate_schema.py --type-field type --bulk records.jsonl --output-dir ./schema/
 
-Supports: faqpage, article, organization, product
+Supports: faqpage, article, organization, product (one per file in
+assets/schema-templates/)
 """
 
 import argparse
+import csv
+import hashlib
 import json
+import os
+import re
 import sys
 from datetime import datetime
-from typing import Any
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Optional
+
+import json_output
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "assets" / "schema-templates"
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([A-Z0-9_]+)\}\}')
+NOW = "$now"  # binding default meaning "current timestamp"
+
+# How template values map to input fields, keyed by schema type and then by
+# JSON path ("a.b", "list[].field"). Unbound "{{PLACEHOLDER}}" strings read
+# the camelCase field (AUTHOR_NAME -> authorName); unbound literals are kept.
+#   field/fallback/default  value from scope[field], else scope[fallback], else default
+#   each (+ optional)       build one item per element of scope[each]
+#   optional (+ spread)     include block only if scope[optional] is set; spread
+#                           copies its keys instead of following the template
+#   self                    the scope value itself (lists of plain strings)
+TEMPLATE_BINDINGS = {
+    "faqpage": {
+        "mainEntity": {"each": "questions"},
+        "mainEntity[].name": {"field": "question"},
+        "mainEntity[].acceptedAnswer.text": {"field": "answer"}
+    },
+    "article": {
+        "@type": {"field": "articleType"},
+        "name": {"field": "name", "fallback": "headline"},
+        "image": {"field": "image"},
+        "datePublished": {"field": "datePublished", "default": NOW},
+        "dateModified": {"field": "dateModified", "default": NOW},
+        "author.@type": {"field": "authorType"},
+        "publisher.logo.url": {"field": "publisherLogo"}
+    },
+    "organization": {
+        "@type": {"field": "orgType"},
+        "logo": {"field": "logo"},
+        "image": {"field": "image", "fallback": "logo"},
+        "sameAs": {"field": "sameAs", "default": []},
+        "contactPoint.contactType": {"field": "contactType"},
+        "founder": {"each": "founders", "optional": True},
+        "founder[].name": {"self": True},
+        "address": {"optional": "address", "spread": True}
+    },
+    "product": {
+        "image": {"field": "image"},
+        "offers.priceCurrency": {"field": "currency", "default": "AUD"},
+        "offers.availability": {"field": "availability"},
+        "aggregateRating": {"optional": "aggregateRating"}
+    }
+}
+
+# Fixed value for NOW defaults; set for byte-stable output (see --timestamp)
+DEFAULT_TIMESTAMP: Optional[str] = None
+
+
+def set_default_timestamp(value: Optional[str]):
+    """Use a fixed timestamp for missing dates (also the worker pool initializer)."""
+    global DEFAULT_TIMESTAMP
+    DEFAULT_TIMESTAMP = value
+
+
+def current_timestamp() -> str:
+    return DEFAULT_TIMESTAMP or datetime.now().isoformat()
+
+
+def placeholder_field(value) -> Optional[str]:
+    """Return the camelCase input field for a "{{PLACEHOLDER}}" string, else None."""
+    if not isinstance(value, str):
+        return None
+    match = PLACEHOLDER_PATTERN.fullmatch(value)
+    if not match:
+        return None
+    first, *rest = match.group(1).lower().split("_")
+    return first + "".join(part.title() for part in rest)
+
+
+class TemplateCompiler:
+    """Compile a template and its bindings into a generated Python function.
+
+    The generated code is a dict literal with direct scope.get() lookups,
+    the same shape as a hand-written generator, so applying a plan costs no
+    more than the code it replaces.
+    """
+
+    def __init__(self, bindings: dict):
+        self.bindings = bindings
+        self.sources = []
+
+    def child_path(self, path: str, key: str) -> str:
+        return f"{path}.{key}" if path else key
+
+    def is_optional(self, path: str) -> bool:
+        return bool(self.bindings.get(path, {}).get("optional"))
+
+    def field_expr(self, field: str, fallback: Optional[str], default: Any) -> str:
+        default_expr = "_now()" if default == NOW else repr(default)
+        if fallback:
+            default_expr = f"scope.get({fallback!r}, {default_expr})"
+        return f"scope.get({field!r}, {default_expr})"
+
+    def expr(self, template: Any, path: str, apply_binding: bool = True) -> str:
+        """Return a Python expression (over `scope`) that builds this value."""
+        spec = self.bindings.get(path, {}) if apply_binding else {}
+
+        if "each" in spec:
+            item_function = self.function(template[0], f"{path}[]")
+            return f"[{item_function}(item) for item in scope.get({spec['each']!r}) or []]"
+        if "optional" in spec:
+            source = spec["optional"]
+            if spec.get("spread"):
+                fixed = {key: value for key, value in template.items() if key.startswith("@")}
+                return f"{{**{fixed!r}, **scope[{source!r}]}}"
+            return f"{self.function(template, path, apply_binding=False)}(scope[{source!r}])"
+        if spec.get("self"):
+            return "scope"
+        if "field" in spec:
+            default = spec.get("default", "" if placeholder_field(template) else template)
+            return self.field_expr(spec["field"], spec.get("fallback"), default)
+
+        if isinstance(template, dict):
+            if any(self.is_optional(self.child_path(path, key)) for key in template):
+                return f"{self.function(template, path)}(scope)"
+            items = ", ".join(
+                f"{key!r}: {self.expr(value, self.child_path(path, key))}" for key, value in template.items()
+            )
+            return f"{{{items}}}"
+        if isinstance(template, list):
+            return "[" + ", ".join(self.expr(item, f"{path}[]") for item in template) + "]"
+
+        field = placeholder_field(template)
+        if field:
+            return self.field_expr(field, None, "")
+        return repr(template)
+
+    def function(self, template: Any, path: str, apply_binding: bool = True) -> str:
+        """Emit a named function building this template value; return its name."""
+        index = len(self.sources)
+        name = f"_build_{index}"
+        self.sources.append("")  # reserve the slot; nested functions are emitted first
+        lines = [f"def {name}(scope):"]
+
+        if isinstance(template, dict) and any(self.is_optional(self.child_path(path, k)) for k in template):
+            keys = list(template)
+            # Keys before the first optional block go into one dict literal
+            split = next(i for i, key in enumerate(keys) if self.is_optional(self.child_path(path, key)))
+            literal = ", ".join(
+                f"{key!r}: {self.expr(template[key], self.child_path(path, key))}" for key in keys[:split]
+            )
+            lines.append(f"    output = {{{literal}}}")
+            for key in keys[split:]:
+                value = template[key]
+                child = self.child_path(path, key)
+                assign = f"output[{key!r}] = {self.expr(value, child)}"
+                if self.is_optional(child):
+                    spec = self.bindings[child]
+                    source = spec["each"] if "each" in spec else spec["optional"]
+                    lines.append(f"    if scope.get({source!r}):")
+                    lines.append(f"        {assign}")
+                else:
+                    lines.append(f"    {assign}")
+            lines.append("    return output")
+        else:
+            lines.append(f"    return {self.expr(template, path, apply_binding)}")
+
+        self.sources[index] = "\n".join(lines)
+        return name
+
+    def compile(self, template: dict):
+        """Return the generator function for a top-level template."""
+        entry = self.function(template, "")
+        namespace = {"_now": current_timestamp}
+        exec("\n\n".join(self.sources), namespace)
+        return namespace[entry]
+
+
+def load_template_generators(template_dir: Path = TEMPLATE_DIR) -> dict:
+    """Compile every template in template_dir into a generator, keyed by file stem.
+
+    Each template is read and compiled once; a new schema type only needs a
+    template file (plus a TEMPLATE_BINDINGS entry if its fields do not
+    follow the placeholder naming convention).
+    """
+    generators = {}
+    for path in sorted(template_dir.glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+        generators[path.stem] = TemplateCompiler(TEMPLATE_BINDINGS.get(path.stem, {})).compile(template)
+    return generators
+
+
+SCHEMA_GENERATORS = load_template_generators()
 
 
 def get_faqpage_schema(data: dict) -> dict:
     """Generate FAQPage schema from Q&A pairs."""
-    questions = data.get("questions", [])
-    return {
-        "@context": "https://schema.org",
-        "@type": "FAQPage",
-        "mainEntity": [
-            {
-                "@type": "Question",
-                "name": q.get("question", ""),
-                "acceptedAnswer": {
-                    "@type": "Answer",
-                    "text": q.get("answer", "")
-                }
-            }
-            for q in questions
-        ]
-    }
+    return SCHEMA_GENERATORS["faqpage"](data)
 
 
 def get_article_schema(data: dict) -> dict:
     """Generate Article schema with EnvokeAI 8 priority fields."""
-    return {
-        "@context": "https://schema.org",
-        "@type": data.get("articleType", "Article"),
-        "headline": data.get("headline", ""),
-        "name": data.get("name", data.get("headline", "")),
-        "description": data.get("description", ""),
-        "url": data.get("url", ""),
-        "image": data.get("image", ""),
-        "datePublished": data.get("datePublished", datetime.now().isoformat()),
-        "dateModified": data.get("dateModified", datetime.now().isoformat()),
-        "author": {
-            "@type": data.get("authorType", "Person"),
-            "name": data.get("authorName", ""),
-            "url": data.get("authorUrl", "")
-        },
-        "publisher": {
-            "@type": "Organization",
-            "name": data.get("publisherName", ""),
-            "logo": {
-                "@type": "ImageObject",
-                "url": data.get("publisherLogo", "")
-            }
-        },
-        "mainEntityOfPage": {
-            "@type": "WebPage",
-            "@id": data.get("url", "")
-        }
-    }
+    return SCHEMA_GENERATORS["article"](data)
 
 
 def get_organization_schema(data: dict) -> dict:
     """Generate Organization schema for brand entity."""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": data.get("orgType", "Organization"),
-        "name": data.get("name", ""),
-        "description": data.get("description", ""),
-        "url": data.get("url", ""),
-        "logo": data.get("logo", ""),
-        "image": data.get("image", data.get("logo", "")),
-        "sameAs": data.get("sameAs", []),
-        "contactPoint": {
-            "@type": "ContactPoint",
-            "telephone": data.get("telephone", ""),
-            "contactType": data.get("contactType", "customer service"),
-            "email": data.get("email", "")
-        }
-    }
-    if data.get("founders"):
-        schema["founder"] = [
-            {"@type": "Person", "name": f} for f in data["founders"]
-        ]
-    if data.get("address"):
-        schema["address"] = {
-            "@type": "PostalAddress",
-            **data["address"]
-        }
-    return schema
+    return SCHEMA_GENERATORS["organization"](data)
 
 
 def get_product_schema(data: dict) -> dict:
     """Generate Product schema for e-commerce."""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "Product",
-        "name": data.get("name", ""),
-        "description": data.get("description", ""),
-        "image": data.get("image", ""),
-        "url": data.get("url", ""),
-        "sku": data.get("sku", ""),
-        "brand": {
-            "@type": "Brand",
-            "name": data.get("brandName", "")
-        },
-        "offers": {
-            "@type": "Offer",
-            "price": data.get("price", ""),
-            "priceCurrency": data.get("currency", "AUD"),
-            "availability": data.get("availability", "https://schema.org/InStock"),
-            "url": data.get("url", "")
-        }
-    }
-    if data.get("aggregateRating"):
-        schema["aggregateRating"] = {
-            "@type": "AggregateRating",
-            "ratingValue": data["aggregateRating"].get("ratingValue", ""),
-            "reviewCount": data["aggregateRating"].get("reviewCount", "")
-        }
-    return schema
-
-
-SCHEMA_GENERATORS = {
-    "faqpage": get_faqpage_schema,
-    "article": get_article_schema,
-    "organization": get_organization_schema,
-    "product": get_product_schema
-}
+    return SCHEMA_GENERATORS["product"](data)
 
 
 def interactive_faqpage() -> dict:
@@ -200,6 +299,297 @@ def interactive_product() -> dict:
     }
 
 
+BULK_BATCH_SIZE = 10000
+# CSV columns that hold several values separated by "|"
+CSV_LIST_FIELDS = {"sameAs", "founders"}
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+MANIFEST_VERSION = 1
+
+
+def output_filename(record_id: str) -> str:
+    return UNSAFE_FILENAME_CHARS.sub("_", record_id) + ".json"
+
+
+def content_hash(value) -> str:
+    """Stable hash of JSON-serialisable data (key order does not matter)."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def generator_fingerprint(schema_type: Optional[str], type_field: Optional[str]) -> str:
+    """Hash of everything besides the record that affects output.
+
+    A change to a template, the bindings or the type options invalidates
+    every manifest entry so all records are regenerated once.
+    """
+    templates = {path.name: path.read_text(encoding='utf-8') for path in sorted(TEMPLATE_DIR.glob("*.json"))}
+    return content_hash([MANIFEST_VERSION, templates, TEMPLATE_BINDINGS, schema_type, type_field])
+
+
+def manifest_path_for(output_dir: str) -> str:
+    """Manifest lives next to the output directory, not inside it."""
+    return os.path.normpath(output_dir) + ".manifest.json"
+
+
+def previous_published(output_dir: str, entry: dict) -> Optional[str]:
+    """datePublished given to a record on an earlier run, from its manifest
+    entry or, for manifests that predate it, from the record's output file."""
+    if entry.get("published"):
+        return entry["published"]
+    try:
+        with open(os.path.join(output_dir, entry["file"]), 'r', encoding='utf-8') as f:
+            value = json.load(f).get("datePublished")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return value if isinstance(value, str) else None
+
+
+def load_schema_manifest(path: str, fingerprint: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("fingerprint") != fingerprint:
+        return {}
+    return data.get("records", {})
+
+
+def save_schema_manifest(path: str, fingerprint: str, records: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        json_output.dump({"fingerprint": fingerprint, "records": records}, f, compact=True)
+    os.replace(tmp_path, path)
+
+
+def csv_row_to_record(row: dict) -> dict:
+    """Turn a flat CSV row into a record; dotted columns become nested objects.
+
+    Empty cells are dropped so generator defaults still apply, e.g. a
+    column "aggregateRating.ratingValue" fills data["aggregateRating"].
+    """
+    record = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        if column in CSV_LIST_FIELDS:
+            value = [item.strip() for item in value.split("|") if item.strip()]
+        target = record
+        *parents, key = column.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return record
+
+
+class RecordError(ValueError):
+    """Stands in for an input line that is not a usable record.
+
+    iter_records yields it rather than raising, so a malformed line fails
+    only its own record instead of ending the run with partial output.
+    """
+
+
+def iter_records(path: str, input_format: Optional[str] = None):
+    """Stream records from a JSON Lines or CSV file without loading it whole.
+
+    JSON Lines that do not parse, or hold something other than an object,
+    are yielded as RecordError.
+    """
+    if input_format is None:
+        input_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if input_format == "csv":
+            for row in csv.DictReader(f):
+                yield csv_row_to_record(row)
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield RecordError(f"line {line_number}: invalid JSON ({getattr(e, 'msg', e)})")
+                    continue
+                if not isinstance(record, dict):
+                    yield RecordError(f"line {line_number}: expected a JSON object, got {type(record).__name__}")
+                    continue
+                yield record
+
+
+def record_type_for(record: dict, schema_type: Optional[str], type_field: Optional[str]) -> Optional[str]:
+    """The record's type_field value (lower-cased), else schema_type."""
+    record_type = str(record.get(type_field, "")).lower() if type_field else ""
+    return record_type or schema_type
+
+
+def record_id_for(number: int, record, id_field: Optional[str]) -> str:
+    """The record's id_field value, or its position in the input if it has none."""
+    value = record.get(id_field, "") if id_field and isinstance(record, dict) else ""
+    return str(value) or str(number)
+
+
+def generate_record(item: tuple, schema_type: Optional[str] = None,
+                    type_field: Optional[str] = None, id_field: Optional[str] = None) -> tuple:
+    """Generate minified JSON-LD for one record (runs in a worker process).
+
+    Returns (record number, record id, JSON string or None, error or None);
+    the record id is None for a line that could not be read as a record.
+    """
+    number, record = item
+    if isinstance(record, RecordError):
+        return number, None, None, str(record)
+    record_id = record_id_for(number, record, id_field)
+    record_type = record_type_for(record, schema_type, type_field)
+
+    generator = SCHEMA_GENERATORS.get(record_type)
+    if generator is None:
+        return number, record_id, None, f"unknown schema type {record_type!r}"
+    try:
+        schema = generator(record)
+    except (AttributeError, TypeError, ValueError) as e:
+        return number, record_id, None, str(e)
+    return number, record_id, json_output.dumps(schema, compact=True), None
+
+
+def generate_bulk(records, schema_type: Optional[str] = None, type_field: Optional[str] = None,
+                  output: Optional[str] = None, output_dir: Optional[str] = None,
+                  id_field: Optional[str] = None, workers: Optional[int] = None,
+                  incremental: bool = False) -> dict:
+    """Generate schema for a stream of records across a worker pool.
+
+    Records are handed to the pool in fixed-size batches, so memory stays
+    constant however large the input is. Output is either one minified
+    JSON-LD document per line (to output, or stdout) or one file per
+    record in output_dir.
+
+    With incremental (output_dir only), each record's content hash is
+    compared with the manifest next to output_dir: unchanged records are
+    not regenerated, files whose bytes would not change are not rewritten,
+    and files for records no longer in the input are removed. A changed
+    record without datePublished keeps the date it was first published
+    with (kept in the manifest), so only dateModified takes the new
+    default timestamp.
+
+    Records are counted as failed, and not written, when they cannot be
+    read or generated, or when their id maps to a file another record has
+    already written in this run (a repeated id, or ids such as "a/b" and
+    "a_b" that sanitise to the same name).
+    """
+    worker = partial(generate_record, schema_type=schema_type, type_field=type_field, id_field=id_field)
+    numbered = enumerate(records, 1)
+    stats = {"written": 0, "failed": 0}
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        claimed = {}  # output file -> number of the record writing it this run
+
+        def unique_files(source):
+            for number, record in source:
+                if isinstance(record, RecordError):
+                    yield number, record  # writes nothing, so claims no file
+                    continue
+                record_id = record_id_for(number, record, id_field)
+                filename = output_filename(record_id)
+                owner = claimed.setdefault(filename, number)
+                if owner != number:
+                    stats["failed"] += 1
+                    print(f"Record {number} ({record_id}): {filename} is already used by record {owner}; "
+                          "ids must be unique", file=sys.stderr)
+                    continue
+                yield number, record
+
+        numbered = unique_files(numbered)
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+
+    manifest_path = manifest_path_for(output_dir) if incremental and output_dir else None
+    if manifest_path:
+        fingerprint = generator_fingerprint(schema_type, type_field)
+        previous = load_schema_manifest(manifest_path, fingerprint)
+        current = {}
+        stats.update(unchanged=0, identical=0, removed=0)
+        dated_types = {name for name, bindings in TEMPLATE_BINDINGS.items() if "datePublished" in bindings}
+
+        def changed_records(source):
+            for number, record in source:
+                if isinstance(record, RecordError):
+                    yield number, record
+                    continue
+                record_id = record_id_for(number, record, id_field)
+                digest = content_hash(record)
+                entry = previous.get(record_id)
+                if (entry and entry["input"] == digest
+                        and os.path.exists(os.path.join(output_dir, entry["file"]))):
+                    current[record_id] = entry
+                    stats["unchanged"] += 1
+                    continue
+                current[record_id] = {"input": digest, "file": output_filename(record_id)}
+                if (not record.get("datePublished")
+                        and record_type_for(record, schema_type, type_field) in dated_types):
+                    published = (entry and previous_published(output_dir, entry)) or current_timestamp()
+                    current[record_id]["published"] = published
+                    record = {**record, "datePublished": published}
+                yield number, record
+
+        numbered = changed_records(numbered)
+
+    workers = workers or os.cpu_count() or 1
+    pool = Pool(workers, initializer=set_default_timestamp, initargs=(DEFAULT_TIMESTAMP,)) if workers > 1 else None
+    try:
+        while True:
+            batch = list(islice(numbered, BULK_BATCH_SIZE))
+            if not batch:
+                break
+            if pool is not None:
+                results = pool.imap(worker, batch, chunksize=max(1, len(batch) // (workers * 4)))
+            else:
+                results = map(worker, batch)
+
+            for number, record_id, document, error in results:
+                if error:
+                    stats["failed"] += 1
+                    label = f"Record {number} ({record_id})" if record_id is not None else f"Record {number}"
+                    print(f"{label}: {error}", file=sys.stderr)
+                    if manifest_path:
+                        current.pop(record_id, None)  # retry on the next run
+                elif output_dir:
+                    filename = output_filename(record_id)
+                    if manifest_path:
+                        output_digest = content_hash(document)
+                        entry = previous.get(record_id)
+                        current[record_id]["output"] = output_digest
+                        if (entry and entry.get("output") == output_digest and entry["file"] == filename
+                                and os.path.exists(os.path.join(output_dir, filename))):
+                            stats["identical"] += 1
+                            continue
+                    with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+                        f.write(document)
+                    stats["written"] += 1
+                else:
+                    out.write(document + "\n")
+                    stats["written"] += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if output:
+            out.close()
+
+    if manifest_path:
+        live_files = {entry["file"] for entry in current.values()}
+        for record_id, entry in previous.items():
+            if record_id not in current and entry["file"] not in live_files:
+                try:
+                    os.remove(os.path.join(output_dir, entry["file"]))
+                    stats["removed"] += 1
+                except FileNotFoundError:
+                    pass
+        save_schema_manifest(manifest_path, fingerprint, current)
+
+    return stats
+
+
 INTERACTIVE_COLLECTORS = {
     "faqpage": interactive_faqpage,
     "article": interactive_article,
@@ -217,13 +607,21 @@ Examples:
   python generate_schema.py --type faqpage --interactive
   python generate_schema.py --type article --input article_data.json
   python generate_schema.py --type organization --input org.json --output schema.json
+  python generate_schema.py --type product --bulk catalogue.csv --output products.jsonl
+  python generate_schema.py --type-field type --bulk records.jsonl --output-dir ./schema/ --id-field url
+  python generate_schema.py --type product --bulk feed.jsonl --output-dir ./schema/ --id-field sku --incremental
+
+Bulk mode:
+  --bulk reads JSON Lines (one record per line) or CSV (dotted column names
+  such as aggregateRating.ratingValue become nested fields; sameAs and
+  founders split on "|"). Each record becomes one minified JSON-LD line,
+  or one file per record with --output-dir.
         """
     )
     parser.add_argument(
         "--type", "-t",
-        required=True,
-        choices=["faqpage", "article", "organization", "product"],
-        help="Schema type to generate"
+        choices=sorted(SCHEMA_GENERATORS),
+        help="Schema type to generate (in bulk mode, the default when --type-field is empty)"
     )
     parser.add_argument(
         "--input", "-i",
@@ -243,11 +641,92 @@ Examples:
         action="store_true",
         help="Output minified JSON"
     )
+    parser.add_argument(
+        "--bulk",
+        metavar="FILE",
+        help="JSON Lines or CSV file with one record per line/row"
+    )
+    parser.add_argument(
+        "--bulk-format",
+        choices=["jsonl", "csv"],
+        help="Bulk input format (default: from file extension)"
+    )
+    parser.add_argument(
+        "--type-field",
+        help="Record field that names the schema type per record (bulk mode)"
+    )
+    parser.add_argument(
+        "--id-field",
+        help="Record field used to name output files with --output-dir (default: record number)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Write one JSON-LD file per record to this directory (bulk mode)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --output-dir, only regenerate records whose content changed (manifest kept next to the directory)"
+    )
+    parser.add_argument(
+        "--timestamp",
+        help="Fixed value for missing datePublished/dateModified, for byte-stable output "
+             "(default with --incremental: the input file's modification time)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Worker processes for bulk mode (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
+    if args.timestamp:
+        set_default_timestamp(args.timestamp)
+
+    if args.bulk:
+        if not args.type and not args.type_field:
+            print("Error: Bulk mode needs --type or --type-field", file=sys.stderr)
+            sys.exit(1)
+        if args.incremental:
+            if not args.output_dir:
+                print("Error: --incremental needs --output-dir", file=sys.stderr)
+                sys.exit(1)
+            if not args.id_field:
+                print("Warning: without --id-field, records are keyed by position; "
+                      "inserting a record marks every later one as changed", file=sys.stderr)
+            if not args.timestamp and os.path.exists(args.bulk):
+                set_default_timestamp(datetime.fromtimestamp(os.path.getmtime(args.bulk)).isoformat(timespec="seconds"))
+        try:
+            stats = generate_bulk(
+                iter_records(args.bulk, args.bulk_format),
+                schema_type=args.type,
+                type_field=args.type_field,
+                output=args.output,
+                output_dir=args.output_dir,
+                id_field=args.id_field,
+                workers=args.workers,
+                incremental=args.incremental
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error reading {args.bulk}: {e}", file=sys.stderr)
+            sys.exit(1)
+        summary = f"Generated {stats['written']} schema documents ({stats['failed']} failed"
+        if args.incremental:
+            summary += (f", {stats['unchanged']} unchanged, {stats['identical']} regenerated identically, "
+                        f"{stats['removed']} removed")
+        print(summary + ")", file=sys.stderr)
+        sys.exit(1 if stats["failed"] else 0)
+
+    if not args.type:
+        print("Error: --type is required", file=sys.stderr)
+        sys.exit(1)
+
     # Get input data
     if args.interactive:
+        if args.type not in INTERACTIVE_COLLECTORS:
+            print(f"Error: No interactive mode for {args.type}; use --input", file=sys.stderr)
+            sys.exit(1)
         data = INTERACTIVE_COLLECTORS[args.type]()
     elif args.input:
         with open(args.input, 'r') as f:
@@ -260,15 +739,12 @@ Examples:
     schema = SCHEMA_GENERATORS[args.type](data)
 
     # Output
-    indent = None if args.minify else 2
-    output = json.dumps(schema, indent=indent, ensure_ascii=False)
-
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(output)
+        with open(args.output, 'wb') as f:
+            f.write(json_output.dumpb(schema, compact=args.minify))
         print(f"Schema written to {args.output}")
     else:
-        print(output)
+        json_output.dump(schema, compact=args.minify)
 
 
 if __name__ == "__main__":
@@ -6,27 +6,46 @@ Usage:
     python validate_content.py --file page.html
     python validate_content.py --url https://example.com/page
     python validate_content.py --file page.html --json
+    python validate_content.py --file page.html --readability-detail
+    python validate_content.py --dir ./public --manifest .content-manifest.json
 
 Checks:
 - Single H1 tag with primary keyword/entity
 - Proper H1-H6 hierarchy
 - Semantic HTML5 elements
-- Schema markup presence
+- Schema markup presence and JSON-LD required fields
 - Answer-first structure
 - Readability score (target Grade 8)
 - Scannable formatting
 """
 
 import argparse
+import hashlib
+import heapq
 import json
+import math
+import os
+import random
 import re
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache, partial
+from pathlib import Path
 from typing import Optional
 from html.parser import HTMLParser
+from xml.etree import ElementTree
+from urllib.parse import unquote, urljoin, urlsplit
 from urllib.request import urlopen
 from urllib.error import URLError
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch scoring falls back to pure Python
+    np = None
+
+import json_output
+
 
 @dataclass
 class ValidationResult:
@@ -42,6 +61,7 @@ class ContentReport:
     """Full validation report."""
     overall_score: int = 0
     results: list = field(default_factory=list)
+    readability: Optional[dict] = None
 
     def add(self, category: str, result: ValidationResult):
         self.results.append({"category": category, **result.__dict__})
@@ -57,6 +77,27 @@ class ContentReport:
         self.overall_score = max(0, int((passed / total) * 100) - (errors * 10))
         return self.overall_score
 
+    def has_errors(self) -> bool:
+        """Return True if any error-severity check failed."""
+        return any(r["severity"] == "error" and not r["passed"] for r in self.results)
+
+    def to_dict(self) -> dict:
+        output = {
+            "overall_score": self.overall_score,
+            "results": self.results
+        }
+        if self.readability is not None:
+            output["readability"] = self.readability
+        return output
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContentReport":
+        return cls(
+            overall_score=data.get("overall_score", 0),
+            results=data.get("results", []),
+            readability=data.get("readability")
+        )
+
 
 class HTMLContentParser(HTMLParser):
     """Parse HTML to extract structure and content."""
@@ -67,16 +108,23 @@ class HTMLContentParser(HTMLParser):
         self.current_heading = None
         self.heading_text = ""
         self.paragraphs = []
+        self.paragraph_sections = []  # index into headings for each paragraph (-1 before first heading)
         self.current_paragraph = ""
         self.in_paragraph = False
         self.lists = {"ul": 0, "ol": 0}
         self.semantic_elements = {"article": 0, "section": 0, "aside": 0, "nav": 0, "header": 0, "footer": 0}
         self.bold_count = 0
         self.link_texts = []
+        self.link_hrefs = []
         self.current_link_text = ""
+        self.title = ""
+        self.in_title = False
         self.in_link = False
         self.has_schema = False
         self.schema_types = []
+        self.schema_blocks = []  # raw JSON-LD payloads, parsed lazily by validate_schema
+        self.in_schema = False
+        self.current_schema = ""
         self.images_without_alt = 0
         self.images_with_alt = 0
         self.h1_count = 0
@@ -112,6 +160,12 @@ class HTMLContentParser(HTMLParser):
         if tag == 'a':
             self.in_link = True
             self.current_link_text = ""
+            if attrs_dict.get('href'):
+                self.link_hrefs.append(attrs_dict['href'])
+
+        # Check page title
+        if tag == 'title':
+            self.in_title = True
 
         # Check images
         if tag == 'img':
@@ -121,8 +175,10 @@ class HTMLContentParser(HTMLParser):
                 self.images_without_alt += 1
 
         # Check for Schema markup
-        if tag == 'script' and attrs_dict.get('type') == 'application/ld+json':
+        if tag == 'script' and (attrs_dict.get('type') or '').strip().lower() == 'application/ld+json':
             self.has_schema = True
+            self.in_schema = True
+            self.current_schema = ""
 
     def handle_endtag(self, tag):
         if tag == self.current_heading:
@@ -132,6 +188,7 @@ class HTMLContentParser(HTMLParser):
         if tag == 'p':
             if self.current_paragraph.strip():
                 self.paragraphs.append(self.current_paragraph.strip())
+                self.paragraph_sections.append(len(self.headings) - 1)
             self.in_paragraph = False
 
         if tag == 'a':
@@ -139,6 +196,13 @@ class HTMLContentParser(HTMLParser):
                 self.link_texts.append(self.current_link_text.strip())
             self.in_link = False
 
+        if tag == 'title':
+            self.in_title = False
+
+        if tag == 'script' and self.in_schema:
+            self.schema_blocks.append(self.current_schema)
+            self.in_schema = False
+
     def handle_data(self, data):
         if self.current_heading:
             self.heading_text += data
@@ -146,21 +210,221 @@ class HTMLContentParser(HTMLParser):
             self.current_paragraph += data
         if self.in_link:
             self.current_link_text += data
+        if self.in_title:
+            self.title += data
+        if self.in_schema:
+            self.current_schema += data
 
 
-def calculate_readability(text: str) -> float:
-    """Calculate Flesch-Kincaid Grade Level."""
-    # Simple implementation
-    sentences = len(re.findall(r'[.!?]+', text)) or 1
-    words = len(text.split())
-    syllables = sum(count_syllables(word) for word in text.split())
+SENTENCE_PATTERN = re.compile(r'[.!?]+')
+VOWEL_GROUP_PATTERN = re.compile(r'[aeiouy]+')
+SYLLABLE_CACHE_SIZE = 65536
+
+
+@dataclass
+class TextCounts:
+    """Raw counts that every readability formula is derived from.
+
+    Counts are additive, so per-paragraph counts can be summed into
+    section and page totals without re-tokenising the text.
+    """
+    sentences: int = 0
+    words: int = 0
+    syllables: int = 0
+    polysyllables: int = 0  # words with 3+ syllables (Gunning Fog, SMOG)
+    letters: int = 0  # alphanumeric characters (Coleman-Liau, ARI)
+
+    def __add__(self, other: "TextCounts") -> "TextCounts":
+        return TextCounts(
+            sentences=self.sentences + other.sentences,
+            words=self.words + other.words,
+            syllables=self.syllables + other.syllables,
+            polysyllables=self.polysyllables + other.polysyllables,
+            letters=self.letters + other.letters
+        )
+
+
+@dataclass
+class ReadabilityScores:
+    """Readability metrics computed from a single set of counts."""
+    flesch_kincaid_grade: float = 0
+    flesch_reading_ease: float = 0
+    gunning_fog: float = 0
+    smog_index: float = 0
+    coleman_liau_index: float = 0
+    automated_readability_index: float = 0
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def token_stats(token: str) -> tuple:
+    """Return (syllables, letters) for a whitespace-delimited token (memoised)."""
+    return count_syllables(token), sum(1 for c in token if c.isalnum())
+
+
+def count_text(text: str) -> TextCounts:
+    """Count sentences, words, syllables and letters in one tokenisation pass."""
+    tokens = text.split()
+    syllables = polysyllables = letters = 0
+    for token in tokens:
+        token_syllables, token_letters = token_stats(token)
+        syllables += token_syllables
+        letters += token_letters
+        if token_syllables >= 3:
+            polysyllables += 1
+
+    return TextCounts(
+        sentences=len(SENTENCE_PATTERN.findall(text)),
+        words=len(tokens),
+        syllables=syllables,
+        polysyllables=polysyllables,
+        letters=letters
+    )
+
+
+def scores_from_counts(counts: TextCounts) -> ReadabilityScores:
+    """Derive all readability metrics from precomputed counts."""
+    if counts.words == 0:
+        return ReadabilityScores()
+
+    sentences = counts.sentences or 1
+    words_per_sentence = counts.words / sentences
+    syllables_per_word = counts.syllables / counts.words
+    letters_per_word = counts.letters / counts.words
+
+    return ReadabilityScores(
+        flesch_kincaid_grade=max(0, round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1)),
+        flesch_reading_ease=round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 1),
+        gunning_fog=max(0, round(0.4 * (words_per_sentence + 100 * counts.polysyllables / counts.words), 1)),
+        smog_index=max(0, round(1.043 * math.sqrt(counts.polysyllables * 30 / sentences) + 3.1291, 1)),
+        coleman_liau_index=max(0, round(5.88 * letters_per_word - 29.6 / words_per_sentence - 15.8, 1)),
+        automated_readability_index=max(0, round(4.71 * letters_per_word + 0.5 * words_per_sentence - 21.43, 1))
+    )
+
+
+def readability_scores(text: str) -> ReadabilityScores:
+    """Calculate all readability metrics for a block of text."""
+    return scores_from_counts(count_text(text))
 
-    if words == 0:
-        return 0
 
-    # Flesch-Kincaid Grade Level
-    grade = 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
-    return max(0, round(grade, 1))
+def score_documents(texts) -> list:
+    """Score many documents at once.
+
+    Counting runs once per document with the shared syllable cache; the
+    formulas are then evaluated column-wise with NumPy when it is installed.
+    """
+    counts = [count_text(text) for text in texts]
+    if np is None or not counts:
+        return [scores_from_counts(c) for c in counts]
+
+    table = np.array(
+        [(c.sentences or 1, c.words, c.syllables, c.polysyllables, c.letters) for c in counts],
+        dtype=float
+    )
+    sentences, words, syllables, polysyllables, letters = table.T
+    empty = words == 0
+    words = np.where(empty, 1, words)
+
+    words_per_sentence = words / sentences
+    syllables_per_word = syllables / words
+    letters_per_word = letters / words
+
+    columns = [
+        np.maximum(0, 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59),
+        206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word,
+        np.maximum(0, 0.4 * (words_per_sentence + 100 * polysyllables / words)),
+        np.maximum(0, 1.043 * np.sqrt(polysyllables * 30 / sentences) + 3.1291),
+        np.maximum(0, 5.88 * letters_per_word - 29.6 / words_per_sentence - 15.8),
+        np.maximum(0, 4.71 * letters_per_word + 0.5 * words_per_sentence - 21.43),
+    ]
+    rows = np.where(empty[:, None], 0, np.round(np.column_stack(columns), 1))
+    return [ReadabilityScores(*(float(v) for v in row)) for row in rows]
+
+
+READABILITY_BUCKETS = (("Grade 0-8", 8), ("Grade 9-12", 12), ("Grade 13+", float("inf")))
+WORST_PARAGRAPH_COUNT = 5
+
+
+@dataclass
+class ReadabilityBreakdown:
+    """Page, section and paragraph readability built from one set of counts."""
+    page: ReadabilityScores
+    page_counts: TextCounts
+    paragraphs: list = field(default_factory=list)
+    sections: list = field(default_factory=list)
+    distribution: dict = field(default_factory=dict)
+
+    def worst_paragraphs(self, limit: int = WORST_PARAGRAPH_COUNT) -> list:
+        """Return the paragraphs with the highest grade level."""
+        return heapq.nlargest(limit, self.paragraphs, key=lambda p: p["grade"])
+
+    def to_dict(self) -> dict:
+        return {
+            "page": asdict(self.page),
+            "distribution": self.distribution,
+            "worst_paragraphs": self.worst_paragraphs(),
+            "sections": self.sections,
+            "paragraphs": self.paragraphs
+        }
+
+
+def readability_breakdown(paragraphs: list, paragraph_sections: Optional[list] = None,
+                          headings: Optional[list] = None) -> ReadabilityBreakdown:
+    """Score every paragraph and heading section in a single pass.
+
+    Each paragraph is counted once; section and page totals are running
+    sums of those counts, so the page score needs no second pass.
+    """
+    headings = headings or []
+    if paragraph_sections is None:
+        paragraph_sections = [-1] * len(paragraphs)
+
+    page_counts = TextCounts()
+    section_counts = {}
+    paragraph_rows = []
+    distribution = {label: 0 for label, _ in READABILITY_BUCKETS}
+
+    for index, (text, section) in enumerate(zip(paragraphs, paragraph_sections)):
+        counts = count_text(text)
+        page_counts = page_counts + counts
+        section_counts[section] = section_counts.get(section, TextCounts()) + counts
+        grade = scores_from_counts(counts).flesch_kincaid_grade
+
+        for label, upper in READABILITY_BUCKETS:
+            if grade <= upper:
+                distribution[label] += 1
+                break
+
+        paragraph_rows.append({
+            "index": index,
+            "section": headings[section][1] if section >= 0 else None,
+            "words": counts.words,
+            "grade": grade,
+            "preview": text[:80]
+        })
+
+    section_rows = []
+    for section, counts in section_counts.items():
+        scores = scores_from_counts(counts)
+        section_rows.append({
+            "heading": headings[section][1] if section >= 0 else None,
+            "level": headings[section][0] if section >= 0 else None,
+            "words": counts.words,
+            "grade": scores.flesch_kincaid_grade,
+            "reading_ease": scores.flesch_reading_ease
+        })
+
+    return ReadabilityBreakdown(
+        page=scores_from_counts(page_counts),
+        page_counts=page_counts,
+        paragraphs=paragraph_rows,
+        sections=section_rows,
+        distribution=distribution
+    )
+
+
+def calculate_readability(text: str) -> float:
+    """Calculate Flesch-Kincaid Grade Level."""
+    return readability_scores(text).flesch_kincaid_grade
 
 
 def count_syllables(word: str) -> int:
@@ -170,14 +434,7 @@ def count_syllables(word: str) -> int:
         return 1
 
     vowels = "aeiouy"
-    count = 0
-    prev_is_vowel = False
-
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not prev_is_vowel:
-            count += 1
-        prev_is_vowel = is_vowel
+    count = len(VOWEL_GROUP_PATTERN.findall(word))
 
     # Adjust for silent e
     if word.endswith('e'):
@@ -260,8 +517,115 @@ def validate_semantic_html(parser: HTMLContentParser) -> ValidationResult:
     )
 
 
+SCHEMA_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "assets" / "schema-templates"
+# Subtypes validated against their parent type's template
+SCHEMA_TYPE_ALIASES = {
+    "BlogPosting": "Article",
+    "NewsArticle": "Article",
+    "LocalBusiness": "Organization",
+    "Corporation": "Organization"
+}
+
+# Fields a page's JSON-LD must fill, per template type. The templates hold
+# example output, so everything else in them is optional. Dotted paths reach
+# into nested objects, and into every item when the value is a list.
+REQUIRED_SCHEMA_FIELDS = {
+    "Article": ("headline", "image", "datePublished", "author.name"),
+    "FAQPage": ("mainEntity.name", "mainEntity.acceptedAnswer.text"),
+    "Organization": ("name", "url"),
+    "Product": ("name", "offers.price", "offers.priceCurrency")
+}
+PLACEHOLDER_PATTERN = re.compile(r'\{\{[A-Z0-9_]+\}\}')
+
+
+@lru_cache(maxsize=1)
+def load_schema_templates() -> dict:
+    """Load the JSON-LD templates once, keyed by their @type."""
+    templates = {}
+    for path in sorted(SCHEMA_TEMPLATE_DIR.glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+        templates[template["@type"]] = template
+    return templates
+
+
+def is_empty(value) -> bool:
+    return value in (None, "", [], {})
+
+
+def check_required_field(node: dict, keys: tuple, path: str, problems: list):
+    """Report keys[0] missing from node, then check the rest of the path below it."""
+    key = keys[0]
+    field_path = f"{path}.{key}" if path else key
+    value = node.get(key)
+    if is_empty(value):
+        problems.append(f"missing {field_path}")
+        return
+    if len(keys) == 1:
+        return
+    items = value if isinstance(value, list) else [value]
+    for item in items:
+        if isinstance(item, dict):
+            check_required_field(item, keys[1:], field_path, problems)
+        else:
+            problems.append(f"missing {field_path}.{'.'.join(keys[1:])}")
+            return
+
+
+def find_placeholders(value, path: str, problems: list):
+    """Report every string in a JSON-LD value that still holds a {{PLACEHOLDER}}."""
+    if isinstance(value, str):
+        if PLACEHOLDER_PATTERN.search(value):
+            problems.append(f"unfilled placeholder in {path}")
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            find_placeholders(item, f"{path}.{key}" if path else key, problems)
+    elif isinstance(value, list):
+        for item in value:
+            find_placeholders(item, path, problems)
+
+
+@lru_cache(maxsize=None)
+def compiled_schema_validator(schema_type: str):
+    """Return a validator for a schema type, compiled once per process.
+
+    Returns None for types without a template. Only REQUIRED_SCHEMA_FIELDS
+    are required; placeholders left from a template are reported wherever
+    they appear.
+    """
+    template_type = SCHEMA_TYPE_ALIASES.get(schema_type, schema_type)
+    if template_type not in load_schema_templates():
+        return None
+    required = [tuple(path.split(".")) for path in REQUIRED_SCHEMA_FIELDS.get(template_type, ())]
+
+    def validate(node: dict) -> list:
+        problems = []
+        for keys in required:
+            check_required_field(node, keys, "", problems)
+        find_placeholders(node, "", problems)
+        return list(dict.fromkeys(problems))
+
+    return validate
+
+
+def iter_schema_nodes(payload):
+    """Yield top-level JSON-LD nodes, unwrapping lists and @graph containers."""
+    if isinstance(payload, list):
+        for item in payload:
+            yield from iter_schema_nodes(item)
+    elif isinstance(payload, dict):
+        if "@graph" in payload and isinstance(payload["@graph"], list):
+            yield from iter_schema_nodes(payload["@graph"])
+        else:
+            yield payload
+
+
 def validate_schema(parser: HTMLContentParser) -> ValidationResult:
-    """Check for Schema markup."""
+    """Check for Schema markup and validate JSON-LD against the templates.
+
+    The captured payloads are only parsed here, so pages validated with the
+    schema rule skipped never pay for JSON decoding.
+    """
     if not parser.has_schema:
         return ValidationResult(
             passed=False,
@@ -269,13 +633,42 @@ def validate_schema(parser: HTMLContentParser) -> ValidationResult:
             severity="warning",
             recommendation="Add FAQPage, Article, or Organization schema for AI visibility"
         )
+
+    issues = []
+    for index, block in enumerate(parser.schema_blocks, 1):
+        try:
+            payload = json.loads(block)
+        except ValueError as e:
+            issues.append(f"block {index} is not valid JSON ({e.msg})")
+            continue
+
+        for node in iter_schema_nodes(payload):
+            types = node.get("@type")
+            for schema_type in types if isinstance(types, list) else [types]:
+                if not isinstance(schema_type, str):
+                    continue
+                parser.schema_types.append(schema_type)
+                validator = compiled_schema_validator(schema_type)
+                if validator is not None:
+                    problems = validator(node)
+                    if problems:
+                        issues.append(f"{schema_type}: {', '.join(problems)}")
+
+    types_found = ", ".join(dict.fromkeys(parser.schema_types)) or "no @type"
+    if issues:
+        return ValidationResult(
+            passed=False,
+            message=f"JSON-LD Schema issues ({types_found}): {'; '.join(issues)}",
+            severity="warning",
+            recommendation="Fill every required field; see assets/schema-templates/ or run generate_schema.py"
+        )
     return ValidationResult(
         passed=True,
-        message="JSON-LD Schema markup present"
+        message=f"JSON-LD Schema markup valid ({types_found})"
     )
 
 
-def validate_readability(paragraphs: list) -> ValidationResult:
+def validate_readability(paragraphs: list, breakdown: Optional[ReadabilityBreakdown] = None) -> ValidationResult:
     """Check readability score (target Grade 8)."""
     if not paragraphs:
         return ValidationResult(
@@ -283,27 +676,31 @@ def validate_readability(paragraphs: list) -> ValidationResult:
             message="No paragraph text to analyse"
         )
 
-    text = " ".join(paragraphs)
-    grade = calculate_readability(text)
+    if breakdown is not None:
+        scores = breakdown.page
+    else:
+        scores = readability_scores(" ".join(paragraphs))
+    grade = scores.flesch_kincaid_grade
+    ease = scores.flesch_reading_ease
 
     if grade > 12:
         return ValidationResult(
             passed=False,
-            message=f"Reading level too high: Grade {grade}",
+            message=f"Reading level too high: Grade {grade} (Flesch Reading Ease {ease})",
             severity="warning",
             recommendation="Simplify sentences for Grade 8 target. Use shorter sentences and simpler words."
         )
     elif grade > 8:
         return ValidationResult(
             passed=True,
-            message=f"Reading level acceptable: Grade {grade} (target: 8)",
+            message=f"Reading level acceptable: Grade {grade} (target: 8, Flesch Reading Ease {ease})",
             severity="info",
             recommendation="Consider simplifying for broader accessibility"
         )
 
     return ValidationResult(
         passed=True,
-        message=f"Reading level excellent: Grade {grade}"
+        message=f"Reading level excellent: Grade {grade} (Flesch Reading Ease {ease})"
     )
 
 
@@ -399,8 +796,21 @@ def validate_answer_first(headings: list, paragraphs: list) -> ValidationResult:
     )
 
 
-def validate_content(html: str) -> ContentReport:
-    """Run all validations on HTML content."""
+RULE_NAMES = ("h1", "headings", "semantic", "schema", "readability", "scannability", "links", "images", "answer-first")
+
+
+def validate_content(html: str, readability_detail: bool = False, skip_rules=()) -> ContentReport:
+    """Run all validations on HTML content.
+
+    With readability_detail, the report also carries per-paragraph and
+    per-section grade levels, the worst offenders and a grade distribution.
+    Rules named in skip_rules (see RULE_NAMES) are not run.
+    """
+    return analyse_content(html, readability_detail, skip_rules)[0]
+
+
+def analyse_content(html: str, readability_detail: bool = False, skip_rules=()) -> tuple:
+    """Validate HTML and also return the parser (None if parsing failed)."""
     report = ContentReport()
 
     # Parse HTML
@@ -413,31 +823,59 @@ def validate_content(html: str) -> ContentReport:
             message=f"HTML parsing error: {e}",
             severity="error"
         ))
-        return report
+        return report, None
 
     # Run validations
-    report.add("H1 Tag", validate_h1(parser))
-    report.add("Heading Hierarchy", validate_heading_hierarchy(parser.headings))
-    report.add("Semantic HTML", validate_semantic_html(parser))
-    report.add("Schema Markup", validate_schema(parser))
-    report.add("Readability", validate_readability(parser.paragraphs))
-    report.add("Scannability", validate_scannable(parser, parser.paragraphs))
-    report.add("Link Text", validate_link_text(parser))
-    report.add("Image Alt Text", validate_images(parser))
-    report.add("Answer-First", validate_answer_first(parser.headings, parser.paragraphs))
+    if "h1" not in skip_rules:
+        report.add("H1 Tag", validate_h1(parser))
+    if "headings" not in skip_rules:
+        report.add("Heading Hierarchy", validate_heading_hierarchy(parser.headings))
+    if "semantic" not in skip_rules:
+        report.add("Semantic HTML", validate_semantic_html(parser))
+    if "schema" not in skip_rules:
+        report.add("Schema Markup", validate_schema(parser))
+    if "readability" not in skip_rules:
+        breakdown = None
+        if readability_detail:
+            breakdown = readability_breakdown(parser.paragraphs, parser.paragraph_sections, parser.headings)
+            report.readability = breakdown.to_dict()
+        report.add("Readability", validate_readability(parser.paragraphs, breakdown))
+    if "scannability" not in skip_rules:
+        report.add("Scannability", validate_scannable(parser, parser.paragraphs))
+    if "links" not in skip_rules:
+        report.add("Link Text", validate_link_text(parser))
+    if "images" not in skip_rules:
+        report.add("Image Alt Text", validate_images(parser))
+    if "answer-first" not in skip_rules:
+        report.add("Answer-First", validate_answer_first(parser.headings, parser.paragraphs))
 
     report.calculate_score()
-    return report
+    return report, parser
 
 
-def format_report(report: ContentReport, as_json: bool = False) -> str:
-    """Format validation report for output."""
-    if as_json:
-        return json.dumps({
-            "overall_score": report.overall_score,
-            "results": report.results
-        }, indent=2)
+def format_readability_detail(detail: dict) -> list:
+    """Format the per-section readability breakdown as report lines."""
+    lines = ["READABILITY DETAIL:"]
+    distribution = ", ".join(f"{label}: {count}" for label, count in detail["distribution"].items())
+    lines.append(f"  Paragraphs by grade: {distribution}")
+
+    if detail["sections"]:
+        lines.append("  Sections:")
+        for section in detail["sections"]:
+            heading = section["heading"] or "(before first heading)"
+            lines.append(f"    Grade {section['grade']:>5}  {heading} ({section['words']} words)")
+
+    if detail["worst_paragraphs"]:
+        lines.append("  Hardest paragraphs:")
+        for para in detail["worst_paragraphs"]:
+            lines.append(f"    Grade {para['grade']:>5}  #{para['index'] + 1}: {para['preview']}")
+
+    lines.append("")
+    return lines
 
+
+def format_report(report: ContentReport) -> str:
+    """Format validation report for output."""
     lines = [
         "=" * 60,
         f"CONTENT VALIDATION REPORT",
@@ -473,10 +911,473 @@ def format_report(report: ContentReport, as_json: bool = False) -> str:
             lines.append(f"  [+] {r['category']}: {r['message']}")
         lines.append("")
 
+    if report.readability is not None:
+        lines.extend(format_readability_detail(report.readability))
+
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+MANIFEST_VERSION = 1
+HTML_EXTENSIONS = (".html", ".htm")
+
+
+@dataclass
+class SiteReport:
+    """Validation reports for every page in a build output directory."""
+    root: str
+    pages: dict = field(default_factory=dict)  # relative path -> ContentReport
+    validated: int = 0
+    cached: int = 0
+    audit: Optional[dict] = None
+
+    def failing_pages(self) -> list:
+        return sorted(path for path, report in self.pages.items() if report.has_errors())
+
+    def has_errors(self) -> bool:
+        """Return True if any page failed or the site audit found broken links."""
+        return bool(self.failing_pages()) or bool(self.audit and self.audit["broken_links"])
+
+    def summary(self) -> dict:
+        """Aggregate scores and failure counts across all pages."""
+        scores = [report.overall_score for report in self.pages.values()]
+        category_failures = {}
+        for report in self.pages.values():
+            for r in report.results:
+                if not r["passed"]:
+                    category_failures[r["category"]] = category_failures.get(r["category"], 0) + 1
+
+        lowest = heapq.nsmallest(10, self.pages.items(), key=lambda item: item[1].overall_score)
+        return {
+            "pages": len(self.pages),
+            "validated": self.validated,
+            "cached": self.cached,
+            "pages_with_errors": len(self.failing_pages()),
+            "average_score": round(sum(scores) / len(scores), 1) if scores else 0,
+            "category_failures": dict(sorted(category_failures.items(), key=lambda item: -item[1])),
+            "lowest_scores": [{"path": path, "score": report.overall_score} for path, report in lowest]
+        }
+
+    def to_dict(self) -> dict:
+        output = {
+            "root": self.root,
+            "summary": self.summary(),
+            "pages": {path: self.pages[path].to_dict() for path in sorted(self.pages)}
+        }
+        if self.audit is not None:
+            output["site_audit"] = self.audit
+        return output
+
+
+def find_site_files(root: str) -> list:
+    """List all files under root as '/'-separated relative paths, in a stable order."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            found.append(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"))
+    return sorted(found)
+
+
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.8
+MIN_PARAGRAPH_WORDS = 8  # shorter paragraphs are too generic to flag as boilerplate
+AUDIT_SAMPLE_PAGES = 5
+MERSENNE_PRIME = (1 << 61) - 1
+
+_minhash_rng = random.Random(20240501)
+MINHASH_COEFFICIENTS = [
+    (_minhash_rng.randrange(1, MERSENNE_PRIME), _minhash_rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def normalise_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different copies match."""
+    return " ".join(text.lower().split())
+
+
+def stable_hash(text: str) -> int:
+    """64-bit hash that is stable across processes and runs (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash_signature(words: list) -> list:
+    """MinHash signature of a page's word shingles (empty for very short pages)."""
+    if len(words) < SHINGLE_SIZE:
+        return []
+    shingles = {stable_hash(" ".join(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return [min((a * h + b) % MERSENNE_PRIME for h in shingles) for a, b in MINHASH_COEFFICIENTS]
+
+
+def page_features(parser: HTMLContentParser, rel_path: str) -> dict:
+    """Extract the compact, JSON-serialisable page data the site audit indexes.
+
+    Computed in the worker process and stored in the manifest, so unchanged
+    pages still feed the indexes without being parsed again.
+    """
+    page_url = "/" + rel_path
+    links = []
+    for href in parser.link_hrefs:
+        parts = urlsplit(href.strip())
+        if parts.scheme or parts.netloc or not parts.path:
+            continue  # external, mailto:, tel:, or same-page fragment
+        # Decoded so that /my%20page.html matches "my page.html" on disk
+        links.append(unquote(urljoin(page_url, parts.path)).lstrip("/"))
+
+    paragraphs = []
+    words = []
+    for text in parser.paragraphs:
+        normalised = normalise_text(text)
+        paragraph_words = normalised.split()
+        words.extend(paragraph_words)
+        if len(paragraph_words) >= MIN_PARAGRAPH_WORDS:
+            paragraphs.append([format(stable_hash(normalised), "016x"), text[:80]])
+
+    return {
+        "title": normalise_text(parser.title),
+        "h1": [normalise_text(text) for tag, text in parser.headings if tag == "h1"],
+        "paragraphs": paragraphs,
+        "minhash": minhash_signature(words),
+        "links": links
+    }
+
+
+class SiteAuditIndex:
+    """Hash indexes over page features, filled as pages stream through.
+
+    Every check is a dictionary lookup per page (titles, H1s, paragraph
+    hashes, MinHash LSH bands, link targets), so the audit stays roughly
+    linear in the number of pages instead of comparing pages pairwise.
+    """
+
+    def __init__(self):
+        self.titles = {}
+        self.h1s = {}
+        self.paragraphs = {}  # hash -> [page count, preview, sample pages]
+        self.lsh_buckets = {}
+        self.signatures = {}
+        self.links = {}
+
+    def add(self, rel_path: str, features: dict):
+        if features["title"]:
+            self.titles.setdefault(features["title"], []).append(rel_path)
+        for h1 in set(features["h1"]):
+            if h1:
+                self.h1s.setdefault(h1, []).append(rel_path)
+
+        for digest, preview in {digest: preview for digest, preview in features["paragraphs"]}.items():
+            entry = self.paragraphs.setdefault(digest, [0, preview, []])
+            entry[0] += 1
+            if len(entry[2]) < AUDIT_SAMPLE_PAGES:
+                entry[2].append(rel_path)
+
+        signature = features["minhash"]
+        if signature:
+            self.signatures[rel_path] = signature
+            rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+            for band in range(MINHASH_BANDS):
+                key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+                self.lsh_buckets.setdefault(key, []).append(rel_path)
+
+        self.links[rel_path] = features["links"]
+
+    def near_duplicate_groups(self) -> list:
+        """Cluster pages whose estimated shingle similarity passes the threshold.
+
+        Pages that share an LSH bucket are not compared pairwise: each member
+        is compared only with the bucket's first member and merged with
+        union-find, keeping the work linear in bucket size. Two later members
+        that are similar to each other but not to the first are therefore
+        only grouped if another bucket brings them together.
+        """
+        parent = {}
+
+        def find(path):
+            while parent.get(path, path) != path:
+                path = parent[path]
+            return path
+
+        for members in self.lsh_buckets.values():
+            if len(members) < 2:
+                continue
+            first = members[0]
+            first_signature = self.signatures[first]
+            for other in members[1:]:
+                if find(first) == find(other):
+                    continue
+                matches = sum(1 for a, b in zip(first_signature, self.signatures[other]) if a == b)
+                if matches / MINHASH_PERMUTATIONS >= NEAR_DUPLICATE_THRESHOLD:
+                    parent[find(other)] = find(first)
+
+        groups = {}
+        for path in parent:
+            groups.setdefault(find(path), set()).add(path)
+        for root_path, members in groups.items():
+            members.add(root_path)
+        return sorted((sorted(members) for members in groups.values()), key=lambda g: (-len(g), g[0]))
+
+    def report(self, site_files: list) -> dict:
+        """Resolve the indexes into duplicate, near-duplicate and link findings."""
+        existing = set(site_files)
+        inbound = set()
+        broken = []
+        for page, targets in self.links.items():
+            for target in targets:
+                candidates = (target, target + "index.html", target + "/index.html", target + ".html")
+                resolved = next((c for c in candidates if c in existing), None)
+                if resolved is None:
+                    broken.append({"page": page, "target": "/" + target})
+                elif resolved != page:
+                    inbound.add(resolved)
+
+        orphans = sorted(page for page in self.links if page not in inbound and page != "index.html")
+        repeated = sorted(
+            (entry for entry in self.paragraphs.values() if entry[0] > 1),
+            key=lambda entry: -entry[0]
+        )
+
+        return {
+            "duplicate_titles": [
+                {"title": title, "pages": pages} for title, pages in sorted(self.titles.items()) if len(pages) > 1
+            ],
+            "duplicate_h1s": [
+                {"h1": h1, "pages": pages} for h1, pages in sorted(self.h1s.items()) if len(pages) > 1
+            ],
+            "repeated_paragraphs": [
+                {"preview": preview, "page_count": count, "example_pages": examples}
+                for count, preview, examples in repeated
+            ],
+            "near_duplicates": self.near_duplicate_groups(),
+            "broken_links": sorted(broken, key=lambda link: (link["page"], link["target"])),
+            "orphan_pages": orphans
+        }
+
+
+@lru_cache(maxsize=1)
+def validator_fingerprint() -> str:
+    """Hash of the validator's own source and the schema templates.
+
+    Stored in the manifest, so a change to the rules, the readability code
+    or a template invalidates every cached report and all files are
+    validated again once.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for path in sorted(SCHEMA_TEMPLATE_DIR.glob("*.json")):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_manifest(path: str, options: dict) -> dict:
+    """Load per-file hashes and reports from a previous run.
+
+    A manifest written with different options, by a different manifest
+    version or by a different version of the validator is ignored, so
+    cached reports never mix validation settings or rules.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if (data.get("version") != MANIFEST_VERSION or data.get("options") != options
+            or data.get("fingerprint") != validator_fingerprint()):
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(path: str, options: dict, entries: dict):
+    """Write the manifest atomically so an interrupted run keeps the old one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        json_output.dump({"version": MANIFEST_VERSION, "fingerprint": validator_fingerprint(),
+                          "options": options, "files": entries}, f, compact=True)
+    os.replace(tmp_path, path)
+
+
+def validate_file(job: tuple, readability_detail: bool = False, site_audit: bool = False,
+                  skip_rules=()) -> tuple:
+    """Validate one file unless its manifest entry shows it is unchanged.
+
+    Runs in a worker process. Size and mtime are checked first; the file is
+    only hashed when they differ, and only re-validated when the hash does.
+    Returns (relative path, manifest entry, reused).
+    """
+    root, rel_path, previous = job
+    path = os.path.join(root, rel_path)
+    stat = os.stat(path)
+
+    if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+        return rel_path, previous, True
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if previous and previous["sha256"] == digest:
+        return rel_path, {**previous, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, True
+
+    report, parser = analyse_content(raw.decode('utf-8', errors='replace'), readability_detail, skip_rules)
+    entry = {
+        "sha256": digest,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "report": report.to_dict()
+    }
+    if site_audit:
+        entry["features"] = page_features(parser, rel_path) if parser else None
+    return rel_path, entry, False
+
+
+def validate_directory(root: str, workers: Optional[int] = None, manifest_path: Optional[str] = None,
+                       readability_detail: bool = False, site_audit: bool = False, skip_rules=()) -> SiteReport:
+    """Validate every HTML file under root across a process pool.
+
+    With a manifest, files whose content hash matches the previous run reuse
+    their stored report instead of being parsed again. With site_audit,
+    cross-page indexes are built as results stream back from the workers.
+    """
+    options = {"readability_detail": readability_detail, "site_audit": site_audit, "skip_rules": sorted(skip_rules)}
+    previous = load_manifest(manifest_path, options) if manifest_path else {}
+    site_files = find_site_files(root)
+    html_files = [path for path in site_files if path.lower().endswith(HTML_EXTENSIONS)]
+    jobs = [(root, rel_path, previous.get(rel_path)) for rel_path in html_files]
+    worker = partial(validate_file, readability_detail=readability_detail, site_audit=site_audit,
+                     skip_rules=tuple(skip_rules))
+    audit_index = SiteAuditIndex() if site_audit else None
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        results = map(worker, jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(worker, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+
+    site = SiteReport(root=root)
+    entries = {}
+    try:
+        for rel_path, entry, reused in results:
+            entries[rel_path] = entry
+            site.pages[rel_path] = ContentReport.from_dict(entry["report"])
+            if audit_index is not None and entry.get("features"):
+                audit_index.add(rel_path, entry["features"])
+            if reused:
+                site.cached += 1
+            else:
+                site.validated += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if audit_index is not None:
+        site.audit = audit_index.report(site_files)
+    if manifest_path:
+        save_manifest(manifest_path, options, entries)
+    return site
+
+
+def format_site_audit(audit: dict, limit: int = 10) -> list:
+    """Format cross-page findings as report lines, truncating long lists."""
+    lines = ["SITE AUDIT:"]
+
+    def section(title, items, describe):
+        lines.append(f"  {title}: {len(items)}")
+        for item in items[:limit]:
+            lines.append(f"    {describe(item)}")
+        if len(items) > limit:
+            lines.append(f"    ... and {len(items) - limit} more")
+
+    section("Broken internal links", audit["broken_links"], lambda l: f"{l['page']} -> {l['target']}")
+    section("Duplicate titles", audit["duplicate_titles"], lambda d: f"\"{d['title']}\" on {len(d['pages'])} pages")
+    section("Duplicate H1s", audit["duplicate_h1s"], lambda d: f"\"{d['h1']}\" on {len(d['pages'])} pages")
+    section("Near-duplicate page groups", audit["near_duplicates"],
+            lambda g: f"{len(g)} pages: {', '.join(g[:AUDIT_SAMPLE_PAGES])}")
+    section("Repeated paragraphs", audit["repeated_paragraphs"],
+            lambda p: f"{p['page_count']} pages: {p['preview']}")
+    section("Orphan pages (no internal links in)", audit["orphan_pages"], lambda p: p)
+    lines.append("")
+    return lines
+
+
+def format_site_report(site: SiteReport) -> str:
+    """Format a directory validation run as a site summary."""
+    summary = site.summary()
+    lines = [
+        "=" * 60,
+        "SITE CONTENT VALIDATION REPORT",
+        f"Directory: {site.root}",
+        f"Pages: {summary['pages']} ({summary['validated']} validated, {summary['cached']} unchanged)",
+        f"Average Score: {summary['average_score']}/100",
+        f"Pages With Errors: {summary['pages_with_errors']}",
+        "=" * 60,
+        ""
+    ]
+
+    if summary["category_failures"]:
+        lines.append("FAILED CHECKS BY CATEGORY:")
+        for category, count in summary["category_failures"].items():
+            lines.append(f"  {count:>6}  {category}")
+        lines.append("")
+
+    if summary["lowest_scores"]:
+        lines.append("LOWEST SCORING PAGES:")
+        for page in summary["lowest_scores"]:
+            lines.append(f"  {page['score']:>3}/100  {page['path']}")
+        lines.append("")
+
+    failing = site.failing_pages()
+    if failing:
+        lines.append("PAGES WITH ERRORS (must fix):")
+        for path in failing:
+            messages = [f"{r['category']}: {r['message']}" for r in site.pages[path].results
+                        if r["severity"] == "error" and not r["passed"]]
+            lines.append(f"  [X] {path}")
+            for message in messages:
+                lines.append(f"      {message}")
+        lines.append("")
+
+    if site.audit is not None:
+        lines.extend(format_site_audit(site.audit))
+
     lines.append("=" * 60)
     return "\n".join(lines)
 
 
+def write_junit_report(site: SiteReport, path: str):
+    """Write one JUnit test case per page and check for CI content gates."""
+    suite = ElementTree.Element("testsuite", name="content-validation")
+    tests = failures = 0
+
+    for rel_path in sorted(site.pages):
+        for r in site.pages[rel_path].results:
+            tests += 1
+            case = ElementTree.SubElement(suite, "testcase", classname=rel_path, name=r["category"])
+            if r["severity"] == "error" and not r["passed"]:
+                failures += 1
+                failure = ElementTree.SubElement(case, "failure", message=r["message"])
+                failure.text = r.get("recommendation", "")
+            elif not r["passed"]:
+                ElementTree.SubElement(case, "system-out").text = f"Warning: {r['message']}"
+
+    if site.audit is not None:
+        broken_by_page = {}
+        for link in site.audit["broken_links"]:
+            broken_by_page.setdefault(link["page"], []).append(link["target"])
+        for rel_path, targets in sorted(broken_by_page.items()):
+            tests += 1
+            failures += 1
+            case = ElementTree.SubElement(suite, "testcase", classname=rel_path, name="Internal Links")
+            failure = ElementTree.SubElement(case, "failure", message=f"{len(targets)} broken internal links")
+            failure.text = "\n".join(targets)
+
+    suite.set("tests", str(tests))
+    suite.set("failures", str(failures))
+    ElementTree.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate HTML content for GEO and copywriting standards",
@@ -486,18 +1387,52 @@ Examples:
   python validate_content.py --file index.html
   python validate_content.py --url https://example.com/page
   python validate_content.py --file page.html --json > report.json
+  python validate_content.py --file page.html --readability-detail
+  python validate_content.py --dir ./public --manifest .content-manifest.json --junit content.xml
+  python validate_content.py --dir ./public --site-audit
         """
     )
     parser.add_argument("--file", "-f", help="HTML file to validate")
     parser.add_argument("--url", "-u", help="URL to fetch and validate")
+    parser.add_argument("--dir", "-d", help="Directory of HTML files to validate (e.g. a static build)")
+    parser.add_argument("--workers", "-w", type=int, help="Worker processes for --dir (default: CPU count)")
+    parser.add_argument("--manifest", help="Manifest of content hashes and reports; unchanged files are skipped")
+    parser.add_argument("--junit", help="Write a JUnit XML report (with --dir)")
+    parser.add_argument("--site-audit", action="store_true",
+                        help="With --dir, check duplicate titles/H1s, repeated and near-duplicate content, and broken internal links")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--compact", action="store_true", help="With --json, emit compact JSON (no indentation)")
+    parser.add_argument("--readability-detail", action="store_true",
+                        help="Report grade level per paragraph and per heading section")
+    parser.add_argument("--skip", action="append", default=[], choices=RULE_NAMES, metavar="RULE",
+                        help=f"Skip a check (repeatable): {', '.join(RULE_NAMES)}")
 
     args = parser.parse_args()
 
-    if not args.file and not args.url:
-        print("Error: Provide --file or --url", file=sys.stderr)
+    if not args.file and not args.url and not args.dir:
+        print("Error: Provide --file, --url or --dir", file=sys.stderr)
         sys.exit(1)
 
+    if args.dir:
+        if not os.path.isdir(args.dir):
+            print(f"Error: Directory not found: {args.dir}", file=sys.stderr)
+            sys.exit(1)
+        site = validate_directory(
+            args.dir,
+            workers=args.workers,
+            manifest_path=args.manifest,
+            readability_detail=args.readability_detail,
+            site_audit=args.site_audit,
+            skip_rules=args.skip
+        )
+        if args.json:
+            json_output.dump(site.to_dict(), compact=args.compact)
+        else:
+            print(format_site_report(site))
+        if args.junit:
+            write_junit_report(site, args.junit)
+        sys.exit(1 if site.has_errors() else 0)
+
     # Get HTML content
     try:
         if args.file:
@@ -511,14 +1446,16 @@ Examples:
         sys.exit(1)
 
     # Validate
-    report = validate_content(html)
+    report = validate_content(html, readability_detail=args.readability_detail, skip_rules=args.skip)
 
     # Output
-    print(format_report(report, as_json=args.json))
+    if args.json:
+        json_output.dump(report.to_dict(), compact=args.compact)
+    else:
+        print(format_report(report))
 
     # Exit code based on errors
-    has_errors = any(r["severity"] == "error" and not r["passed"] for r in report.results)
-    sys.exit(1 if has_errors else 0)
+    sys.exit(1 if report.has_errors() else 0)
 
 
 if __name__ == "__main__":